@@ -0,0 +1,60 @@
+"""add keyset pagination indexes for applications listing
+
+Revision ID: 008_listing_keyset_indexes
+Revises: 007_queue_indexes
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "008_listing_keyset_indexes"
+down_revision = "007_queue_indexes"
+branch_labels = None
+depends_on = None
+
+
+_AMOUNT = "((loan_request->>'loan_amount')::numeric)"
+
+
+def upgrade() -> None:
+    # GET /applications seeks on (sort key, id) within a tenant; each sort_by
+    # needs an index whose column order matches its ORDER BY.
+    # created_at is NOT NULL, so one index serves both asc and desc (backward scan).
+    op.create_index(
+        "idx_applications_tenant_created_id",
+        "applications",
+        ["tenant_id", "created_at", "id"],
+        unique=False,
+    )
+
+    # amount sorts NULLS LAST in both directions; a backward scan would yield
+    # NULLS FIRST, so asc and desc each get their own expression index.
+    op.create_index(
+        "idx_applications_tenant_amount_id",
+        "applications",
+        ["tenant_id", sa.text(_AMOUNT), "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_applications_tenant_amount_id_desc",
+        "applications",
+        ["tenant_id", sa.text(f"{_AMOUNT} DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
+
+    # sort_by=score aggregates max(score) per application; make that index-only.
+    op.create_index(
+        "idx_scoring_application_score",
+        "scoring_results",
+        ["application_id", "score"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_scoring_application_score", table_name="scoring_results")
+    op.drop_index("idx_applications_tenant_amount_id_desc", table_name="applications")
+    op.drop_index("idx_applications_tenant_amount_id", table_name="applications")
+    op.drop_index("idx_applications_tenant_created_id", table_name="applications")
@@ -0,0 +1,62 @@
+"""add full-text search column and external_id prefix index to applications
+
+Revision ID: 009_applications_search
+Revises: 008_listing_keyset_indexes
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+
+revision = "009_applications_search"
+down_revision = "008_listing_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Diacritic folding without the unaccent extension: plain translate() is
+    # IMMUTABLE, so it can back a stored generated column. Covers Serbian Latin
+    # (đ -> dj, the conventional ASCII spelling) and common Western accents.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION hitl_search_fold(p_text TEXT)
+        RETURNS TEXT AS $$
+          SELECT lower(translate(
+            replace(replace(p_text, 'đ', 'dj'), 'Đ', 'Dj'),
+            'ČĆŽŠčćžšÀÁÂÄÃÅàáâäãåÈÉÊËèéêëÌÍÎÏìíîïÒÓÔÖÕòóôöõÙÚÛÜùúûüÇçÑñ',
+            'CCZScczsAAAAAAaaaaaaEEEEeeeeIIIIiiiiOOOOOoooooUUUUuuuuCcNn'
+          ));
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+        """
+    )
+
+    # NOTE: adding a STORED generated column rewrites the table.
+    op.execute(
+        """
+        ALTER TABLE applications
+        ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+          to_tsvector(
+            'simple',
+            hitl_search_fold(coalesce(external_id, '') || ' ' || coalesce(applicant_data->>'name', ''))
+          )
+        ) STORED;
+        """
+    )
+    op.execute("CREATE INDEX idx_applications_search ON applications USING GIN (search_vector);")
+
+    # Fast path for external_id lookups: case-insensitive prefix match via btree.
+    op.execute(
+        """
+        CREATE INDEX idx_applications_tenant_external_id_prefix
+        ON applications (tenant_id, lower(external_id) text_pattern_ops);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_applications_tenant_external_id_prefix;")
+    op.execute("DROP INDEX IF EXISTS idx_applications_search;")
+    op.execute("ALTER TABLE applications DROP COLUMN IF EXISTS search_vector;")
+    op.execute("DROP FUNCTION IF EXISTS hitl_search_fold(TEXT);")
@@ -0,0 +1,147 @@
+"""denormalize the latest scoring result onto applications
+
+Revision ID: 010_app_latest_score
+Revises: 009_applications_search
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "010_app_latest_score"
+down_revision = "009_applications_search"
+branch_labels = None
+depends_on = None
+
+
+# Business columns of applications. The denormalized latest_* columns are left
+# out so that score maintenance (and backfills) do not bump updated_at.
+_APPLICATION_UPDATED_AT_COLUMNS = (
+    "tenant_id, external_id, status, applicant_data, financial_data, loan_request, "
+    "credit_bureau_data, source, metadata, submitted_at, expires_at"
+)
+
+
+def upgrade() -> None:
+    op.add_column("applications", sa.Column("latest_scoring_result_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column("applications", sa.Column("latest_score", sa.Integer(), nullable=True))
+    op.add_column("applications", sa.Column("latest_scored_at", sa.DateTime(timezone=True), nullable=True))
+
+    # sort_by=score seeks on (tenant_id, latest_score, id); NULLS LAST both ways.
+    op.create_index(
+        "idx_applications_tenant_score_id",
+        "applications",
+        ["tenant_id", "latest_score", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_applications_tenant_score_id_desc",
+        "applications",
+        ["tenant_id", sa.text("latest_score DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
+
+    # The max(score) aggregate index from 008 is superseded; recomputing the
+    # latest result for one application needs (application_id, created_at) instead.
+    op.drop_index("idx_scoring_application_score", table_name="scoring_results")
+    op.create_index(
+        "idx_scoring_application_created",
+        "scoring_results",
+        ["application_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_application_latest_score(p_application_id UUID)
+        RETURNS VOID AS $$
+        BEGIN
+          UPDATE applications a
+          SET (latest_scoring_result_id, latest_score, latest_scored_at) = (
+            SELECT sr.id, sr.score, sr.created_at
+            FROM scoring_results sr
+            WHERE sr.application_id = p_application_id
+            ORDER BY sr.created_at DESC, sr.id DESC
+            LIMIT 1
+          )
+          WHERE a.id = p_application_id;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_application_latest_score()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            -- Common path: a new result is the latest unless it is backdated.
+            UPDATE applications
+            SET latest_scoring_result_id = NEW.id,
+                latest_score = NEW.score,
+                latest_scored_at = NEW.created_at
+            WHERE id = NEW.application_id
+              AND (latest_scored_at IS NULL OR latest_scored_at <= NEW.created_at);
+          ELSIF TG_OP = 'DELETE' THEN
+            PERFORM refresh_application_latest_score(OLD.application_id);
+          ELSE
+            PERFORM refresh_application_latest_score(NEW.application_id);
+            IF OLD.application_id <> NEW.application_id THEN
+              PERFORM refresh_application_latest_score(OLD.application_id);
+            END IF;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_scoring_results_latest_score
+        AFTER INSERT OR UPDATE OF application_id, score, created_at OR DELETE ON scoring_results
+        FOR EACH ROW
+        EXECUTE FUNCTION sync_application_latest_score();
+        """
+    )
+
+    op.execute(
+        f"""
+        DROP TRIGGER IF EXISTS trg_applications_updated_at ON applications;
+        CREATE TRIGGER trg_applications_updated_at
+        BEFORE UPDATE OF {_APPLICATION_UPDATED_AT_COLUMNS} ON applications
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+        """
+    )
+
+    # Existing rows: run `python -m src.scripts.backfill_latest_scores` (batched,
+    # idempotent) instead of one table-wide UPDATE inside the migration.
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP TRIGGER IF EXISTS trg_applications_updated_at ON applications;
+        CREATE TRIGGER trg_applications_updated_at
+        BEFORE UPDATE ON applications
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+        """
+    )
+
+    op.execute("DROP TRIGGER IF EXISTS trg_scoring_results_latest_score ON scoring_results;")
+    op.execute("DROP FUNCTION IF EXISTS sync_application_latest_score();")
+    op.execute("DROP FUNCTION IF EXISTS refresh_application_latest_score(UUID);")
+
+    op.drop_index("idx_scoring_application_created", table_name="scoring_results")
+    op.create_index("idx_scoring_application_score", "scoring_results", ["application_id", "score"], unique=False)
+
+    op.drop_index("idx_applications_tenant_score_id_desc", table_name="applications")
+    op.drop_index("idx_applications_tenant_score_id", table_name="applications")
+
+    op.drop_column("applications", "latest_scored_at")
+    op.drop_column("applications", "latest_score")
+    op.drop_column("applications", "latest_scoring_result_id")
@@ -0,0 +1,72 @@
+"""add typed loan_amount generated column to applications
+
+Revision ID: 011_app_loan_amount
+Revises: 010_app_latest_score
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "011_app_loan_amount"
+down_revision = "010_app_latest_score"
+branch_labels = None
+depends_on = None
+
+
+_AMOUNT = "((loan_request->>'loan_amount')::numeric)"
+
+
+def upgrade() -> None:
+    # Regex-guarded cast: a malformed loan_amount yields NULL instead of failing
+    # the INSERT (API validation already rejects non-numeric values).
+    # NOTE: adding a STORED generated column rewrites the table.
+    op.execute(
+        r"""
+        ALTER TABLE applications
+        ADD COLUMN loan_amount NUMERIC
+        GENERATED ALWAYS AS (
+          CASE
+            WHEN (loan_request->>'loan_amount') ~ '^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$'
+            THEN (loan_request->>'loan_amount')::numeric
+          END
+        ) STORED;
+        """
+    )
+
+    # Replace the JSONB expression indexes from 008 with plain column indexes;
+    # they also serve min_amount/max_amount range filters.
+    op.drop_index("idx_applications_tenant_amount_id_desc", table_name="applications")
+    op.drop_index("idx_applications_tenant_amount_id", table_name="applications")
+    op.create_index(
+        "idx_applications_tenant_amount_id",
+        "applications",
+        ["tenant_id", "loan_amount", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_applications_tenant_amount_id_desc",
+        "applications",
+        ["tenant_id", sa.text("loan_amount DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_applications_tenant_amount_id_desc", table_name="applications")
+    op.drop_index("idx_applications_tenant_amount_id", table_name="applications")
+    op.drop_column("applications", "loan_amount")
+
+    op.create_index(
+        "idx_applications_tenant_amount_id",
+        "applications",
+        ["tenant_id", sa.text(_AMOUNT), "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_applications_tenant_amount_id_desc",
+        "applications",
+        ["tenant_id", sa.text(f"{_AMOUNT} DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
@@ -0,0 +1,54 @@
+"""add task_outbox for transactional task emission
+
+Revision ID: 012_task_outbox
+Revises: 011_app_loan_amount
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "012_task_outbox"
+down_revision = "011_app_loan_amount"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_outbox",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True, nullable=False),
+        sa.Column("task_name", sa.String(length=100), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column("dedup_key", sa.String(length=200), nullable=True),
+        sa.Column("attempts", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("available_at", sa.DateTime(timezone=True), server_default=sa.text("NOW()"), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("NOW()"), nullable=False),
+    )
+
+    # Relay claim scan: oldest unpublished rows first.
+    op.create_index(
+        "idx_task_outbox_pending",
+        "task_outbox",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("published_at IS NULL"),
+    )
+    # At most one pending row per dedup_key (writers use ON CONFLICT DO NOTHING).
+    op.create_index(
+        "uq_task_outbox_pending_dedup",
+        "task_outbox",
+        ["dedup_key"],
+        unique=True,
+        postgresql_where=sa.text("published_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_task_outbox_pending_dedup", table_name="task_outbox")
+    op.drop_index("idx_task_outbox_pending", table_name="task_outbox")
+    op.drop_table("task_outbox")
@@ -0,0 +1,30 @@
+"""add analyst workload index for queue claims
+
+Revision ID: 013_queue_analyst_workload
+Revises: 012_task_outbox
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "013_queue_analyst_workload"
+down_revision = "012_task_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Workload check on every claim: count of an analyst's active cases.
+    op.create_index(
+        "idx_queue_analyst_active",
+        "analyst_queues",
+        ["analyst_id"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('assigned','in_progress')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_queue_analyst_active", table_name="analyst_queues")
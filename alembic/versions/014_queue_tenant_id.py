@@ -0,0 +1,108 @@
+"""denormalize tenant_id onto analyst_queues
+
+Revision ID: 014_queue_tenant_id
+Revises: 013_queue_analyst_workload
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "014_queue_tenant_id"
+down_revision = "013_queue_analyst_workload"
+branch_labels = None
+depends_on = None
+
+_OPEN_STATUSES = "status IN ('pending','assigned','in_progress')"
+
+
+def upgrade() -> None:
+    op.add_column("analyst_queues", sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=True))
+
+    # Backfill without bumping updated_at on every queue row.
+    op.execute("ALTER TABLE analyst_queues DISABLE TRIGGER trg_analyst_queues_updated_at")
+    op.execute(
+        """
+        UPDATE analyst_queues q
+        SET tenant_id = a.tenant_id
+        FROM applications a
+        WHERE a.id = q.application_id
+          AND q.tenant_id IS NULL
+        """
+    )
+    op.execute("ALTER TABLE analyst_queues ENABLE TRIGGER trg_analyst_queues_updated_at")
+
+    op.alter_column("analyst_queues", "tenant_id", nullable=False)
+    op.create_foreign_key(
+        "fk_analyst_queues_tenant", "analyst_queues", "tenants", ["tenant_id"], ["id"], ondelete="CASCADE"
+    )
+
+    # tenant_id always follows the application: writers may omit it.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_analyst_queue_tenant()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          SELECT tenant_id INTO NEW.tenant_id FROM applications WHERE id = NEW.application_id;
+          RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_analyst_queues_tenant
+        BEFORE INSERT OR UPDATE OF application_id, tenant_id ON analyst_queues
+        FOR EACH ROW
+        EXECUTE FUNCTION set_analyst_queue_tenant();
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_analyst_queue_tenant()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          UPDATE analyst_queues SET tenant_id = NEW.tenant_id WHERE application_id = NEW.id;
+          RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_applications_queue_tenant
+        AFTER UPDATE OF tenant_id ON applications
+        FOR EACH ROW
+        WHEN (OLD.tenant_id IS DISTINCT FROM NEW.tenant_id)
+        EXECUTE FUNCTION sync_analyst_queue_tenant();
+        """
+    )
+
+    # Tenant-leading replacements for the 007 indexes, over open entries only.
+    op.create_index(
+        "idx_queue_tenant_priority",
+        "analyst_queues",
+        ["tenant_id", "status", "priority", "created_at"],
+        unique=False,
+        postgresql_where=sa.text(_OPEN_STATUSES),
+    )
+    op.create_index(
+        "idx_queue_tenant_sla",
+        "analyst_queues",
+        ["tenant_id", "sla_deadline"],
+        unique=False,
+        postgresql_where=sa.text(_OPEN_STATUSES),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_queue_tenant_sla", table_name="analyst_queues")
+    op.drop_index("idx_queue_tenant_priority", table_name="analyst_queues")
+    op.execute("DROP TRIGGER IF EXISTS trg_applications_queue_tenant ON applications;")
+    op.execute("DROP FUNCTION IF EXISTS sync_analyst_queue_tenant();")
+    op.execute("DROP TRIGGER IF EXISTS trg_analyst_queues_tenant ON analyst_queues;")
+    op.execute("DROP FUNCTION IF EXISTS set_analyst_queue_tenant();")
+    op.drop_constraint("fk_analyst_queues_tenant", "analyst_queues", type_="foreignkey")
+    op.drop_column("analyst_queues", "tenant_id")
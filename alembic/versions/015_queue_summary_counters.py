@@ -0,0 +1,92 @@
+"""incrementally maintained queue summary counters
+
+Revision ID: 015_queue_summary_counters
+Revises: 014_queue_tenant_id
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "015_queue_summary_counters"
+down_revision = "014_queue_tenant_id"
+branch_labels = None
+depends_on = None
+
+# Concurrent transitions in one tenant spread their increments over this many
+# rows per (status, bucket) instead of serializing on a single counter row.
+COUNTER_SHARDS = 16
+
+
+def upgrade() -> None:
+    op.create_table(
+        "queue_summary_counters",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", sa.String(length=30), nullable=False),
+        sa.Column("priority_bucket", sa.String(length=10), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("n", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("tenant_id", "status", "priority_bucket", "shard"),
+    )
+
+    # Same buckets as GET /queue/summary (lower number == higher priority).
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION queue_priority_bucket(p_priority INTEGER)
+        RETURNS VARCHAR AS $$
+          SELECT CASE WHEN p_priority <= 20 THEN 'high' WHEN p_priority <= 50 THEN 'medium' ELSE 'low' END;
+        $$ LANGUAGE sql IMMUTABLE;
+        """
+    )
+
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION sync_queue_summary_counters()
+        RETURNS TRIGGER AS $$
+        DECLARE
+          v_shard SMALLINT := pg_backend_pid() % {COUNTER_SHARDS};
+        BEGIN
+          -- Skipped when the tenant itself is being deleted (its counters cascade away).
+          IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status IN ('pending', 'assigned', 'in_progress')
+             AND (TG_OP = 'UPDATE' OR EXISTS (SELECT 1 FROM tenants WHERE id = OLD.tenant_id)) THEN
+            INSERT INTO queue_summary_counters AS c (tenant_id, status, priority_bucket, shard, n)
+            VALUES (OLD.tenant_id, OLD.status, queue_priority_bucket(OLD.priority), v_shard, -1)
+            ON CONFLICT (tenant_id, status, priority_bucket, shard) DO UPDATE SET n = c.n - 1;
+          END IF;
+          IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status IN ('pending', 'assigned', 'in_progress') THEN
+            INSERT INTO queue_summary_counters AS c (tenant_id, status, priority_bucket, shard, n)
+            VALUES (NEW.tenant_id, NEW.status, queue_priority_bucket(NEW.priority), v_shard, 1)
+            ON CONFLICT (tenant_id, status, priority_bucket, shard) DO UPDATE SET n = c.n + 1;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_analyst_queues_summary_counters
+        AFTER INSERT OR DELETE OR UPDATE OF status, priority, tenant_id ON analyst_queues
+        FOR EACH ROW
+        EXECUTE FUNCTION sync_queue_summary_counters();
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO queue_summary_counters (tenant_id, status, priority_bucket, shard, n)
+        SELECT tenant_id, status, queue_priority_bucket(priority), 0, count(*)
+        FROM analyst_queues
+        WHERE status IN ('pending', 'assigned', 'in_progress')
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_analyst_queues_summary_counters ON analyst_queues;")
+    op.execute("DROP FUNCTION IF EXISTS sync_queue_summary_counters();")
+    op.execute("DROP FUNCTION IF EXISTS queue_priority_bucket(INTEGER);")
+    op.drop_table("queue_summary_counters")
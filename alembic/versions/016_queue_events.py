@@ -0,0 +1,118 @@
+"""queue change feed: queue_events log + NOTIFY
+
+Revision ID: 016_queue_events
+Revises: 015_queue_summary_counters
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "016_queue_events"
+down_revision = "015_queue_summary_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Append-only log: the id is the client's resume cursor (SSE Last-Event-ID).
+    op.create_table(
+        "queue_events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True, nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("queue_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("application_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=30), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("analyst_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("sla_deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("NOW()"), nullable=False),
+    )
+    op.create_index("idx_queue_events_tenant_id", "queue_events", ["tenant_id", "id"], unique=False)
+    op.create_index("idx_queue_events_created", "queue_events", ["created_at"], unique=False)
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION emit_queue_event()
+        RETURNS TRIGGER AS $$
+        DECLARE
+          v_row analyst_queues;
+          v_event VARCHAR;
+          v_id BIGINT;
+        BEGIN
+          IF TG_OP = 'DELETE' THEN
+            v_row := OLD;
+            v_event := 'deleted';
+            -- Tenant being deleted: its events cascade away.
+            IF NOT EXISTS (SELECT 1 FROM tenants WHERE id = OLD.tenant_id) THEN
+              RETURN NULL;
+            END IF;
+          ELSE
+            v_row := NEW;
+            IF TG_OP = 'INSERT' THEN
+              v_event := 'created';
+            ELSIF NEW.status = 'completed' AND OLD.status IS DISTINCT FROM 'completed' THEN
+              v_event := 'completed';
+            ELSE
+              v_event := 'updated';
+            END IF;
+          END IF;
+
+          INSERT INTO queue_events (tenant_id, queue_id, application_id, event, status, priority, analyst_id, sla_deadline)
+          VALUES (v_row.tenant_id, v_row.id, v_row.application_id, v_event, v_row.status, v_row.priority,
+                  v_row.analyst_id, v_row.sla_deadline)
+          RETURNING id INTO v_id;
+
+          -- Delivered at commit, in commit order; listeners fan out per tenant.
+          PERFORM pg_notify('hitl_queue_events', json_build_object(
+            'id', v_id,
+            'tenant_id', v_row.tenant_id,
+            'queue_id', v_row.id,
+            'application_id', v_row.application_id,
+            'event', v_event,
+            'status', v_row.status,
+            'priority', v_row.priority,
+            'analyst_id', v_row.analyst_id,
+            'sla_deadline', v_row.sla_deadline
+          )::text);
+          RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_analyst_queues_events
+        AFTER INSERT OR DELETE ON analyst_queues
+        FOR EACH ROW
+        EXECUTE FUNCTION emit_queue_event();
+        """
+    )
+    # Only changes an analyst can see (not e.g. updated_at-only touches).
+    op.execute(
+        """
+        CREATE TRIGGER trg_analyst_queues_events_update
+        AFTER UPDATE ON analyst_queues
+        FOR EACH ROW
+        WHEN (
+          OLD.status IS DISTINCT FROM NEW.status
+          OR OLD.priority IS DISTINCT FROM NEW.priority
+          OR OLD.analyst_id IS DISTINCT FROM NEW.analyst_id
+          OR OLD.sla_deadline IS DISTINCT FROM NEW.sla_deadline
+          OR OLD.tenant_id IS DISTINCT FROM NEW.tenant_id
+        )
+        EXECUTE FUNCTION emit_queue_event();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_analyst_queues_events_update ON analyst_queues;")
+    op.execute("DROP TRIGGER IF EXISTS trg_analyst_queues_events ON analyst_queues;")
+    op.execute("DROP FUNCTION IF EXISTS emit_queue_event();")
+    op.drop_index("idx_queue_events_created", table_name="queue_events")
+    op.drop_index("idx_queue_events_tenant_id", table_name="queue_events")
+    op.drop_table("queue_events")
@@ -0,0 +1,45 @@
+"""SLA sweeper: warning marker + indexes over not-yet-swept rows
+
+Revision ID: 017_queue_sla_sweep
+Revises: 016_queue_events
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "017_queue_sla_sweep"
+down_revision = "016_queue_events"
+branch_labels = None
+depends_on = None
+
+_OPEN_STATUSES = "status IN ('pending','assigned','in_progress')"
+
+
+def upgrade() -> None:
+    op.add_column("analyst_queues", sa.Column("sla_warned_at", sa.DateTime(timezone=True), nullable=True))
+
+    # Each index holds only open rows the sweeper has not handled yet, so a
+    # sweep's range scan touches the rows that are due, not the whole queue;
+    # rows leave the index as soon as they are flagged.
+    op.create_index(
+        "idx_queue_sla_unwarned",
+        "analyst_queues",
+        ["sla_deadline"],
+        unique=False,
+        postgresql_where=sa.text(f"{_OPEN_STATUSES} AND sla_warned_at IS NULL"),
+    )
+    op.create_index(
+        "idx_queue_sla_unbreached",
+        "analyst_queues",
+        ["sla_deadline"],
+        unique=False,
+        postgresql_where=sa.text(f"{_OPEN_STATUSES} AND NOT sla_breached"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_queue_sla_unbreached", table_name="analyst_queues")
+    op.drop_index("idx_queue_sla_unwarned", table_name="analyst_queues")
+    op.drop_column("analyst_queues", "sla_warned_at")
@@ -0,0 +1,66 @@
+"""Auto-assignment: queue row version, analyst skills, pending-by-SLA index
+
+Revision ID: 018_queue_auto_assign
+Revises: 017_queue_sla_sweep
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "018_queue_auto_assign"
+down_revision = "017_queue_sla_sweep"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Optimistic concurrency token: bumped by trigger on every update, so a
+    # writer that planned against an older snapshot (auto-assignment) can
+    # detect that the row changed underneath it, whoever the other writer was.
+    op.add_column("analyst_queues", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_analyst_queue_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          NEW.version := OLD.version + 1;
+          RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_analyst_queues_version
+        BEFORE UPDATE ON analyst_queues
+        FOR EACH ROW
+        EXECUTE FUNCTION bump_analyst_queue_version();
+        """
+    )
+
+    # Empty skills = generalist; required_skill NULL = any analyst.
+    op.add_column(
+        "users",
+        sa.Column("skills", postgresql.ARRAY(sa.Text()), server_default=sa.text("'{}'::text[]"), nullable=False),
+    )
+    op.add_column("analyst_queues", sa.Column("required_skill", sa.String(length=100), nullable=True))
+
+    op.create_index(
+        "idx_queue_pending_sla",
+        "analyst_queues",
+        ["sla_deadline"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_queue_pending_sla", table_name="analyst_queues")
+    op.drop_column("analyst_queues", "required_skill")
+    op.drop_column("users", "skills")
+    op.execute("DROP TRIGGER IF EXISTS trg_analyst_queues_version ON analyst_queues;")
+    op.execute("DROP FUNCTION IF EXISTS bump_analyst_queue_version();")
+    op.drop_column("analyst_queues", "version")
@@ -0,0 +1,48 @@
+"""NOTIFY on decision_thresholds changes (threshold cache invalidation)
+
+Revision ID: 019_threshold_change_notify
+Revises: 018_queue_auto_assign
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+
+revision = "019_threshold_change_notify"
+down_revision = "018_queue_auto_assign"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Payload is the tenant id; per-process threshold caches (src.ml.thresholds)
+    # drop that tenant's entry. Delivered at commit, so a reload sees the change.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_threshold_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          IF TG_OP <> 'INSERT' THEN
+            PERFORM pg_notify('hitl_threshold_changes', OLD.tenant_id::text);
+          END IF;
+          IF TG_OP <> 'DELETE' AND (TG_OP = 'INSERT' OR NEW.tenant_id IS DISTINCT FROM OLD.tenant_id) THEN
+            PERFORM pg_notify('hitl_threshold_changes', NEW.tenant_id::text);
+          END IF;
+          RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_decision_thresholds_notify
+        AFTER INSERT OR UPDATE OR DELETE ON decision_thresholds
+        FOR EACH ROW
+        EXECUTE FUNCTION notify_threshold_change();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_decision_thresholds_notify ON decision_thresholds;")
+    op.execute("DROP FUNCTION IF EXISTS notify_threshold_change();")
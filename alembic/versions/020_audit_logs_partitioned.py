@@ -0,0 +1,204 @@
+"""Monthly range partitions for audit_logs (on created_at)
+
+Revision ID: 020_audit_logs_partitioned
+Revises: 019_threshold_change_notify
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "020_audit_logs_partitioned"
+down_revision = "019_threshold_change_notify"
+branch_labels = None
+depends_on = None
+
+# Partitions created ahead of the current month by the upgrade; afterwards the
+# maintenance task (src.tasks.audit_partitions) keeps the window moving.
+MONTHS_AHEAD = 3
+
+
+def _rename(table: str, to: str) -> None:
+    # The table and every named object on it, so the replacement can take the names.
+    op.execute(f"ALTER TABLE {table} RENAME TO {to}")
+    op.execute(f"ALTER TABLE {to} RENAME CONSTRAINT audit_logs_pkey TO {to}_pkey")
+    op.execute(f"ALTER TABLE {to} RENAME CONSTRAINT audit_logs_tenant_id_fkey TO {to}_tenant_id_fkey")
+    op.execute(f"ALTER TABLE {to} RENAME CONSTRAINT audit_logs_user_id_fkey TO {to}_user_id_fkey")
+    op.execute(f"ALTER INDEX idx_audit_entity RENAME TO {to}_idx_entity")
+    op.execute(f"ALTER INDEX idx_audit_created RENAME TO {to}_idx_created")
+
+
+_COLUMNS = (
+    "id, tenant_id, user_id, entity_type, entity_id, action, old_value, new_value, "
+    "change_summary, ip_address, user_agent, request_id, created_at"
+)
+
+
+def upgrade() -> None:
+    _rename("audit_logs", "audit_logs_unpartitioned")
+
+    # The partition key must be part of the primary key. Rows outside every
+    # monthly partition land in audit_logs_default (so an insert never fails);
+    # create_audit_log_partition() moves them out when their month is created.
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+          id UUID NOT NULL,
+          tenant_id UUID NOT NULL REFERENCES tenants(id),
+          user_id UUID REFERENCES users(id),
+          entity_type VARCHAR(50) NOT NULL,
+          entity_id UUID NOT NULL,
+          action VARCHAR(50) NOT NULL,
+          old_value JSONB,
+          new_value JSONB,
+          change_summary TEXT,
+          ip_address INET,
+          user_agent TEXT,
+          request_id UUID,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+          CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+        """
+    )
+    op.execute("CREATE INDEX idx_audit_entity ON audit_logs (entity_type, entity_id);")
+    op.execute("CREATE INDEX idx_audit_created ON audit_logs (tenant_id, created_at DESC);")
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;")
+
+    # Month boundaries are UTC; partitions are named audit_logs_pYYYYMM.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION create_audit_log_partition(p_month DATE)
+        RETURNS TEXT AS $$
+        DECLARE
+          start_ts TIMESTAMPTZ := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+          end_ts TIMESTAMPTZ := (date_trunc('month', p_month::timestamp) + INTERVAL '1 month') AT TIME ZONE 'UTC';
+          part TEXT := 'audit_logs_p' || to_char(p_month, 'YYYYMM');
+        BEGIN
+          IF to_regclass(part) IS NOT NULL THEN
+            RETURN NULL;
+          END IF;
+          -- Parent, then default partition: the order inserts lock them in. Held
+          -- for the few milliseconds of the DDL, and keeps rows from slipping
+          -- into the default partition between the move and the attach.
+          LOCK TABLE ONLY audit_logs IN ACCESS EXCLUSIVE MODE;
+          LOCK TABLE audit_logs_default IN ACCESS EXCLUSIVE MODE;
+          IF EXISTS (SELECT 1 FROM audit_logs_default WHERE created_at >= start_ts AND created_at < end_ts) THEN
+            EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS)', part);
+            EXECUTE format(
+              'WITH moved AS (DELETE FROM audit_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+              'INSERT INTO %I SELECT * FROM moved',
+              start_ts, end_ts, part
+            );
+            EXECUTE format('ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, start_ts, end_ts);
+          ELSE
+            EXECUTE format('CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)', part, start_ts, end_ts);
+          END IF;
+          RETURN part;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_audit_log_partitions(p_months_ahead INTEGER DEFAULT 3)
+        RETURNS SETOF TEXT AS $$
+        DECLARE
+          this_month DATE := date_trunc('month', NOW() AT TIME ZONE 'UTC')::date;
+          created TEXT;
+        BEGIN
+          FOR i IN 0..p_months_ahead LOOP
+            created := create_audit_log_partition((this_month + i * INTERVAL '1 month')::date);
+            IF created IS NOT NULL THEN
+              RETURN NEXT created;
+            END IF;
+          END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # Retention: whole months go at once, no row-by-row DELETE.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION drop_audit_log_partitions(p_before TIMESTAMPTZ)
+        RETURNS SETOF TEXT AS $$
+        DECLARE
+          part TEXT;
+        BEGIN
+          FOR part IN
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'audit_logs'::regclass
+              AND c.relname ~ '^audit_logs_p[0-9]{6}$'
+              AND (to_date(substring(c.relname FROM 13), 'YYYYMM')::timestamp + INTERVAL '1 month')
+                  AT TIME ZONE 'UTC' <= p_before
+            ORDER BY c.relname
+          LOOP
+            EXECUTE format('DROP TABLE %I', part);
+            RETURN NEXT part;
+          END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # Every month that has rows, through MONTHS_AHEAD; then move the rows over.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+          m DATE := date_trunc('month', COALESCE(
+            (SELECT min(created_at) FROM audit_logs_unpartitioned), NOW()) AT TIME ZONE 'UTC')::date;
+        BEGIN
+          WHILE m <= (date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '{MONTHS_AHEAD} months')::date LOOP
+            PERFORM create_audit_log_partition(m);
+            m := (m + INTERVAL '1 month')::date;
+          END LOOP;
+        END $$;
+        """
+    )
+    op.execute(f"INSERT INTO audit_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_logs_unpartitioned")
+    op.drop_table("audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    _rename("audit_logs", "audit_logs_partitioned")
+    op.execute("DROP INDEX IF EXISTS idx_audit_created_brin;")
+
+    op.create_table(
+        "audit_logs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        # Named explicitly: the partitions' FK copies still hold the default names.
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", name="audit_logs_tenant_id_fkey"),
+            nullable=False,
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", name="audit_logs_user_id_fkey"),
+            nullable=True,
+        ),
+        sa.Column("entity_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("old_value", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("new_value", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("change_summary", sa.Text(), nullable=True),
+        sa.Column("ip_address", postgresql.INET(), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("request_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("NOW()"), nullable=False),
+    )
+    op.execute(f"INSERT INTO audit_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_logs_partitioned")
+    op.create_index("idx_audit_entity", "audit_logs", ["entity_type", "entity_id"], unique=False)
+    op.create_index("idx_audit_created", "audit_logs", ["tenant_id", sa.text("created_at DESC")], unique=False)
+
+    op.execute("DROP TABLE audit_logs_partitioned;")  # and all its partitions
+    op.execute("DROP FUNCTION IF EXISTS drop_audit_log_partitions(TIMESTAMPTZ);")
+    op.execute("DROP FUNCTION IF EXISTS ensure_audit_log_partitions(INTEGER);")
+    op.execute("DROP FUNCTION IF EXISTS create_audit_log_partition(DATE);")
@@ -0,0 +1,139 @@
+"""queue_events: commit-safe resume cursor (xid8)
+
+Revision ID: 021_queue_events_commit_cursor
+Revises: 020_audit_logs_partitioned
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+
+revision = "021_queue_events_commit_cursor"
+down_revision = "020_audit_logs_partitioned"
+branch_labels = None
+depends_on = None
+
+
+# The id is taken at insert, not at commit, so it cannot be the resume cursor:
+# a lower id can commit after a higher one was delivered. Instead each event
+# records its transaction id and the xmin of the snapshot it was written under
+# (every transaction still open then has xid >= that xmin). A client resuming
+# from an event's snapshot_xmin is replayed every event with xid >= it, which
+# covers everything that committed after the event; ids de-duplicate.
+_EMIT_QUEUE_EVENT = """
+CREATE OR REPLACE FUNCTION emit_queue_event()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_row analyst_queues;
+  v_event VARCHAR;
+  v_id BIGINT;
+  v_cursor BIGINT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+    v_event := 'deleted';
+    -- Tenant being deleted: its events cascade away.
+    IF NOT EXISTS (SELECT 1 FROM tenants WHERE id = OLD.tenant_id) THEN
+      RETURN NULL;
+    END IF;
+  ELSE
+    v_row := NEW;
+    IF TG_OP = 'INSERT' THEN
+      v_event := 'created';
+    ELSIF NEW.status = 'completed' AND OLD.status IS DISTINCT FROM 'completed' THEN
+      v_event := 'completed';
+    ELSE
+      v_event := 'updated';
+    END IF;
+  END IF;
+
+  INSERT INTO queue_events (tenant_id, queue_id, application_id, event, status, priority, analyst_id, sla_deadline)
+  VALUES (v_row.tenant_id, v_row.id, v_row.application_id, v_event, v_row.status, v_row.priority,
+          v_row.analyst_id, v_row.sla_deadline)
+  RETURNING id, snapshot_xmin::text::bigint INTO v_id, v_cursor;
+
+  -- Delivered at commit, in commit order; listeners fan out per tenant.
+  PERFORM pg_notify('hitl_queue_events', json_build_object(
+    'id', v_id,
+    'cursor', v_cursor,
+    'tenant_id', v_row.tenant_id,
+    'queue_id', v_row.id,
+    'application_id', v_row.application_id,
+    'event', v_event,
+    'status', v_row.status,
+    'priority', v_row.priority,
+    'analyst_id', v_row.analyst_id,
+    'sla_deadline', v_row.sla_deadline
+  )::text);
+  RETURN NULL;
+END;
+$$ language 'plpgsql';
+"""
+
+# As in migration 016.
+_EMIT_QUEUE_EVENT_016 = """
+CREATE OR REPLACE FUNCTION emit_queue_event()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_row analyst_queues;
+  v_event VARCHAR;
+  v_id BIGINT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+    v_event := 'deleted';
+    -- Tenant being deleted: its events cascade away.
+    IF NOT EXISTS (SELECT 1 FROM tenants WHERE id = OLD.tenant_id) THEN
+      RETURN NULL;
+    END IF;
+  ELSE
+    v_row := NEW;
+    IF TG_OP = 'INSERT' THEN
+      v_event := 'created';
+    ELSIF NEW.status = 'completed' AND OLD.status IS DISTINCT FROM 'completed' THEN
+      v_event := 'completed';
+    ELSE
+      v_event := 'updated';
+    END IF;
+  END IF;
+
+  INSERT INTO queue_events (tenant_id, queue_id, application_id, event, status, priority, analyst_id, sla_deadline)
+  VALUES (v_row.tenant_id, v_row.id, v_row.application_id, v_event, v_row.status, v_row.priority,
+          v_row.analyst_id, v_row.sla_deadline)
+  RETURNING id INTO v_id;
+
+  -- Delivered at commit, in commit order; listeners fan out per tenant.
+  PERFORM pg_notify('hitl_queue_events', json_build_object(
+    'id', v_id,
+    'tenant_id', v_row.tenant_id,
+    'queue_id', v_row.id,
+    'application_id', v_row.application_id,
+    'event', v_event,
+    'status', v_row.status,
+    'priority', v_row.priority,
+    'analyst_id', v_row.analyst_id,
+    'sla_deadline', v_row.sla_deadline
+  )::text);
+  RETURN NULL;
+END;
+$$ language 'plpgsql';
+"""
+
+
+def upgrade() -> None:
+    # Existing rows get the migration's xid: resuming from an old cursor replays them.
+    op.execute(
+        """
+        ALTER TABLE queue_events
+          ADD COLUMN xid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+          ADD COLUMN snapshot_xmin xid8 NOT NULL DEFAULT pg_snapshot_xmin(pg_current_snapshot());
+        """
+    )
+    op.execute("CREATE INDEX idx_queue_events_tenant_xid ON queue_events (tenant_id, xid, id);")
+    op.execute(_EMIT_QUEUE_EVENT)
+
+
+def downgrade() -> None:
+    op.execute(_EMIT_QUEUE_EVENT_016)
+    op.execute("DROP INDEX IF EXISTS idx_queue_events_tenant_xid;")
+    op.execute("ALTER TABLE queue_events DROP COLUMN snapshot_xmin, DROP COLUMN xid;")
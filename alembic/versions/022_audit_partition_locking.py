@@ -0,0 +1,91 @@
+"""create_audit_log_partition: no explicit table locks when nothing moves
+
+Revision ID: 022_audit_partition_locking
+Revises: 021_queue_events_commit_cursor
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+
+revision = "022_audit_partition_locking"
+down_revision = "021_queue_events_commit_cursor"
+branch_labels = None
+depends_on = None
+
+
+_CREATE_PARTITION = """
+CREATE OR REPLACE FUNCTION create_audit_log_partition(p_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+  start_ts TIMESTAMPTZ := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+  end_ts TIMESTAMPTZ := (date_trunc('month', p_month::timestamp) + INTERVAL '1 month') AT TIME ZONE 'UTC';
+  part TEXT := 'audit_logs_p' || to_char(p_month, 'YYYYMM');
+BEGIN
+  IF to_regclass(part) IS NOT NULL THEN
+    RETURN NULL;
+  END IF;
+  -- Common case, the month is still ahead: plain CREATE ... PARTITION OF. It
+  -- takes only the locks it needs, and re-checks the default partition under
+  -- them; a row that slips in meanwhile makes it fail, and the next run moves it.
+  IF NOT EXISTS (SELECT 1 FROM audit_logs_default WHERE created_at >= start_ts AND created_at < end_ts) THEN
+    EXECUTE format('CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)', part, start_ts, end_ts);
+    RETURN part;
+  END IF;
+  -- Rows to move. Parent, then default partition: the order inserts lock them
+  -- in. Keeps rows from slipping into the default partition between the move
+  -- and the attach.
+  LOCK TABLE ONLY audit_logs IN ACCESS EXCLUSIVE MODE;
+  LOCK TABLE audit_logs_default IN ACCESS EXCLUSIVE MODE;
+  EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS)', part);
+  EXECUTE format(
+    'WITH moved AS (DELETE FROM audit_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+    'INSERT INTO %I SELECT * FROM moved',
+    start_ts, end_ts, part
+  );
+  EXECUTE format('ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, start_ts, end_ts);
+  RETURN part;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# As in migration 020.
+_CREATE_PARTITION_020 = """
+CREATE OR REPLACE FUNCTION create_audit_log_partition(p_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+  start_ts TIMESTAMPTZ := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+  end_ts TIMESTAMPTZ := (date_trunc('month', p_month::timestamp) + INTERVAL '1 month') AT TIME ZONE 'UTC';
+  part TEXT := 'audit_logs_p' || to_char(p_month, 'YYYYMM');
+BEGIN
+  IF to_regclass(part) IS NOT NULL THEN
+    RETURN NULL;
+  END IF;
+  -- Parent, then default partition: the order inserts lock them in. Held
+  -- for the few milliseconds of the DDL, and keeps rows from slipping
+  -- into the default partition between the move and the attach.
+  LOCK TABLE ONLY audit_logs IN ACCESS EXCLUSIVE MODE;
+  LOCK TABLE audit_logs_default IN ACCESS EXCLUSIVE MODE;
+  IF EXISTS (SELECT 1 FROM audit_logs_default WHERE created_at >= start_ts AND created_at < end_ts) THEN
+    EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS)', part);
+    EXECUTE format(
+      'WITH moved AS (DELETE FROM audit_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+      'INSERT INTO %I SELECT * FROM moved',
+      start_ts, end_ts, part
+    );
+    EXECUTE format('ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, start_ts, end_ts);
+  ELSE
+    EXECUTE format('CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)', part, start_ts, end_ts);
+  END IF;
+  RETURN part;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(_CREATE_PARTITION)
+
+
+def downgrade() -> None:
+    op.execute(_CREATE_PARTITION_020)
@@ -0,0 +1,63 @@
+"""applications.loan_amount: bound the numeric literal the guard accepts
+
+Revision ID: 023_app_loan_amount_bounded
+Revises: 022_audit_partition_locking
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "023_app_loan_amount_bounded"
+down_revision = "022_audit_partition_locking"
+branch_labels = None
+depends_on = None
+
+
+# Up to 30 integer / 30 fractional digits and a two-digit exponent: far beyond
+# any loan, and always inside what ::numeric accepts ("1e200000" passed the old
+# guard and made the INSERT fail with "value overflows numeric format").
+_GUARD = r"'^\s*[-+]?([0-9]{1,30}(\.[0-9]{0,30})?|\.[0-9]{1,30})([eE][-+]?[0-9]{1,2})?\s*$'"
+# As in migration 011.
+_GUARD_011 = r"'^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$'"
+
+
+def _replace_column(guard: str) -> None:
+    # PostgreSQL 16 cannot change a generation expression in place: drop and
+    # re-add (rewrites the table), then rebuild the indexes from 011.
+    op.drop_index("idx_applications_tenant_amount_id_desc", table_name="applications")
+    op.drop_index("idx_applications_tenant_amount_id", table_name="applications")
+    op.drop_column("applications", "loan_amount")
+    op.execute(
+        f"""
+        ALTER TABLE applications
+        ADD COLUMN loan_amount NUMERIC
+        GENERATED ALWAYS AS (
+          CASE
+            WHEN (loan_request->>'loan_amount') ~ {guard}
+            THEN (loan_request->>'loan_amount')::numeric
+          END
+        ) STORED;
+        """
+    )
+    op.create_index(
+        "idx_applications_tenant_amount_id",
+        "applications",
+        ["tenant_id", "loan_amount", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_applications_tenant_amount_id_desc",
+        "applications",
+        ["tenant_id", sa.text("loan_amount DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    _replace_column(_GUARD)
+
+
+def downgrade() -> None:
+    _replace_column(_GUARD_011)
@@ -0,0 +1,76 @@
+"""sync_application_latest_score: same (created_at, id) order as the refresh
+
+Revision ID: 024_app_latest_score_tiebreak
+Revises: 023_app_loan_amount_bounded
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+
+revision = "024_app_latest_score_tiebreak"
+down_revision = "023_app_loan_amount_bounded"
+branch_labels = None
+depends_on = None
+
+
+_SYNC = """
+CREATE OR REPLACE FUNCTION sync_application_latest_score()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    -- Common path: a new result is the latest unless it is backdated. Ties on
+    -- created_at (e.g. two results in one transaction) go to the higher id, as
+    -- in refresh_application_latest_score() and the backfill.
+    UPDATE applications
+    SET latest_scoring_result_id = NEW.id,
+        latest_score = NEW.score,
+        latest_scored_at = NEW.created_at
+    WHERE id = NEW.application_id
+      AND (latest_scored_at IS NULL OR (latest_scored_at, latest_scoring_result_id) < (NEW.created_at, NEW.id));
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM refresh_application_latest_score(OLD.application_id);
+  ELSE
+    PERFORM refresh_application_latest_score(NEW.application_id);
+    IF OLD.application_id <> NEW.application_id THEN
+      PERFORM refresh_application_latest_score(OLD.application_id);
+    END IF;
+  END IF;
+  RETURN NULL;
+END;
+$$ language 'plpgsql';
+"""
+
+# As in migration 010.
+_SYNC_010 = """
+CREATE OR REPLACE FUNCTION sync_application_latest_score()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    -- Common path: a new result is the latest unless it is backdated.
+    UPDATE applications
+    SET latest_scoring_result_id = NEW.id,
+        latest_score = NEW.score,
+        latest_scored_at = NEW.created_at
+    WHERE id = NEW.application_id
+      AND (latest_scored_at IS NULL OR latest_scored_at <= NEW.created_at);
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM refresh_application_latest_score(OLD.application_id);
+  ELSE
+    PERFORM refresh_application_latest_score(NEW.application_id);
+    IF OLD.application_id <> NEW.application_id THEN
+      PERFORM refresh_application_latest_score(OLD.application_id);
+    END IF;
+  END IF;
+  RETURN NULL;
+END;
+$$ language 'plpgsql';
+"""
+
+
+def upgrade() -> None:
+    op.execute(_SYNC)
+
+
+def downgrade() -> None:
+    op.execute(_SYNC_010)
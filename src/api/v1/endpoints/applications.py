@@ -1,56 +1,253 @@
 from __future__ import annotations
 
+import logging
+import tempfile
 from datetime import datetime
+from typing import Any
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.application import (
     create_application,
-    get_application,
-    get_latest_scoring_result,
+    create_applications_bulk,
+    get_application_detail,
     list_applications,
 )
+from src.crud.pagination import InvalidCursor
 from src.database import get_db
 from src.schemas.application import (
+    ApplicationBatchItemResult,
+    ApplicationBatchRequest,
+    ApplicationBatchResponse,
     ApplicationCreate,
     ApplicationListItem,
     ApplicationListResponse,
     ApplicationRead,
 )
-from src.schemas.scoring_result import ScoringResultRead
 
-from src.tasks.score_application import emit_score_application_task
+from src.tasks.outbox import outbox_enabled
+from src.tasks.score_application import emit_score_application_task, emit_score_application_tasks
 
+logger = logging.getLogger("hitl.api")
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
+# Applications per transaction for bulk intake.
+BATCH_CHUNK_SIZE = 500
+# Longest accepted NDJSON line; longer lines get an error result and are skipped.
+MAX_NDJSON_LINE_BYTES = 256 * 1024
+# NDJSON results are buffered in memory up to this size, then spill to disk.
+NDJSON_RESULT_SPOOL_BYTES = 4 * 1024 * 1024
+
 
 @router.post("", response_model=ApplicationRead, status_code=status.HTTP_201_CREATED)
 async def create_application_endpoint(
     payload: ApplicationCreate,
     session: AsyncSession = Depends(get_db),
 ) -> ApplicationRead:
-    app = await create_application(session=session, obj_in=payload)
+    use_outbox = outbox_enabled()
+    app = await create_application(session=session, obj_in=payload, enqueue_scoring=use_outbox)
 
     # TODO-2.1.1 (done): Emit Celery task score_application(app.id)
-    # Best-effort fire-and-forget hook; it is a no-op unless Celery is enabled.
-    emit_score_application_task(app.id)
+    # With TASK_OUTBOX_ENABLED=1 the task was written to task_outbox in the same
+    # transaction and the relay (src.tasks.outbox) publishes it. Otherwise this is
+    # the best-effort fire-and-forget hook (a no-op unless Celery is enabled);
+    # publishing is blocking I/O, so keep it off the event loop.
+    if not use_outbox:
+        await run_in_threadpool(emit_score_application_task, app.id)
 
     return ApplicationRead.model_validate(app)
 
 
+def _db_error_message(exc: SQLAlchemyError) -> str:
+    """The driver's message (and detail) for a failed insert, e.g. an FK violation."""
+
+    cause = getattr(getattr(exc, "orig", None), "__cause__", None)
+    message = getattr(cause, "message", None)
+    if not message:
+        return "database error"
+    detail = getattr(cause, "detail", None)
+    return f"{message}: {detail}" if detail else message
+
+
+async def _ingest_chunk(
+    session: AsyncSession,
+    chunk: list[tuple[int, Any]],
+) -> list[ApplicationBatchItemResult]:
+    """Validate, insert (one transaction) and emit scoring for one chunk.
+
+    Items are dicts (JSON batch) or raw bytes (NDJSON line); results keep input order.
+    If the chunk's insert fails, its items are retried one per transaction and only
+    the rows the database rejects are reported as errors.
+    """
+
+    results: dict[int, ApplicationBatchItemResult] = {}
+    valid: list[tuple[int, ApplicationCreate]] = []
+    use_outbox = outbox_enabled()
+
+    for index, raw in chunk:
+        try:
+            if isinstance(raw, (bytes, str)):
+                obj = ApplicationCreate.model_validate_json(raw)
+            else:
+                obj = ApplicationCreate.model_validate(raw)
+        except ValidationError as e:
+            errors = [{"loc": list(err["loc"]), "msg": err["msg"]} for err in e.errors()]
+            results[index] = ApplicationBatchItemResult(index=index, status="error", errors=errors)
+        else:
+            valid.append((index, obj))
+
+    if valid:
+        try:
+            created = await create_applications_bulk(
+                session, [obj for _, obj in valid], enqueue_scoring=use_outbox
+            )
+        except SQLAlchemyError:
+            # One bad row (e.g. an unknown tenant_id) rolls back the chunk; retry
+            # item by item, each in its own transaction, so only that row fails.
+            logger.warning("bulk intake chunk failed (%d items), retrying per item", len(valid))
+            ok: list[tuple[int, tuple[UUID, str]]] = []
+            for index, obj in valid:
+                try:
+                    (row,) = await create_applications_bulk(session, [obj], enqueue_scoring=use_outbox)
+                except SQLAlchemyError as e:
+                    logger.exception("bulk intake item %d failed", index)
+                    results[index] = ApplicationBatchItemResult(
+                        index=index, status="error", errors=[{"loc": [], "msg": _db_error_message(e)}]
+                    )
+                else:
+                    ok.append((index, row))
+        else:
+            ok = [(index, row) for (index, _), row in zip(valid, created)]
+
+        for index, (app_id, external_id) in ok:
+            results[index] = ApplicationBatchItemResult(
+                index=index, status="created", id=app_id, external_id=external_id
+            )
+        if ok and not use_outbox:
+            await run_in_threadpool(emit_score_application_tasks, [app_id for _, (app_id, _) in ok])
+
+    return [results[index] for index, _ in chunk]
+
+
+@router.post(":batch", response_model=ApplicationBatchResponse)
+async def create_applications_batch_endpoint(
+    payload: ApplicationBatchRequest,
+    session: AsyncSession = Depends(get_db),
+) -> ApplicationBatchResponse:
+    """Bulk intake: per-item validation, chunked multi-row inserts, per-item results."""
+
+    indexed = list(enumerate(payload.items))
+    results: list[ApplicationBatchItemResult] = []
+    for start in range(0, len(indexed), BATCH_CHUNK_SIZE):
+        results.extend(await _ingest_chunk(session, indexed[start : start + BATCH_CHUNK_SIZE]))
+
+    created = sum(1 for r in results if r.status == "created")
+    return ApplicationBatchResponse(created=created, failed=len(results) - created, results=results)
+
+
+@router.post(":batch-ndjson")
+async def create_applications_ndjson_endpoint(
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """NDJSON bulk intake: one ApplicationCreate per line, read incrementally.
+
+    The body is consumed chunk by chunk (BATCH_CHUNK_SIZE lines per transaction).
+    Lines longer than MAX_NDJSON_LINE_BYTES get an error result and are skipped.
+    Responds with one ApplicationBatchItemResult per line (application/x-ndjson).
+    Results are spooled to a temporary file, which spills to disk past
+    NDJSON_RESULT_SPOOL_BYTES, and streamed back once the whole body is ingested.
+    """
+
+    out = tempfile.SpooledTemporaryFile(max_size=NDJSON_RESULT_SPOOL_BYTES)
+    chunk: list[tuple[int, Any]] = []
+    buffer = b""
+    index = 0
+    skipping = False  # inside an overlong line, until its newline
+
+    def write(results: list[ApplicationBatchItemResult]) -> None:
+        for r in results:
+            out.write(r.model_dump_json().encode() + b"\n")
+
+    async def flush() -> None:
+        nonlocal chunk
+        if chunk:
+            write(await _ingest_chunk(session, chunk))
+            chunk = []
+
+    async def take(line: bytes, *, overlong: bool = False) -> None:
+        nonlocal index
+        if not overlong and not line.strip():
+            return
+        if overlong or len(line) > MAX_NDJSON_LINE_BYTES:
+            await flush()
+            msg = f"line exceeds {MAX_NDJSON_LINE_BYTES} bytes"
+            write([ApplicationBatchItemResult(index=index, status="error", errors=[{"loc": [], "msg": msg}])])
+        else:
+            chunk.append((index, line))
+        index += 1
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            await flush()
+
+    try:
+        async for data in request.stream():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if skipping:
+                    skipping = False  # the rest of an overlong line
+                    continue
+                await take(line)
+            if not skipping and len(buffer) > MAX_NDJSON_LINE_BYTES:
+                await take(buffer, overlong=True)
+                skipping = True
+            if skipping:
+                buffer = b""
+
+        if buffer.strip():
+            await take(buffer)
+        await flush()
+    except BaseException:
+        out.close()
+        raise
+
+    out.seek(0)
+
+    def body():
+        with out:
+            yield from iter(lambda: out.read(64 * 1024), b"")
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
 @router.get("", response_model=ApplicationListResponse)
 async def list_applications_endpoint(
     tenant_id: str = Query(..., description="Tenant UUID"),
     status: str | None = Query(None, description="Application status"),
     from_date: datetime | None = Query(None, description="Filter: created_at >= from_date"),
     to_date: datetime | None = Query(None, description="Filter: created_at <= to_date"),
-    search: str | None = Query(None, description="Search: external_id or applicant name"),
-    sort_by: str = Query("created_at", description="Sort field: created_at | amount | score"),
+    search: str | None = Query(
+        None,
+        description=(
+            "Search: external_id prefix (input with a digit, case-insensitive) or words of the "
+            "applicant name (prefix per word, accent-insensitive); only punctuation/whitespace: no filter"
+        ),
+    ),
+    min_amount: float | None = Query(None, ge=0, description="Filter: loan_amount >= min_amount"),
+    max_amount: float | None = Query(None, ge=0, description="Filter: loan_amount <= max_amount"),
+    sort_by: str = Query("created_at", description="Sort field: created_at | amount | score | relevance (requires search)"),
     sort_order: str = Query("desc", description="Sort order: asc | desc"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyset cursor (next_cursor of the previous page); overrides page"),
+    total_mode: str = Query("exact", description="Total: exact | estimate | none"),
     session: AsyncSession = Depends(get_db),
 ) -> ApplicationListResponse:
     import uuid
@@ -63,30 +260,47 @@ async def list_applications_endpoint(
     if from_date is not None and to_date is not None and from_date > to_date:
         raise HTTPException(status_code=422, detail="from_date must be <= to_date")
 
-    if sort_by not in {"created_at", "amount", "score"}:
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise HTTPException(status_code=422, detail="min_amount must be <= max_amount")
+
+    if sort_by not in {"created_at", "amount", "score", "relevance"}:
         raise HTTPException(status_code=422, detail="Invalid sort_by")
 
+    if sort_by == "relevance" and not (search and search.strip()):
+        raise HTTPException(status_code=422, detail="sort_by=relevance requires search")
+
     if sort_order not in {"asc", "desc"}:
         raise HTTPException(status_code=422, detail="Invalid sort_order")
 
-    items, total = await list_applications(
-        session=session,
-        tenant_id=tenant_uuid,
-        status=status,
-        from_date=from_date,
-        to_date=to_date,
-        search=search,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        page=page,
-        page_size=page_size,
-    )
+    if total_mode not in {"exact", "estimate", "none"}:
+        raise HTTPException(status_code=422, detail="Invalid total_mode")
+
+    try:
+        items, total, next_cursor = await list_applications(
+            session=session,
+            tenant_id=tenant_uuid,
+            status=status,
+            from_date=from_date,
+            to_date=to_date,
+            search=search,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            total_mode=total_mode,
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
 
     return ApplicationListResponse(
         items=[ApplicationListItem.model_validate(i) for i in items],
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
@@ -95,7 +309,7 @@ async def get_application_endpoint(
     application_id: str,
     tenant_id: str | None = Query(None, description="Optional tenant UUID to enforce isolation"),
     session: AsyncSession = Depends(get_db),
-) -> ApplicationRead:
+) -> Response:
     import uuid
 
     try:
@@ -111,13 +325,10 @@ async def get_application_endpoint(
         except ValueError:
             raise HTTPException(status_code=422, detail="Invalid tenant_id")
 
-    app = await get_application(session=session, application_id=app_id, tenant_id=tenant_uuid)
-    if app is None:
+    detail = await get_application_detail(session=session, application_id=app_id, tenant_id=tenant_uuid)
+    if detail is None:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    scoring = await get_latest_scoring_result(session=session, application_id=app.id)
-
-    payload = ApplicationRead.model_validate(app).model_dump()
-    payload["scoring_result"] = ScoringResultRead.model_validate(scoring).model_dump() if scoring else None
-
-    return ApplicationRead(**payload)
+    # Already validated by the loader; serialize once instead of letting
+    # response_model dump + re-validate it.
+    return Response(content=detail.model_dump_json(), media_type="application/json")
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.outbox import outbox_metrics
+from src.database import get_db
+from src.schemas.outbox import OutboxMetricsResponse
+
+router = APIRouter(prefix="/ops", tags=["ops"])
+
+
+@router.get("/outbox", response_model=OutboxMetricsResponse)
+async def outbox_metrics_endpoint(
+    session: AsyncSession = Depends(get_db),
+) -> OutboxMetricsResponse:
+    """task_outbox relay lag (pending rows, oldest pending age, rows in retry)."""
+
+    return OutboxMetricsResponse(**(await outbox_metrics(session)))
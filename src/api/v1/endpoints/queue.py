@@ -1,14 +1,25 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.crud.queue import list_queue_entries, queue_summary
-from src.database import get_db
+from src.crud.queue import (
+    MAX_ACTIVE_CASES,
+    claim_next_case,
+    current_queue_event_cursor,
+    list_queue_entries,
+    queue_events_since,
+    queue_summary,
+)
+from src.database import SessionLocal, get_db
+from src.realtime.queue_feed import get_queue_event_hub, queue_event_stream
 from src.schemas.analyst_queue import (
     AnalystQueueListResponse,
     AnalystQueueRead,
     AnalystQueueSummaryResponse,
+    QueueClaimRequest,
+    QueueClaimResponse,
 )
 
 router = APIRouter(prefix="/queue", tags=["queue"])
@@ -78,3 +89,83 @@ async def queue_summary_endpoint(
 
     payload = await queue_summary(session=session, tenant_id=tenant_uuid)
     return AnalystQueueSummaryResponse(**payload)
+
+
+@router.post("/claim-next", response_model=QueueClaimResponse)
+async def claim_next_endpoint(
+    body: QueueClaimRequest,
+    session: AsyncSession = Depends(get_db),
+) -> QueueClaimResponse:
+    """Assign the tenant's highest-priority pending case to the analyst.
+
+    200 with ``item: null`` when nothing is pending; 409 when the analyst
+    already has MAX_ACTIVE_CASES active cases.
+    """
+
+    result = await claim_next_case(session=session, tenant_id=body.tenant_id, analyst_id=body.analyst_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Analyst not found")
+    if result["limit_reached"]:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Analyst already has {result['active_cases']} active cases (max {MAX_ACTIVE_CASES})",
+        )
+
+    item = result["item"]
+    return QueueClaimResponse(
+        item=AnalystQueueRead.model_validate(item) if item is not None else None,
+        active_cases=result["active_cases"],
+        max_active_cases=MAX_ACTIVE_CASES,
+    )
+
+
+@router.get("/events")
+async def queue_events_endpoint(
+    tenant_id: str = Query(..., description="Tenant UUID"),
+    cursor: int | None = Query(None, ge=0, description="Resume from this event cursor (SSE id)"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Server-sent events for the tenant's queue changes (replaces polling
+    GET /queue and /queue/summary).
+
+    Resumes from ``Last-Event-ID`` (sent by EventSource on reconnect) or
+    ``cursor``. SSE ids are commit-safe cursors, not event ids. A resume may
+    repeat events already received; clients skip them by ``data.id``.
+
+    The stream holds no database connection. Live events come from the
+    process-wide LISTEN connection, and each replay uses a short-lived session.
+    """
+
+    import uuid
+
+    try:
+        tenant_uuid = uuid.UUID(tenant_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid tenant_id")
+
+    if last_event_id is not None:
+        try:
+            cursor = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid Last-Event-ID")
+
+    async def replay(after: int, limit: int) -> list[dict]:
+        async with SessionLocal() as session:
+            return await queue_events_since(session, tenant_id=tenant_uuid, cursor=after, limit=limit)
+
+    async def latest() -> int:
+        async with SessionLocal() as session:
+            return await current_queue_event_cursor(session)
+
+    stream = queue_event_stream(
+        get_queue_event_hub(),
+        tenant_uuid,
+        cursor=cursor,
+        replay=replay,
+        latest=latest,
+    )
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
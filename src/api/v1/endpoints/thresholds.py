@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+
+from src.config import settings
+from src.ml.routing import InvalidRules
+from src.ml.simulation import run_simulation
+from src.schemas.threshold_simulation import ThresholdSimulationRequest, ThresholdSimulationResponse
+
+router = APIRouter(prefix="/thresholds", tags=["thresholds"])
+
+
+@router.post("/simulate", response_model=ThresholdSimulationResponse)
+async def simulate_thresholds_endpoint(payload: ThresholdSimulationRequest) -> ThresholdSimulationResponse:
+    """What-if: approve / queue / decline split, default rates and loss per
+    candidate (auto_approve_min, auto_decline_max) over the tenant's scored
+    applications, plus the approve-cutoff loss curve."""
+
+    try:
+        # Streams the whole history on a connection of its own; keep it off the event loop.
+        result = await asyncio.to_thread(
+            run_simulation,
+            settings.database_url,
+            payload.tenant_id,
+            [(c.auto_approve_min, c.auto_decline_max) for c in payload.candidates],
+            rules=payload.rules,
+            scored_from=payload.scored_from,
+            scored_to=payload.scored_to,
+            curve_step=payload.curve_step,
+        )
+    except InvalidRules as e:
+        raise HTTPException(status_code=422, detail=f"Invalid rules: {e}") from None
+    return ThresholdSimulationResponse(**result)
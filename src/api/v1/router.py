@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
 from src.api.v1.endpoints.applications import router as applications_router
+from src.api.v1.endpoints.ops import router as ops_router
 from src.api.v1.endpoints.queue import router as queue_router
+from src.api.v1.endpoints.thresholds import router as thresholds_router
 
 router = APIRouter()
 
@@ -13,3 +15,5 @@ async def ping():
 
 router.include_router(applications_router)
 router.include_router(queue_router)
+router.include_router(ops_router)
+router.include_router(thresholds_router)
@@ -0,0 +1 @@
+"""Audit trail: batched audit_logs writer and request context (src/audit/writer.py)."""
@@ -0,0 +1,366 @@
+"""Batched audit_logs writer.
+
+Business code builds :class:`AuditEvent`s (request id, client IP and user
+agent are taken from the request context the API middleware sets) and either:
+
+  - stages them in its own transaction (``strict``) for compliance-critical
+    actions, where the row must commit or roll back with the change; or
+  - hands them to the process-wide :class:`AuditWriter` after its commit. The
+    writer buffers up to AUDIT_WRITER_BUFFER events in memory; one background
+    thread drains the buffer with one ``COPY`` per batch (AUDIT_WRITER_BATCH_SIZE
+    events, or what arrived within AUDIT_WRITER_FLUSH_MS).
+
+Backpressure: when the buffer is full, the submitting caller writes its events
+itself (one COPY on a short-lived connection), so a slow database slows
+writers down instead of growing the buffer or dropping events.
+
+``created_at`` is stamped when the event is built, not when it is flushed.
+Buffered events are lost if the process dies before a flush; that is the
+trade-off strict mode exists for. AUDIT_WRITER_ENABLED=0 makes every event
+strict.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import ipaddress
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+import psycopg
+from psycopg.types.json import Jsonb
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.audit_log import AuditLog
+
+logger = logging.getLogger("hitl.audit")
+
+COLUMNS = (
+    "id",
+    "tenant_id",
+    "user_id",
+    "entity_type",
+    "entity_id",
+    "action",
+    "old_value",
+    "new_value",
+    "change_summary",
+    "ip_address",
+    "user_agent",
+    "request_id",
+    "created_at",
+)
+
+_COPY_SQL = f"COPY audit_logs ({', '.join(COLUMNS)}) FROM STDIN"
+_INSERT_SQL = f"INSERT INTO audit_logs ({', '.join(COLUMNS)}) VALUES ({', '.join(['%s'] * len(COLUMNS))})"
+
+
+# Set per request by the API middleware (src/main.py).
+_request_context: ContextVar[dict[str, Any] | None] = ContextVar("hitl_audit_request", default=None)
+
+
+def set_request_context(request_id: str | None, ip_address: str | None, user_agent: str | None) -> None:
+    """Record the current request's id / client IP / user agent for audit events.
+
+    Values that do not fit the columns (non-UUID request ids, non-IP hosts)
+    are stored as NULL.
+    """
+
+    try:
+        rid = uuid.UUID(request_id) if request_id else None
+    except ValueError:
+        rid = None
+    try:
+        ip = str(ipaddress.ip_address(ip_address)) if ip_address else None
+    except ValueError:
+        ip = None
+    _request_context.set({"request_id": rid, "ip_address": ip, "user_agent": user_agent})
+
+
+def _from_request(key: str) -> Any:
+    ctx = _request_context.get()
+    return ctx.get(key) if ctx else None
+
+
+@dataclass
+class AuditEvent:
+    tenant_id: uuid.UUID
+    entity_type: str
+    entity_id: uuid.UUID
+    action: str
+    user_id: uuid.UUID | None = None
+    old_value: dict | None = None
+    new_value: dict | None = None
+    change_summary: str | None = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    request_id: uuid.UUID | None = field(default_factory=lambda: _from_request("request_id"))
+    ip_address: str | None = field(default_factory=lambda: _from_request("ip_address"))
+    user_agent: str | None = field(default_factory=lambda: _from_request("user_agent"))
+
+    def as_row(self) -> dict[str, Any]:
+        """Column -> value, as for ``insert(AuditLog)`` / ``AuditLog(**row)``."""
+
+        return {c: getattr(self, c) for c in COLUMNS}
+
+    def _copy_row(self) -> tuple:
+        row = self.as_row()
+        for key in ("old_value", "new_value"):
+            if row[key] is not None:
+                row[key] = Jsonb(row[key])
+        return tuple(row.values())
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def write_events(conn: psycopg.Connection, events: list[AuditEvent]) -> int:
+    """COPY ``events`` into audit_logs and commit. If the batch is rejected
+    (e.g. a foreign key, or a value JSON cannot encode), rows are retried one
+    by one and the bad ones are logged and skipped. Returns the number written.
+
+    Raises ``psycopg.OperationalError`` (connection lost, server shutting
+    down, ...): that is the one failure worth retrying the batch for.
+    """
+
+    try:
+        with conn.cursor() as cur:
+            with cur.copy(_COPY_SQL) as copy:
+                for event in events:
+                    copy.write_row(event._copy_row())
+        conn.commit()
+        return len(events)
+    except psycopg.OperationalError:
+        raise
+    except Exception:
+        conn.rollback()
+
+    written = 0
+    for event in events:
+        try:
+            conn.execute(_INSERT_SQL, event._copy_row())
+            conn.commit()
+            written += 1
+        except psycopg.OperationalError:
+            raise
+        except Exception:
+            conn.rollback()
+            logger.exception("audit writer: dropping invalid event %s (%s %s)", event.id, event.entity_type, event.action)
+    return written
+
+
+class AuditWriter:
+    """Bounded buffer + one flusher thread (own connection) writing batches."""
+
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        max_buffer: int = 10_000,
+        batch_size: int = 500,
+        flush_ms: float = 200.0,
+        retry_seconds: float = 1.0,
+    ) -> None:
+        self._dsn = _sync_dsn(database_url)
+        self.batch_size = batch_size
+        self._flush_wait = flush_ms / 1000
+        self.retry_seconds = retry_seconds
+        self._queue: queue.Queue[AuditEvent] = queue.Queue(maxsize=max_buffer)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"buffered": 0, "written": 0, "inline": 0, "batches": 0, "dropped": 0}
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "pending": self._queue.qsize()}
+
+    def submit(self, events: Iterable[AuditEvent]) -> None:
+        """Buffer ``events``; whatever does not fit is written before returning
+        (blocking). Call after the business transaction committed."""
+
+        overflow = self._enqueue(events)
+        if overflow:
+            self._write_inline(overflow)
+
+    async def submit_async(self, events: Iterable[AuditEvent]) -> None:
+        """:meth:`submit` for the event loop: the overflow write runs in a worker thread."""
+
+        overflow = self._enqueue(events)
+        if overflow:
+            await asyncio.to_thread(self._write_inline, overflow)
+
+    def _enqueue(self, events: Iterable[AuditEvent]) -> list[AuditEvent]:
+        """Buffer events in order until the buffer is full; returns the rest."""
+
+        events = list(events)
+        if not events:
+            return []
+        self._ensure_started()
+        buffered = 0
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                break
+            buffered += 1
+        with self._lock:
+            self._stats["buffered"] += buffered
+        return events[buffered:]
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything submitted so far is written (True) or ``timeout``."""
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._queue.all_tasks_done:
+                if not self._queue.unfinished_tasks:
+                    return True
+                self._queue.all_tasks_done.wait(min(0.05, max(deadline - time.monotonic(), 0)))
+        return not self._queue.unfinished_tasks
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush what is buffered, then stop the flusher thread."""
+
+        if self._thread is not None and self._thread.is_alive():
+            self.flush(timeout)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._run, name="hitl-audit-writer", daemon=True)
+                    self._thread.start()
+
+    def _write_inline(self, events: list[AuditEvent]) -> None:
+        logger.warning("audit writer: buffer full; writing %d event(s) inline", len(events))
+        with psycopg.connect(self._dsn) as conn:
+            written = write_events(conn, events)
+        with self._lock:
+            self._stats["inline"] += written
+            self._stats["dropped"] += len(events) - written
+
+    def _next_batch(self) -> list[AuditEvent]:
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self._flush_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        conn: psycopg.Connection | None = None
+        batch: list[AuditEvent] = []
+        while not (self._stop.is_set() and not batch and self._queue.empty()):
+            batch = batch or self._next_batch()
+            if not batch:
+                continue
+            done, written = True, 0
+            try:
+                if conn is None or conn.closed:
+                    conn = psycopg.connect(self._dsn)
+                written = write_events(conn, batch)
+            except psycopg.OperationalError:
+                # Connection-level failure: keep the batch and retry. The buffer
+                # fills meanwhile and callers fall back to writing inline.
+                done = False
+                logger.exception("audit writer: flush of %d event(s) failed; retrying", len(batch))
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                self._stop.wait(self.retry_seconds)
+            except Exception:
+                # Not recoverable by retrying; the thread and later batches must survive it.
+                logger.exception("audit writer: dropping batch of %d event(s)", len(batch))
+                if conn is not None:
+                    conn.close()
+                    conn = None
+            finally:
+                if done:
+                    with self._lock:
+                        self._stats["written"] += written
+                        self._stats["dropped"] += len(batch) - written
+                        self._stats["batches"] += 1
+                    for _ in batch:
+                        self._queue.task_done()
+                    batch = []
+        if conn is not None:
+            conn.close()
+
+
+def audit_writer_enabled() -> bool:
+    return os.getenv("AUDIT_WRITER_ENABLED", "1") == "1"
+
+
+_writer: AuditWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    """Process-wide writer (AUDIT_WRITER_BUFFER / _BATCH_SIZE / _FLUSH_MS)."""
+
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            from src.config import settings
+
+            _writer = AuditWriter(
+                settings.database_url,
+                max_buffer=int(os.getenv("AUDIT_WRITER_BUFFER", "10000")),
+                batch_size=int(os.getenv("AUDIT_WRITER_BATCH_SIZE", "500")),
+                flush_ms=float(os.getenv("AUDIT_WRITER_FLUSH_MS", "200")),
+            )
+            atexit.register(_writer.close)
+        return _writer
+
+
+def stage_audit(session: AsyncSession, events: Iterable[AuditEvent], *, strict: bool = False) -> list[AuditEvent]:
+    """Add ``events`` to ``session`` when ``strict`` (or the writer is disabled)
+    so they commit with the business change, and return []; otherwise return
+    them for :func:`submit_audit` once the transaction has committed."""
+
+    events = list(events)
+    if strict or not audit_writer_enabled():
+        session.add_all([AuditLog(**event.as_row()) for event in events])
+        return []
+    return events
+
+
+async def submit_audit(events: list[AuditEvent]) -> None:
+    """Hand post-commit events from :func:`stage_audit` to the writer."""
+
+    if events:
+        await get_audit_writer().submit_async(events)
+
+
+def _reset_after_fork() -> None:
+    # The flusher thread and its connection do not survive fork.
+    global _writer, _writer_lock
+    _writer = None
+    _writer_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,41 +1,36 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import sqlalchemy as sa
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-
+from sqlalchemy.orm import aliased
+
+from src.audit.writer import AuditEvent, stage_audit, submit_audit
+from src.crud.outbox import enqueue_score_application
+from src.crud.pagination import decode_cursor, encode_cursor, estimate_row_count
+from src.crud.search import search_filter
+from src.ml.features import get_feature_extractor
+from src.models.analyst_queue import AnalystQueue
 from src.models.application import Application
 from src.models.audit_log import AuditLog
 from src.models.scoring_result import ScoringResult
-from src.schemas.application import ApplicationCreate
-
-
-def _compute_derived(financial_data: dict, loan_request: dict) -> dict:
-    # Spec (hitl/todo.md):
-    # dti_ratio = (monthly_obligations + existing_loans_payment) / net_monthly_income
-    # loan_to_income = loan_amount / (net_monthly_income * 12)
-    # payment_to_income = estimated_payment / net_monthly_income
-    net_income = float(financial_data.get("net_monthly_income", 0) or 0)
-    monthly_obligations = float(financial_data.get("monthly_obligations", 0) or 0)
-    existing_loans_payment = float(financial_data.get("existing_loans_payment", 0) or 0)
-    loan_amount = float(loan_request.get("loan_amount", 0) or 0)
-    estimated_payment = float(loan_request.get("estimated_payment", 0) or 0)
-
-    if net_income <= 0:
-        # Avoid division by zero. Keep ratios None if we cannot compute.
-        return {
-            "dti_ratio": None,
-            "loan_to_income": None,
-            "payment_to_income": None,
-        }
+from src.models.similar_case import SimilarCase
+from src.schemas.application import ApplicationCreate, ApplicationRead
+from src.schemas.analyst_queue import AnalystQueueRead
+from src.schemas.scoring_result import ScoringResultRead
+from src.schemas.similar_case import SimilarCaseRead
+
 
+def _feature_payload(obj_in: ApplicationCreate) -> dict:
     return {
-        "dti_ratio": (monthly_obligations + existing_loans_payment) / net_income,
-        "loan_to_income": loan_amount / (net_income * 12.0),
-        "payment_to_income": estimated_payment / net_income,
+        "applicant_data": obj_in.applicant_data,
+        "financial_data": obj_in.financial_data,
+        "loan_request": obj_in.loan_request,
+        "credit_bureau_data": obj_in.credit_bureau_data,
     }
 
 
@@ -58,16 +53,96 @@ async def get_latest_scoring_result(
     *,
     application_id,
 ) -> ScoringResult | None:
+    # Two primary-key lookups via the trigger-maintained pointer (migration 010).
     q = (
         select(ScoringResult)
-        .where(ScoringResult.application_id == application_id)
-        .order_by(ScoringResult.created_at.desc())
-        .limit(1)
+        .join(Application, Application.latest_scoring_result_id == ScoringResult.id)
+        .where(Application.id == application_id)
     )
     r = await session.execute(q)
     return r.scalar_one_or_none()
 
 
+async def get_application_detail(
+    session: AsyncSession,
+    *,
+    application_id,
+    tenant_id=None,
+    similar_limit: int = 5,
+) -> ApplicationRead | None:
+    """Load the detail view (application + latest score + active queue entry +
+    top similar cases) in a single statement.
+
+    - latest score: outer join on the denormalized pointer (migration 010)
+    - queue_info: LATERAL top-1 over the application's active queue entries
+    - similar_cases: correlated jsonb_agg over the best ``similar_limit`` matches
+    """
+
+    active_queue = (
+        select(AnalystQueue)
+        .where(AnalystQueue.application_id == Application.id)
+        .where(AnalystQueue.status.in_(["pending", "assigned", "in_progress"]))
+        .order_by(AnalystQueue.created_at.desc())
+        .limit(1)
+        .lateral("active_queue")
+    )
+    queue_entry = aliased(AnalystQueue, active_queue)
+
+    top_similar = (
+        select(SimilarCase)
+        .where(SimilarCase.application_id == Application.id)
+        .order_by(SimilarCase.match_score.desc(), SimilarCase.id)
+        .limit(similar_limit)
+        .subquery("top_similar")
+    )
+    c = top_similar.c
+    similar_json = (
+        select(
+            func.coalesce(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            "id", c.id,
+                            "matched_application_id", c.matched_application_id,
+                            "match_score", c.match_score,
+                            "features_snapshot", c.features_snapshot,
+                            "outcome_snapshot", c.outcome_snapshot,
+                            "method", c.method,
+                            "created_at", c.created_at,
+                        ),
+                        c.match_score.desc(),
+                    )
+                ),
+                sa.text("'[]'::jsonb"),
+                type_=JSONB,
+            )
+        )
+        .select_from(top_similar)
+        .scalar_subquery()
+    )
+
+    q = (
+        select(Application, ScoringResult, queue_entry, similar_json.label("similar_cases"))
+        .outerjoin(ScoringResult, ScoringResult.id == Application.latest_scoring_result_id)
+        .outerjoin(active_queue, sa.true())
+        .where(Application.id == application_id)
+    )
+    if tenant_id is not None:
+        q = q.where(Application.tenant_id == tenant_id)
+
+    row = (await session.execute(q)).one_or_none()
+    if row is None:
+        return None
+
+    app, scoring, queue, similar = row
+    # Validate each part once; no dump/re-validate round trip.
+    detail = ApplicationRead.model_validate(app)
+    detail.scoring_result = ScoringResultRead.model_validate(scoring) if scoring else None
+    detail.queue_info = AnalystQueueRead.model_validate(queue) if queue else None
+    detail.similar_cases = [SimilarCaseRead.model_validate(s) for s in similar or []]
+    return detail
+
+
 async def list_applications(
     session: AsyncSession,
     *,
@@ -76,12 +151,32 @@ async def list_applications(
     from_date: datetime | None = None,
     to_date: datetime | None = None,
     search: str | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
     page: int = 1,
     page_size: int = 20,
-) -> tuple[list[Application], int]:
-    # Phase 2.1.2 (minimal): listing + status filter + simple pagination.
+    cursor: str | None = None,
+    total_mode: str = "exact",
+) -> tuple[list[Application], int | None, str | None]:
+    """List a tenant's applications.
+
+    Two paging modes:
+    - offset (default): ``page``/``page_size``; cost grows with page depth.
+    - keyset: pass ``cursor`` (the ``next_cursor`` of the previous page); we seek on
+      ``(sort key, id)`` so every page costs the same regardless of depth.
+
+    ``search`` uses the full-text/prefix engine in src.crud.search; with a search,
+    ``sort_by="relevance"`` orders by ts_rank.
+
+    ``total_mode`` controls the total: ``exact`` (count(*) over the filter),
+    ``estimate`` (planner row estimate, O(1)) or ``none``.
+
+    Returns (items, total, next_cursor); next_cursor is None on the last page.
+    Raises InvalidCursor if ``cursor`` is malformed or was issued for another sort.
+    """
+
     # Tenant id is required until auth/tenant-context middleware lands.
     if page < 1:
         page = 1
@@ -92,28 +187,14 @@ async def list_applications(
 
     base = select(Application).where(Application.tenant_id == tenant_id)
 
-    score_subq = None
-    if sort_by == "score":
-        # There may be multiple scoring results over time; list view sorts by the
-        # latest/highest score we have for the application (v0: max(score)).
-        score_subq = (
-            select(
-                ScoringResult.application_id.label("app_id"),
-                func.max(ScoringResult.score).label("score"),
-            )
-            .group_by(ScoringResult.application_id)
-            .subquery()
-        )
-        base = base.outerjoin(score_subq, score_subq.c.app_id == Application.id)
     if status:
         base = base.where(Application.status == status)
 
+    rank_expr = None
     if search:
-        s = f"%{search.strip()}%"
-        base = base.where(
-            (Application.external_id.ilike(s))
-            | (Application.applicant_data["name"].astext.ilike(s))
-        )
+        search_clause, rank_expr = search_filter(search)
+        if search_clause is not None:
+            base = base.where(search_clause)
 
     # If caller provided naive datetimes, assume UTC.
     if from_date is not None and from_date.tzinfo is None:
@@ -126,43 +207,96 @@ async def list_applications(
     if to_date is not None:
         base = base.where(Application.created_at <= to_date)
 
+    if min_amount is not None:
+        base = base.where(Application.loan_amount >= min_amount)
+    if max_amount is not None:
+        base = base.where(Application.loan_amount <= max_amount)
+
     # total count
-    count_q = select(func.count()).select_from(base.subquery())
-    total = int((await session.execute(count_q)).scalar_one())
-
-    # Ordering
-    order_expr = None
-    if sort_by == "created_at":
-        order_expr = Application.created_at
-    elif sort_by == "amount":
-        # loan_request is JSONB; cast loan_amount to numeric for sorting.
-        order_expr = Application.loan_request["loan_amount"].astext.cast(sa.Numeric)
+    total: int | None = None
+    if total_mode == "exact":
+        count_q = select(func.count()).select_from(base.subquery())
+        total = int((await session.execute(count_q)).scalar_one())
+    elif total_mode == "estimate":
+        total = await estimate_row_count(session, base)
+
+    # Ordering: (sort key, id) so the order is total and seekable.
+    nullable_key = True
+    if sort_by == "amount":
+        # Stored generated column (migration 011), indexed per tenant.
+        key_expr = Application.loan_amount
     elif sort_by == "score":
-        # Joined via score_subq above.
-        order_expr = (score_subq.c.score if score_subq is not None else None)
+        # Latest score, denormalized onto applications (NULL until scored).
+        key_expr = Application.latest_score
+    elif sort_by == "relevance" and rank_expr is not None:
+        key_expr = rank_expr
+        nullable_key = False
     else:
-        order_expr = Application.created_at
-
-    if order_expr is None:
-        order_expr = Application.created_at
+        sort_by = "created_at"
+        key_expr = Application.created_at
+        nullable_key = False
+
+    descending = sort_order != "asc"
+
+    if cursor is not None:
+        key, last_id = decode_cursor(cursor, sort_by=sort_by, sort_order=sort_order)
+        after = (
+            sa.tuple_(key_expr, Application.id) < sa.tuple_(key, last_id)
+            if descending
+            else sa.tuple_(key_expr, Application.id) > sa.tuple_(key, last_id)
+        )
+        if key is None:
+            # Already inside the NULLS LAST tail: only ids remain to seek on.
+            after = sa.and_(
+                key_expr.is_(None),
+                Application.id < last_id if descending else Application.id > last_id,
+            )
+        elif nullable_key:
+            after = sa.or_(after, key_expr.is_(None))
+        base = base.where(after)
 
-    if sort_order == "asc":
-        order_expr = sa.nulls_last(order_expr.asc())
+    if descending:
+        order_by = [key_expr.desc(), Application.id.desc()]
     else:
-        order_expr = sa.nulls_last(order_expr.desc())
+        order_by = [key_expr.asc(), Application.id.asc()]
+    if nullable_key:
+        # created_at is NOT NULL; keep its ORDER BY index-compatible.
+        order_by[0] = sa.nulls_last(order_by[0])
+
+    q = base.add_columns(key_expr.label("sort_key")).order_by(*order_by)
+    if cursor is None:
+        q = q.offset((page - 1) * page_size)
+    # Fetch one extra row to learn whether another page exists.
+    rows = (await session.execute(q.limit(page_size + 1))).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_app, last_key = rows[-1]
+        next_cursor = encode_cursor(
+            sort_by=sort_by, sort_order=sort_order, key=last_key, id=last_app.id
+        )
 
-    q = base.order_by(order_expr).offset((page - 1) * page_size).limit(page_size)
-    items = (await session.execute(q)).scalars().all()
+    return [r[0] for r in rows], total, next_cursor
 
-    return items, total
 
+async def create_application(
+    session: AsyncSession,
+    obj_in: ApplicationCreate,
+    *,
+    enqueue_scoring: bool = False,
+) -> Application:
+    """Insert an application; with ``enqueue_scoring`` also a task_outbox row
+    for scoring, in one transaction. The audit row goes to the batched audit
+    writer after the commit (src/audit/writer.py).
+    """
 
-async def create_application(session: AsyncSession, obj_in: ApplicationCreate) -> Application:
     external_id = obj_in.external_id or f"APP-{uuid4().hex[:10]}"
 
     expires_at = datetime.now(timezone.utc) + timedelta(days=30)
 
-    derived = _compute_derived(obj_in.financial_data, obj_in.loan_request)
+    # Derived features (src/ml/features); undefined ratios are stored as null.
+    derived = get_feature_extractor().extract_one(_feature_payload(obj_in))
 
     app = Application(
         tenant_id=obj_in.tenant_id,
@@ -180,13 +314,11 @@ async def create_application(session: AsyncSession, obj_in: ApplicationCreate) -
     session.add(app)
     await session.flush()  # ensure app.id is available
 
-    audit = AuditLog(
+    audit = AuditEvent(
         tenant_id=obj_in.tenant_id,
-        user_id=None,
         entity_type="application",
         entity_id=app.id,
         action="create",
-        old_value=None,
         new_value={
             "external_id": external_id,
             "status": "pending",
@@ -195,8 +327,87 @@ async def create_application(session: AsyncSession, obj_in: ApplicationCreate) -
         },
         change_summary="application created",
     )
-    session.add(audit)
+    deferred = stage_audit(session, [audit])
+
+    if enqueue_scoring:
+        await enqueue_score_application(session, [app.id])
 
     await session.commit()
+    await submit_audit(deferred)
     await session.refresh(app)
     return app
+
+
+async def create_applications_bulk(
+    session: AsyncSession,
+    objs_in: list[ApplicationCreate],
+    *,
+    enqueue_scoring: bool = False,
+) -> list[tuple[UUID, str]]:
+    """Insert a chunk of already-validated applications (+ their audit rows)
+    in one transaction: two multi-row INSERTs and a commit, regardless of size.
+
+    Ids are generated client-side so no RETURNING/refresh round trip is needed.
+    Audit rows stay in the chunk transaction: they already cost one statement.
+    With ``enqueue_scoring`` the chunk's task_outbox rows go into the same
+    transaction (a third multi-row INSERT).
+    Returns [(id, external_id)] in input order. On error the chunk is rolled back
+    and the exception propagates.
+    """
+
+    expires_at = datetime.now(timezone.utc) + timedelta(days=30)
+
+    extractor = get_feature_extractor()
+    derived_rows = extractor.to_dicts(extractor.raw_matrix(_feature_payload(o) for o in objs_in))
+
+    app_rows: list[dict] = []
+    audit_rows: list[dict] = []
+    for obj_in, derived in zip(objs_in, derived_rows):
+        app_id = uuid4()
+        external_id = obj_in.external_id or f"APP-{uuid4().hex[:10]}"
+
+        app_rows.append(
+            {
+                "id": app_id,
+                "tenant_id": obj_in.tenant_id,
+                "external_id": external_id,
+                "status": "pending",
+                "applicant_data": obj_in.applicant_data,
+                "financial_data": obj_in.financial_data,
+                "loan_request": obj_in.loan_request,
+                "credit_bureau_data": obj_in.credit_bureau_data,
+                "source": obj_in.source,
+                "meta": {"derived": derived},
+                "expires_at": expires_at,
+            }
+        )
+        audit_rows.append(
+            AuditEvent(
+                tenant_id=obj_in.tenant_id,
+                entity_type="application",
+                entity_id=app_id,
+                action="create",
+                new_value={
+                    "external_id": external_id,
+                    "status": "pending",
+                    "source": obj_in.source,
+                    "meta": {"derived": derived},
+                },
+                change_summary="application created (batch)",
+            ).as_row()
+        )
+
+    if not app_rows:
+        return []
+
+    try:
+        await session.execute(insert(Application), app_rows)
+        await session.execute(insert(AuditLog), audit_rows)
+        if enqueue_scoring:
+            await enqueue_score_application(session, [row["id"] for row in app_rows])
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+    return [(row["id"], row["external_id"]) for row in app_rows]
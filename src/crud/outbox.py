@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.task_outbox import TaskOutbox
+from src.tasks.score_application import score_application_task_name
+
+
+async def enqueue_score_application(session: AsyncSession, application_ids: list[UUID]) -> None:
+    """Add score_application outbox rows to the caller's (uncommitted) transaction.
+
+    One multi-row INSERT. The dedup key is the application id; a row for an
+    application that already has a pending one is skipped (ON CONFLICT against
+    the partial unique index).
+    """
+
+    if not application_ids:
+        return
+
+    task_name = score_application_task_name()
+    rows = [
+        {
+            "task_name": task_name,
+            "payload": {"args": [str(application_id)]},
+            "dedup_key": f"{task_name}:{application_id}",
+        }
+        for application_id in application_ids
+    ]
+    stmt = insert(TaskOutbox).on_conflict_do_nothing(
+        index_elements=[TaskOutbox.dedup_key],
+        index_where=TaskOutbox.published_at.is_(None),
+    )
+    await session.execute(stmt, rows)
+
+
+# Also run by the relay over psycopg (src.tasks.outbox.outbox_lag).
+OUTBOX_LAG_SQL = """
+SELECT count(*),
+       EXTRACT(EPOCH FROM NOW() - min(created_at)),
+       count(*) FILTER (WHERE attempts > 0)
+FROM task_outbox
+WHERE published_at IS NULL
+"""
+
+
+def outbox_lag_row(row) -> dict:
+    pending, oldest_age, retrying = row
+    return {
+        "pending": pending,
+        "oldest_pending_age_seconds": float(oldest_age) if oldest_age is not None else None,
+        "retrying": retrying,
+    }
+
+
+async def outbox_metrics(session: AsyncSession) -> dict:
+    """Relay lag: pending rows, age of the oldest one, rows being retried."""
+
+    return outbox_lag_row((await session.execute(text(OUTBOX_LAG_SQL))).one())
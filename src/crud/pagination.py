@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable, Select
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client-supplied cursor cannot be decoded or does not match the query."""
+
+
+def _encode_key(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(*, sort_by: str, sort_order: str, key: Any, id: UUID) -> str:
+    """Encode the last row of a page as an opaque, URL-safe cursor.
+
+    The cursor pins sort_by/sort_order so it cannot be replayed against a
+    differently ordered listing.
+    """
+
+    raw = json.dumps(
+        {"s": sort_by, "o": sort_order, "k": _encode_key(key), "id": str(id)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *, sort_by: str, sort_order: str) -> tuple[Any, UUID]:
+    """Decode a cursor into (sort key, id). Raises InvalidCursor on any mismatch."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != sort_by or data["o"] != sort_order:
+            raise InvalidCursor("cursor does not match sort_by/sort_order")
+
+        key = data["k"]
+        if key is not None:
+            if sort_by == "created_at":
+                key = datetime.fromisoformat(key)
+            elif sort_by == "amount":
+                key = Decimal(key)
+            elif sort_by == "score":
+                key = int(key)
+            elif sort_by == "relevance":
+                key = float(key)
+
+        return key, UUID(data["id"])
+    except InvalidCursor:
+        raise
+    except Exception as e:  # malformed base64/json/uuid/key
+        raise InvalidCursor("malformed cursor") from e
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_row_count(session: AsyncSession, stmt: Select) -> int:
+    """Return the planner's row estimate for ``stmt`` without executing it.
+
+    Cost is independent of table size (it only reads pg_class/pg_statistic), at
+    the price of being approximate; accuracy depends on ANALYZE freshness.
+    """
+
+    plan = (await session.execute(_Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -4,11 +4,22 @@ from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 import sqlalchemy as sa
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.audit.writer import AuditEvent, stage_audit
 from src.models.analyst_queue import AnalystQueue
-from src.models.application import Application
+from src.models.queue_event import QueueEvent
+from src.models.queue_summary_counter import QueueSummaryCounter
+from src.models.user import User
+
+# TODO-2.2.2: an analyst works at most this many assigned/in_progress cases.
+MAX_ACTIVE_CASES = 5
+ACTIVE_STATUSES = ("assigned", "in_progress")
+# Covered by the partial tenant-leading indexes (migration 014).
+OPEN_STATUSES = ("pending", "assigned", "in_progress")
+# queue_priority_bucket(): <= 20 high, <= 50 medium, else low.
+PRIORITY_BUCKETS = ("high", "medium", "low")
 
 
 async def list_queue_entries(
@@ -23,23 +34,17 @@ async def list_queue_entries(
     limit: int = 50,
     offset: int = 0,
 ) -> list[AnalystQueue]:
-    """List queue entries for a tenant.
-
-    NOTE: analyst_queues has no tenant_id; we enforce isolation via applications.tenant_id.
-    """
+    """List queue entries for a tenant (tenant-leading idx_queue_tenant_priority)."""
 
     # Defense-in-depth normalization (endpoint also validates).
     limit = max(1, min(limit, 200))
     offset = max(0, offset)
 
-    q = (
-        select(AnalystQueue)
-        .join(Application, Application.id == AnalystQueue.application_id)
-        .where(Application.tenant_id == tenant_id)
-    )
+    q = select(AnalystQueue).where(AnalystQueue.tenant_id == tenant_id)
 
     if status is not None:
-        q = q.where(AnalystQueue.status == status)
+        # Inlined so the partial index predicate (open statuses) is provable in cached plans.
+        q = q.where(AnalystQueue.status == sa.bindparam("status", status, literal_execute=True))
     if analyst_id is not None:
         q = q.where(AnalystQueue.analyst_id == analyst_id)
     if priority_max is not None:
@@ -66,48 +71,202 @@ async def queue_summary(
     *,
     tenant_id: UUID,
 ) -> dict:
-    """Return a summary payload per hitl/todo.md TODO-2.2.1."""
+    """Return a summary payload per hitl/todo.md TODO-2.2.1.
+
+    Status and priority totals are read from queue_summary_counters (kept up to
+    date by trigger, migration 015): a bounded number of rows per tenant,
+    however long the queue is. Only the time-dependent SLA buckets are counted
+    live, over the (tenant_id, sla_deadline) range up to now + 2h.
+    """
 
     now = datetime.now(timezone.utc)
     approaching_cutoff = now + timedelta(hours=2)
 
-    base = (
-        select(AnalystQueue)
-        .join(Application, Application.id == AnalystQueue.application_id)
-        .where(Application.tenant_id == tenant_id)
-        .where(AnalystQueue.status.in_(["pending", "assigned", "in_progress"]))
-    ).subquery()
-
-    totals_q = select(
-        # totals by status
-        func.sum(sa.case((base.c.status == "pending", 1), else_=0)).label("total_pending"),
-        func.sum(sa.case((base.c.status == "assigned", 1), else_=0)).label("total_assigned"),
-        func.sum(sa.case((base.c.status == "in_progress", 1), else_=0)).label("total_in_progress"),
-        # SLA metrics
-        func.sum(
-            sa.case(
-                (sa.and_(base.c.sla_deadline > now, base.c.sla_deadline <= approaching_cutoff), 1),
-                else_=0,
+    counters = (
+        await session.execute(
+            select(
+                QueueSummaryCounter.status,
+                QueueSummaryCounter.priority_bucket,
+                func.sum(QueueSummaryCounter.n),
+            )
+            .where(QueueSummaryCounter.tenant_id == tenant_id)
+            .group_by(QueueSummaryCounter.status, QueueSummaryCounter.priority_bucket)
+        )
+    ).all()
+
+    by_status = {status: 0 for status in OPEN_STATUSES}
+    by_priority = {bucket: 0 for bucket in PRIORITY_BUCKETS}
+    for status, bucket, n in counters:
+        if status in by_status and bucket in by_priority:
+            by_status[status] += int(n)
+            by_priority[bucket] += int(n)
+
+    # Served by idx_queue_tenant_sla (migration 014).
+    sla = (
+        await session.execute(
+            select(
+                func.count().filter(AnalystQueue.sla_deadline > now).label("approaching_sla"),
+                func.count().filter(AnalystQueue.sla_deadline <= now).label("breached_sla"),
+            )
+            .where(AnalystQueue.tenant_id == tenant_id)
+            .where(AnalystQueue.status.in_(sa.bindparam("open_statuses", OPEN_STATUSES, literal_execute=True)))
+            .where(AnalystQueue.sla_deadline <= approaching_cutoff)
+        )
+    ).mappings().one()
+
+    return {
+        "total_pending": by_status["pending"],
+        "total_assigned": by_status["assigned"],
+        "total_in_progress": by_status["in_progress"],
+        "approaching_sla": int(sla["approaching_sla"]),
+        "breached_sla": int(sla["breached_sla"]),
+        "by_priority": by_priority,
+    }
+
+
+def _active_cases(analyst_id: UUID):
+    # Served by idx_queue_analyst_active (migration 013).
+    return (
+        select(func.count())
+        .select_from(AnalystQueue)
+        .where(AnalystQueue.analyst_id == analyst_id)
+        .where(AnalystQueue.status.in_(ACTIVE_STATUSES))
+        .scalar_subquery()
+    )
+
+
+async def claim_next_case(
+    session: AsyncSession,
+    *,
+    tenant_id: UUID,
+    analyst_id: UUID,
+    max_active: int = MAX_ACTIVE_CASES,
+) -> dict | None:
+    """Atomically assign the highest-priority pending entry of the tenant to an analyst.
+
+    Returns None if the analyst is not an active user of the tenant, else
+    ``{"item": AnalystQueue | None, "active_cases": int, "limit_reached": bool}``
+    (item is None when the analyst is at ``max_active`` or nothing is pending).
+
+    - The analyst's users row is locked first, so claims by the same analyst
+      are serialized and the workload check cannot be raced past the limit.
+    - The claim itself is one UPDATE whose target is picked by a
+      ``FOR UPDATE SKIP LOCKED`` LIMIT 1 subquery in idx_queue_tenant_priority order:
+      concurrent analysts each take a different row instead of queueing on,
+      or double-assigning, the same one.
+    """
+
+    analyst = await session.execute(
+        select(User.id)
+        .where(User.id == analyst_id)
+        .where(User.tenant_id == tenant_id)
+        .where(User.is_active.is_(True))
+        .with_for_update(key_share=True)
+    )
+    if analyst.scalar_one_or_none() is None:
+        await session.rollback()
+        return None
+
+    # Literal status so the partial idx_queue_tenant_priority predicate is provable
+    # even under a generic (bind-parameter) plan.
+    pending = sa.literal_column("'pending'")
+    candidate = (
+        select(AnalystQueue.id)
+        .where(AnalystQueue.tenant_id == tenant_id)
+        .where(AnalystQueue.status == pending)
+        .where(_active_cases(analyst_id) < max_active)
+        .order_by(AnalystQueue.priority.asc(), AnalystQueue.created_at.asc())
+        .limit(1)
+        .with_for_update(of=AnalystQueue, skip_locked=True)
+        .scalar_subquery()
+    )
+    claimed = (
+        await session.execute(
+            update(AnalystQueue)
+            .where(AnalystQueue.id == candidate)
+            .where(AnalystQueue.status == pending)
+            .values(analyst_id=analyst_id, status="assigned", assigned_at=func.now())
+            .returning(AnalystQueue, _active_cases(analyst_id))
+            .execution_options(synchronize_session=False)
+        )
+    ).one_or_none()
+
+    if claimed is None:
+        active = (await session.execute(select(_active_cases(analyst_id)))).scalar_one()
+        await session.rollback()
+        return {"item": None, "active_cases": int(active), "limit_reached": active >= max_active}
+
+    entry, active_before = claimed
+    # Strict: the assignment and its audit row commit (or roll back) together.
+    stage_audit(
+        session,
+        [
+            AuditEvent(
+                tenant_id=tenant_id,
+                user_id=analyst_id,
+                entity_type="analyst_queue",
+                entity_id=entry.id,
+                action="assign",
+                old_value={"status": "pending"},
+                new_value={"status": "assigned", "analyst_id": str(analyst_id), "application_id": str(entry.application_id)},
+                change_summary="queue entry claimed",
             )
-        ).label("approaching_sla"),
-        func.sum(sa.case((base.c.sla_deadline <= now, 1), else_=0)).label("breached_sla"),
-        # priority buckets (lower number == higher priority)
-        func.sum(sa.case((base.c.priority <= 20, 1), else_=0)).label("priority_high"),
-        func.sum(sa.case((sa.and_(base.c.priority > 20, base.c.priority <= 50), 1), else_=0)).label("priority_medium"),
-        func.sum(sa.case((base.c.priority > 50, 1), else_=0)).label("priority_low"),
+        ],
+        strict=True,
     )
+    await session.commit()
+    # RETURNING reads the pre-update snapshot, which excludes this claim.
+    return {"item": entry, "active_cases": int(active_before) + 1, "limit_reached": False}
 
-    totals = (await session.execute(totals_q)).mappings().one()
 
+def _event_payload(e: QueueEvent, cursor: int) -> dict:
+    # Same shape as the NOTIFY payload built by emit_queue_event() (migration 021).
     return {
-        "total_pending": int(totals["total_pending"] or 0),
-        "total_assigned": int(totals["total_assigned"] or 0),
-        "total_in_progress": int(totals["total_in_progress"] or 0),
-        "approaching_sla": int(totals["approaching_sla"] or 0),
-        "breached_sla": int(totals["breached_sla"] or 0),
-        "by_priority": {
-            "high": int(totals["priority_high"] or 0),
-            "medium": int(totals["priority_medium"] or 0),
-            "low": int(totals["priority_low"] or 0),
-        },
+        "id": e.id,
+        "cursor": cursor,
+        "tenant_id": str(e.tenant_id),
+        "queue_id": str(e.queue_id),
+        "application_id": str(e.application_id),
+        "event": e.event,
+        "status": e.status,
+        "priority": e.priority,
+        "analyst_id": str(e.analyst_id) if e.analyst_id else None,
+        "sla_deadline": e.sla_deadline.isoformat() if e.sla_deadline else None,
     }
+
+
+# xid8 columns (migration 021), read and compared as text <-> bigint.
+_EVENT_CURSOR = sa.literal_column("queue_events.snapshot_xmin::text::bigint")
+
+
+async def queue_events_since(
+    session: AsyncSession,
+    *,
+    tenant_id: UUID,
+    cursor: int,
+    limit: int = 1000,
+) -> list[dict]:
+    """Queue events of the tenant written by transactions with xid >= cursor,
+    in id order (resume on reconnect).
+
+    Every transaction that had not committed when the cursor was taken has
+    xid >= cursor, so nothing delivered after it is missed; events the client
+    already has may come again (same id).
+    """
+
+    q = (
+        select(QueueEvent, _EVENT_CURSOR)
+        .where(QueueEvent.tenant_id == tenant_id)
+        .where(sa.text("queue_events.xid >= CAST(CAST(:cursor AS text) AS xid8)").bindparams(cursor=cursor))
+        .order_by(QueueEvent.id.asc())
+        .limit(limit)
+    )
+    return [_event_payload(e, c) for e, c in (await session.execute(q)).all()]
+
+
+async def current_queue_event_cursor(session: AsyncSession) -> int:
+    """Resume cursor for "everything from now on": the xmin of the current
+    snapshot (no transaction still open has a lower xid)."""
+
+    q = select(sa.literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+    return int((await session.execute(q)).scalar_one())
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import re
+
+import sqlalchemy as sa
+from sqlalchemy import func
+
+from src.models.application import Application
+
+# Single token with a digit (e.g. "APP-3f9a1c", "12345") -> external_id lookup.
+_EXTERNAL_ID_RE = re.compile(r"[\w-]*\d[\w-]*")
+_TERM_RE = re.compile(r"\w+")
+
+
+def looks_like_external_id(search: str) -> bool:
+    return _EXTERNAL_ID_RE.fullmatch(search) is not None
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_tsquery(search: str) -> str | None:
+    """Turn free text into a prefix-matching tsquery string ("mar:* & pet:*").
+
+    Only word characters survive, so user input cannot inject tsquery operators.
+    Folding (lowercase, diacritics) is done in SQL by hitl_search_fold so the
+    query and the stored vector share exactly one normalization.
+    """
+
+    terms = _TERM_RE.findall(search)
+    if not terms:
+        return None
+    return " & ".join(f"{t}:*" for t in terms)
+
+
+def search_filter(search: str) -> tuple[sa.ColumnElement[bool] | None, sa.ColumnElement[float]]:
+    """Return (WHERE clause, relevance expression) for the applications search.
+
+    - external_id-looking input: case-insensitive prefix match served by
+      idx_applications_tenant_external_id_prefix. Unlike the old ILIKE
+      search, it does not match in the middle of an id: "1001" does not
+      find "PARTNER-1001", "PARTNER-1" does.
+    - anything else: full-text match on applications.search_vector (GIN),
+      diacritic-insensitive ("Dorđević" == "Dordjevic").
+    - nothing searchable (only whitespace / punctuation): no filter (None).
+    """
+
+    search = search.strip()
+    q = build_tsquery(search)
+    if q is None:
+        return None, sa.literal(0.0)
+
+    tsquery = func.to_tsquery("simple", func.hitl_search_fold(q))
+    rank = func.ts_rank(Application.search_vector, tsquery)
+
+    if looks_like_external_id(search):
+        prefix = _escape_like(search.lower()) + "%"
+        return func.lower(Application.external_id).like(prefix, escape="\\"), rank
+
+    return Application.search_vector.op("@@")(tsquery), rank
@@ -5,6 +5,8 @@ import uuid
 from fastapi import FastAPI, Request
 
 from src.api.v1.router import router as v1_router
+from src.audit.writer import set_request_context
+from src.database import start_query_count
 
 logger = logging.getLogger("hitl.api")
 
@@ -18,23 +20,35 @@ def create_app() -> FastAPI:
 
         - If the caller provides X-Request-ID, we reuse it.
         - Otherwise we generate a UUID4.
+        - The number of SQL statements the request issued is returned as
+          X-DB-Query-Count and logged, to catch N+1 regressions.
+        - Request id, client IP and user agent are recorded for audit events
+          created while handling the request (src/audit/writer.py).
 
         This is intentionally lightweight (Phase 1) but helps correlate logs.
         """
 
         request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
+        query_count = start_query_count()
+        set_request_context(
+            request_id,
+            request.client.host if request.client else None,
+            request.headers.get("user-agent"),
+        )
         start = time.perf_counter()
         response = await call_next(request)
         duration_ms = (time.perf_counter() - start) * 1000
 
         response.headers["X-Request-ID"] = request_id
+        response.headers["X-DB-Query-Count"] = str(query_count[0])
         logger.info(
-            "access request_id=%s method=%s path=%s status=%s duration_ms=%.2f",
+            "access request_id=%s method=%s path=%s status=%s duration_ms=%.2f queries=%d",
             request_id,
             request.method,
             request.url.path,
             response.status_code,
             duration_ms,
+            query_count[0],
         )
         return response
 
@@ -0,0 +1 @@
+"""In-process ML: scoring model and routing (see hitl/todo.md Phase 3)."""
@@ -0,0 +1,201 @@
+"""SHAP explanation cache (TODO-3.2.3: "consider caching common patterns").
+
+Explanations are cached per model version and *quantized* feature vector:
+applicants whose features agree to within SHAP_CACHE_QUANTUM (default 0.01)
+share one cached SHAP row. Two tiers:
+
+  - an in-process LRU (SHAP_CACHE_MAX_ENTRIES, default 10,000 rows);
+  - optionally Redis (SHAP_CACHE_REDIS=1), shared across processes, one key
+    per row with a TTL (SHAP_CACHE_TTL_SECONDS, default 1 day); memory beyond
+    that is bounded by the server's maxmemory/eviction policy.
+
+:func:`explain_batch` looks every row up (LRU, then one Redis MGET), calls the
+model's batch explainer (e.g. shap.TreeExplainer) once on the distinct misses
+only, and writes them back. Hit/miss counters are exposed by
+:meth:`ExplanationCache.stats`.
+
+The SHAP row is cached, not top_factors: factors also carry the applicant's
+own (unquantized) feature values and are rebuilt per row.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger("hitl.ml")
+
+
+def quantize_keys(X: np.ndarray, *, model_id: str, version: str, quantum: float) -> list[str]:
+    """One cache key per row: model + version + digest of round(X / quantum)."""
+
+    buckets = np.round(np.nan_to_num(X, nan=0.0) / quantum).astype(np.int64)
+    prefix = f"hitl:shap:{model_id}:{version}:"
+    return [prefix + hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in buckets]
+
+
+class ExplanationCache:
+    """Two-tier (LRU + optional Redis) store of SHAP rows keyed by quantize_keys()."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        redis_client: Any | None = None,
+        ttl_seconds: int = 86_400,
+        quantum: float = 0.01,
+    ) -> None:
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.quantum = quantum
+
+        self._lru: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"lru_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0}
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                row = self._lru.get(key)
+                if row is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = row
+            self._counters["lru_hits"] += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if missing and self.redis is not None:
+            try:
+                values = self.redis.mget(missing)
+            except Exception:
+                logger.exception("SHAP cache: redis MGET failed")
+                values = [None] * len(missing)
+                with self._lock:
+                    self._counters["redis_errors"] += 1
+            from_redis = {
+                key: np.frombuffer(value, dtype=np.float32).astype(np.float64)
+                for key, value in zip(missing, values)
+                if value is not None
+            }
+            if from_redis:
+                self._put_lru(from_redis)
+                found.update(from_redis)
+            with self._lock:
+                self._counters["redis_hits"] += len(from_redis)
+
+        with self._lock:
+            self._counters["misses"] += len(keys) - len(found)
+        return found
+
+    def set_many(self, rows: dict[str, np.ndarray]) -> None:
+        if not rows:
+            return
+        self._put_lru(rows)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for key, row in rows.items():
+                    pipe.set(key, np.asarray(row, dtype=np.float32).tobytes(), ex=self.ttl_seconds)
+                pipe.execute()
+            except Exception:
+                logger.exception("SHAP cache: redis write failed")
+                with self._lock:
+                    self._counters["redis_errors"] += 1
+
+    def _put_lru(self, rows: dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, row in rows.items():
+                self._lru[key] = row
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._lru)
+        lookups = counters["lru_hits"] + counters["redis_hits"] + counters["misses"]
+        hits = counters["lru_hits"] + counters["redis_hits"]
+        return {**counters, "lookups": lookups, "hit_rate": hits / lookups if lookups else 0.0, "lru_size": size}
+
+
+def explain_batch(model: Any, X: np.ndarray, *, cache: ExplanationCache | None = None) -> np.ndarray | None:
+    """SHAP matrix (n, n_features) for X, or None if the model cannot explain.
+
+    ``model.shap_values(X)`` is called once, on the distinct cache misses only.
+    Models with ``explanation_cacheable = False`` (exact closed-form
+    explanations cheaper than a lookup) bypass the cache.
+    """
+
+    if X.shape[0] == 0 or not hasattr(model, "shap_values"):
+        return None
+    if cache is None or not getattr(model, "explanation_cacheable", True):
+        return model.shap_values(X)
+
+    keys = quantize_keys(X, model_id=model.model_id, version=model.version, quantum=cache.quantum)
+    found = cache.get_many(list(dict.fromkeys(keys)))
+
+    miss_rows: dict[str, int] = {}
+    for i, key in enumerate(keys):
+        if key not in found and key not in miss_rows:
+            miss_rows[key] = i
+
+    if miss_rows:
+        computed = model.shap_values(X[list(miss_rows.values())])
+        if computed is None:
+            return None
+        # Same precision as the Redis tier, so every tier returns identical values.
+        fresh = {
+            key: np.asarray(computed[j], dtype=np.float32).astype(np.float64) for j, key in enumerate(miss_rows)
+        }
+        cache.set_many(fresh)
+        found.update(fresh)
+
+    return np.vstack([found[key] for key in keys])
+
+
+_cache: ExplanationCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_explanation_cache() -> ExplanationCache:
+    """Process-wide cache configured from SHAP_CACHE_* env vars."""
+
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            redis_client = None
+            if os.getenv("SHAP_CACHE_REDIS") == "1":
+                try:
+                    import redis  # type: ignore
+
+                    from src.config import settings
+
+                    redis_client = redis.Redis.from_url(os.getenv("SHAP_CACHE_REDIS_URL") or settings.redis_url)
+                except ImportError:
+                    logger.warning("SHAP_CACHE_REDIS=1 but the redis package is not installed; LRU only")
+            _cache = ExplanationCache(
+                max_entries=int(os.getenv("SHAP_CACHE_MAX_ENTRIES", "10000")),
+                redis_client=redis_client,
+                ttl_seconds=int(os.getenv("SHAP_CACHE_TTL_SECONDS", "86400")),
+                quantum=float(os.getenv("SHAP_CACHE_QUANTUM", "0.01")),
+            )
+        return _cache
+
+
+def _after_fork_in_child() -> None:
+    # Redis connections must not be shared across processes.
+    global _cache, _cache_lock
+    _cache = None
+    _cache_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
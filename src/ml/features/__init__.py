@@ -0,0 +1,9 @@
+from .extractor import (  # noqa: F401
+    CONTRACT_TYPE_MULTIPLIER,
+    DEFAULT_MEDIANS,
+    FEATURE_NAMES,
+    FeatureExtractor,
+    FeatureStats,
+    get_feature_extractor,
+    safe_divide,
+)
@@ -0,0 +1,250 @@
+"""Columnar feature extraction (TODO-3.1.1).
+
+Features (hitl/prd.md §7.1); a ratio is NaN/None when its denominator is
+missing or <= 0. In the three income ratios a missing numerator counts as 0,
+as in the original intake computation (metadata.derived and the model inputs
+of existing applications depend on it); the other ratios are NaN then:
+
+  dti_ratio            = (monthly_obligations + existing_loans_payment) / net_monthly_income
+  loan_to_income       = loan_amount / (net_monthly_income * 12)
+  payment_to_income    = estimated_payment / net_monthly_income
+  employment_stability = years_employed * CONTRACT_TYPE_MULTIPLIER[contract_type]
+  savings_ratio        = savings / loan_amount
+  existing_debt_ratio  = existing_loans / loan_amount
+  credit_utilization   = credit_bureau_data.total_balance / credit_bureau_data.total_credit_limit
+                         (or credit_bureau_data.credit_utilization when the bureau reports it)
+
+Inputs are read from the flat keys used by the intake API; employment fields
+also fall back to the nested ``applicant_data.employment`` layout from the PRD.
+
+The batch API gathers each input into one NumPy column and computes every
+feature as an array expression; the per-row API runs the same code on a
+batch of one, so the two can never disagree.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+FEATURE_NAMES: tuple[str, ...] = (
+    "dti_ratio",
+    "loan_to_income",
+    "payment_to_income",
+    "employment_stability",
+    "savings_ratio",
+    "existing_debt_ratio",
+    "credit_utilization",
+)
+
+# Unknown / missing contract types fall into the 'unknown' category.
+CONTRACT_TYPE_MULTIPLIER: dict[str, float] = {
+    "permanent": 1.0,
+    "fixed_term": 0.7,
+    "self_employed": 0.6,
+    "temporary": 0.5,
+    "unknown": 0.5,
+}
+
+# Fallback medians used until statistics from training data are stored.
+DEFAULT_MEDIANS: dict[str, float] = {
+    "dti_ratio": 0.35,
+    "loan_to_income": 1.0,
+    "payment_to_income": 0.3,
+    "employment_stability": 2.0,
+    "savings_ratio": 0.2,
+    "existing_debt_ratio": 0.1,
+    "credit_utilization": 0.3,
+}
+
+
+@dataclass(frozen=True)
+class FeatureStats:
+    """Per-feature medians for imputation (stored e.g. in model_registry.metadata)."""
+
+    medians: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MEDIANS))
+
+    @classmethod
+    def from_matrix(cls, X: np.ndarray) -> "FeatureStats":
+        medians = dict(DEFAULT_MEDIANS)
+        for j, name in enumerate(FEATURE_NAMES):
+            column = X[:, j]
+            column = column[~np.isnan(column)]
+            if column.size:
+                medians[name] = float(np.median(column))
+        return cls(medians=medians)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any] | None) -> "FeatureStats":
+        medians = dict(DEFAULT_MEDIANS)
+        for name, value in (data or {}).items():
+            if name in medians and value is not None:
+                medians[name] = float(value)
+        return cls(medians=medians)
+
+    def to_dict(self) -> dict[str, float]:
+        return dict(self.medians)
+
+    def vector(self) -> np.ndarray:
+        return np.array([self.medians[name] for name in FEATURE_NAMES], dtype=np.float64)
+
+
+def _number(value: Any) -> float:
+    if value is None or value == "":
+        return np.nan
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return number if np.isfinite(number) else np.nan
+
+
+_EMPTY: Mapping[str, Any] = {}
+_NAN = float("nan")
+_N_INPUTS = 11
+
+
+def _mapping(value: Any) -> Mapping[str, Any]:
+    return value if isinstance(value, Mapping) else _EMPTY
+
+
+def _gather(payloads: Iterable[Mapping[str, Any]]) -> tuple[np.ndarray, list[str]]:
+    """One pass over the payloads -> (n, 11) float matrix of inputs + contract types.
+
+    Fast path: a single float64 conversion of all rows. Payloads with explicit
+    nulls or non-numeric values fall back to converting value by value.
+    """
+
+    rows: list[tuple] = []
+    contract_types: list[str] = []
+    for payload in payloads:
+        fin = _mapping(payload.get("financial_data"))
+        loan = _mapping(payload.get("loan_request"))
+        applicant = _mapping(payload.get("applicant_data"))
+        bureau = _mapping(payload.get("credit_bureau_data"))
+        employment = _mapping(applicant.get("employment"))
+
+        years = applicant.get("years_employed")
+        if years is None:
+            years = employment.get("years_employed", _NAN)
+
+        rows.append(
+            (
+                fin.get("net_monthly_income", _NAN),
+                fin.get("monthly_obligations", _NAN),
+                fin.get("existing_loans_payment", _NAN),
+                fin.get("savings", _NAN),
+                fin.get("existing_loans", _NAN),
+                loan.get("loan_amount", _NAN),
+                loan.get("estimated_payment", _NAN),
+                years,
+                bureau.get("credit_utilization", _NAN),
+                bureau.get("total_balance", _NAN),
+                bureau.get("total_credit_limit", _NAN),
+            )
+        )
+        contract_types.append(str(applicant.get("contract_type") or employment.get("contract_type") or "unknown"))
+
+    try:
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), _N_INPUTS)
+    except (TypeError, ValueError):
+        values = np.array([[_number(v) for v in row] for row in rows], dtype=np.float64).reshape(
+            len(rows), _N_INPUTS
+        )
+    values[~np.isfinite(values)] = np.nan
+    return values, contract_types
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise numerator / denominator; NaN where the denominator is missing or <= 0."""
+
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+class FeatureExtractor:
+    """Turn application payloads into a (n_rows, len(FEATURE_NAMES)) float matrix.
+
+    A payload is application-shaped: ``financial_data``, ``loan_request``,
+    ``applicant_data`` and ``credit_bureau_data`` dicts (any may be missing).
+    """
+
+    feature_names = FEATURE_NAMES
+
+    def __init__(self, stats: FeatureStats | None = None) -> None:
+        self.stats = stats or FeatureStats()
+
+    def raw_matrix(self, payloads: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        """Features before imputation (NaN where undefined)."""
+
+        values, contract_types = _gather(payloads)
+        (
+            income,
+            obligations,
+            loans_payment,
+            savings,
+            existing_loans,
+            amount,
+            payment,
+            years,
+            reported_utilization,
+            balance,
+            credit_limit,
+        ) = values.T
+        contract_multiplier = np.array(
+            [CONTRACT_TYPE_MULTIPLIER.get(c, CONTRACT_TYPE_MULTIPLIER["unknown"]) for c in contract_types],
+            dtype=np.float64,
+        )
+
+        X = np.empty((values.shape[0], len(FEATURE_NAMES)), dtype=np.float64)
+        X[:, 0] = safe_divide(np.nan_to_num(obligations) + np.nan_to_num(loans_payment), income)
+        X[:, 1] = safe_divide(np.nan_to_num(amount), income * 12.0)
+        X[:, 2] = safe_divide(np.nan_to_num(payment), income)
+        X[:, 3] = years * contract_multiplier
+        X[:, 4] = safe_divide(savings, amount)
+        X[:, 5] = safe_divide(existing_loans, amount)
+        X[:, 6] = np.where(np.isnan(reported_utilization), safe_divide(balance, credit_limit), reported_utilization)
+        return X
+
+    def impute(self, X: np.ndarray) -> np.ndarray:
+        """Replace NaN with the stored medians (returns a new matrix)."""
+
+        return np.where(np.isnan(X), self.stats.vector(), X)
+
+    def transform(self, payloads: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        """Model-ready matrix: raw features with median imputation."""
+
+        return self.impute(self.raw_matrix(payloads))
+
+    @staticmethod
+    def to_dicts(X: np.ndarray) -> list[dict[str, float | None]]:
+        """Rows as {feature: value} with NaN -> None (JSON-safe)."""
+
+        missing = np.isnan(X).tolist()
+        return [
+            {name: (None if m else v) for name, v, m in zip(FEATURE_NAMES, row, row_missing)}
+            for row, row_missing in zip(X.tolist(), missing)
+        ]
+
+    def extract_one(self, payload: Mapping[str, Any], *, impute: bool = False) -> dict[str, float | None]:
+        """Per-row API: same code path as the batch API, on a batch of one."""
+
+        X = self.raw_matrix([payload])
+        if impute:
+            X = self.impute(X)
+        return self.to_dicts(X)[0]
+
+
+_extractor: FeatureExtractor | None = None
+
+
+def get_feature_extractor() -> FeatureExtractor:
+    """Process-wide extractor with the default statistics."""
+
+    global _extractor
+    if _extractor is None:
+        _extractor = FeatureExtractor()
+    return _extractor
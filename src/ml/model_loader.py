@@ -0,0 +1,291 @@
+"""Active-model loader with memory-mapped, read-only artifacts.
+
+Resolves the active production entry in model_registry and loads its
+``artifact_uri``. Array parameters are opened with ``np.load(mmap_mode="r")``
+(``joblib.load(mmap_mode="r")`` for .joblib artifacts), so the weights live in
+the OS page cache: every worker process on a node maps the same physical pages
+instead of holding a private copy, and a cold start does not deserialize them.
+
+Call :meth:`ModelLoader.warm` in the parent before forking (the Celery worker
+does this on ``worker_init``); children inherit the mappings. Each process
+re-checks the registry at most every MODEL_REFRESH_SECONDS (default 30) and
+hot-swaps to the new version when the active entry changes; in-flight batches
+keep using the model object they started with.
+
+Artifact layout (directory, or ``file://`` URI to one):
+
+  model.json       {"format": "hitl-linear-v1", "intercept": -3.0,
+                    "feature_names": [...], "arrays": {"coef": "coef.npy",
+                    "reference": "reference.npy"}}
+  coef.npy, reference.npy
+
+``model_registry.metadata.feature_stats`` (medians) feeds feature imputation.
+With no active entry, or if the artifact cannot be loaded, the built-in
+baseline scorecard is used.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import numpy as np
+import psycopg
+
+from src.ml.features import FEATURE_NAMES, FeatureStats
+from src.ml.explain import explain_batch, get_explanation_cache
+from src.ml.scoring import LinearScorecard, ScoreOutput, baseline_scorecard, build_outputs
+
+logger = logging.getLogger("hitl.ml")
+
+LINEAR_FORMAT = "hitl-linear-v1"
+
+_ACTIVE_SQL = """
+SELECT id, model_id, version, artifact_uri, metadata
+FROM model_registry
+WHERE is_active = true AND stage = 'production'
+ORDER BY created_at DESC
+LIMIT 1
+"""
+
+
+class ArtifactError(RuntimeError):
+    pass
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _artifact_path(uri: str) -> Path:
+    parsed = urlparse(uri)
+    if parsed.scheme in ("", "file"):
+        return Path(parsed.path if parsed.scheme else uri)
+    raise ArtifactError(f"unsupported artifact_uri scheme: {parsed.scheme!r}")
+
+
+def save_linear_artifact(
+    directory: str | os.PathLike,
+    *,
+    coef: np.ndarray,
+    intercept: float,
+    reference: np.ndarray,
+) -> Path:
+    """Write a linear-model artifact directory (for training scripts and tests)."""
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "coef.npy", np.asarray(coef, dtype=np.float64))
+    np.save(directory / "reference.npy", np.asarray(reference, dtype=np.float64))
+    manifest = {
+        "format": LINEAR_FORMAT,
+        "intercept": float(intercept),
+        "feature_names": list(FEATURE_NAMES),
+        "arrays": {"coef": "coef.npy", "reference": "reference.npy"},
+    }
+    (directory / "model.json").write_text(json.dumps(manifest, indent=2))
+    return directory
+
+
+class EstimatorScorer:
+    """Adapter for a scikit-learn style estimator loaded from a .joblib artifact.
+
+    SHAP values come from ``shap.TreeExplainer`` (optional dependency) through
+    the explanation cache (src.ml.explain), so only cache misses are explained.
+    """
+
+    def __init__(self, *, model_id: str, version: str, estimator: Any, feature_stats: FeatureStats) -> None:
+        self.model_id = model_id
+        self.version = version
+        self.estimator = estimator
+        self.feature_stats = feature_stats
+        self._explainer: Any | None = None
+
+    def predict_pd(self, X: np.ndarray) -> np.ndarray:
+        return self.estimator.predict_proba(X)[:, 1]
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray | None:
+        if self._explainer is None:
+            try:
+                import shap  # type: ignore
+            except ImportError:
+                return None
+            self._explainer = shap.TreeExplainer(self.estimator)
+        values = self._explainer.shap_values(X)
+        # Binary classifiers may return one array per class; explain "default".
+        if isinstance(values, list):
+            values = values[-1]
+        values = np.asarray(values)
+        return values[..., -1] if values.ndim == 3 else values
+
+    def score_batch(self, X: np.ndarray, *, top_n: int = 3) -> list[ScoreOutput]:
+        shap = explain_batch(self, X, cache=get_explanation_cache())
+        return build_outputs(X, self.predict_pd(X), shap, top_n=top_n)
+
+
+def load_artifact(uri: str, *, model_id: str, version: str, meta: dict | None = None):
+    """Load a model artifact with memory-mapped, read-only parameters."""
+
+    path = _artifact_path(uri)
+    stats = FeatureStats.from_dict((meta or {}).get("feature_stats"))
+
+    if path.suffix == ".joblib":
+        try:
+            import joblib  # type: ignore
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise ArtifactError("joblib is required to load .joblib artifacts") from e
+        estimator = joblib.load(path, mmap_mode="r")
+        return EstimatorScorer(model_id=model_id, version=version, estimator=estimator, feature_stats=stats)
+
+    manifest_path = path / "model.json"
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"cannot read {manifest_path}: {e}") from e
+
+    if manifest.get("format") != LINEAR_FORMAT:
+        raise ArtifactError(f"unsupported artifact format: {manifest.get('format')!r}")
+    if tuple(manifest.get("feature_names") or ()) != FEATURE_NAMES:
+        raise ArtifactError("artifact feature_names do not match src.ml.features.FEATURE_NAMES")
+
+    arrays = {
+        name: np.load(path / filename, mmap_mode="r", allow_pickle=False)
+        for name, filename in manifest["arrays"].items()
+    }
+    for name, array in arrays.items():
+        if array.shape != (len(FEATURE_NAMES),):
+            raise ArtifactError(f"{name} has shape {array.shape}, expected ({len(FEATURE_NAMES)},)")
+
+    return LinearScorecard(
+        model_id=model_id,
+        version=version,
+        coef=arrays["coef"],
+        intercept=manifest["intercept"],
+        reference=arrays["reference"],
+        feature_stats=stats,
+    )
+
+
+class ModelLoader:
+    """Holds the current model for this process and swaps it when the registry changes."""
+
+    def __init__(self, database_url: str | None = None, *, refresh_seconds: float | None = None) -> None:
+        self._database_url = database_url
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None else float(os.getenv("MODEL_REFRESH_SECONDS", "30"))
+        )
+        self._lock = threading.Lock()
+        self._model = baseline_scorecard()
+        self._registry_id: uuid.UUID | None = None
+        self._checked_at: float | None = None
+
+    @property
+    def registry_id(self) -> uuid.UUID | None:
+        return self._registry_id
+
+    def _dsn(self) -> str:
+        if self._database_url is None:
+            from src.config import settings
+
+            self._database_url = settings.database_url
+        return _sync_dsn(self._database_url)
+
+    def current(self):
+        """The current model; re-checks the registry when the last check is stale."""
+
+        checked_at = self._checked_at
+        if checked_at is None or time.monotonic() - checked_at >= self.refresh_seconds:
+            self.refresh()
+        return self._model
+
+    def warm(self) -> None:
+        """Resolve and map the active model now (call before forking workers)."""
+
+        self.refresh(force=True)
+
+    def refresh(self, *, force: bool = False) -> bool:
+        """Re-resolve the active entry; returns True if the model was swapped."""
+
+        if not self._lock.acquire(blocking=force):
+            # Another thread is already refreshing; keep serving the current model.
+            return False
+        try:
+            if not force and self._checked_at is not None and time.monotonic() - self._checked_at < self.refresh_seconds:
+                return False
+            self._checked_at = time.monotonic()
+
+            try:
+                with psycopg.connect(self._dsn()) as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(_ACTIVE_SQL)
+                        row = cur.fetchone()
+            except psycopg.Error:
+                logger.exception("model registry lookup failed; keeping %s", self._model.version)
+                return False
+
+            registry_id = row[0] if row else None
+            if registry_id == self._registry_id:
+                return False
+
+            if row is None:
+                model = baseline_scorecard()
+            else:
+                _, model_id, version, artifact_uri, meta = row
+                if not artifact_uri:
+                    logger.error("active model %s %s has no artifact_uri; keeping current model", model_id, version)
+                    return False
+                try:
+                    model = load_artifact(artifact_uri, model_id=model_id, version=version, meta=meta)
+                except (ArtifactError, OSError, ValueError):
+                    logger.exception("failed to load model %s %s from %s", model_id, version, artifact_uri)
+                    return False
+
+            logger.info(
+                "model swap %s/%s -> %s/%s", self._model.model_id, self._model.version, model.model_id, model.version
+            )
+            self._model = model
+            self._registry_id = registry_id
+            return True
+        finally:
+            self._lock.release()
+
+
+_loader: ModelLoader | None = None
+_loader_lock = threading.Lock()
+
+
+def get_model_loader() -> ModelLoader:
+    """Process-wide loader (inherited, already warm, by forked children)."""
+
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = ModelLoader()
+        return _loader
+
+
+def reset_model_loader() -> None:
+    """Forget the process-wide loader (tests)."""
+
+    global _loader
+    with _loader_lock:
+        _loader = None
+
+
+def _after_fork_in_child() -> None:
+    # Locks may have been held at fork time; the mapped model itself is reused.
+    global _loader_lock
+    _loader_lock = threading.Lock()
+    if _loader is not None:
+        _loader._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
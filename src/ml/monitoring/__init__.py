@@ -0,0 +1 @@
+from .drift import feature_drift, population_stability_index  # noqa: F401
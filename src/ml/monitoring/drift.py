@@ -0,0 +1,63 @@
+"""Feature drift checks (TODO-3.3.3).
+
+Both populations go through the same :class:`FeatureExtractor` used for intake
+and scoring, so drift is measured on exactly the features the model sees.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from src.ml.features import FEATURE_NAMES, FeatureExtractor, get_feature_extractor
+
+# Conventional PSI alerting level (hitl/todo.md: alert if PSI > 0.2).
+PSI_ALERT_THRESHOLD = 0.2
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray, *, bins: int = 10) -> float:
+    """PSI of ``actual`` against ``expected`` over quantile bins of ``expected``.
+
+    NaNs are ignored; returns NaN if either side has no values.
+    """
+
+    expected = expected[~np.isnan(expected)]
+    actual = actual[~np.isnan(actual)]
+    if expected.size == 0 or actual.size == 0:
+        return float("nan")
+
+    edges = np.unique(np.quantile(expected, np.linspace(0, 1, bins + 1)))
+    if edges.size < 2:
+        # Constant reference: everything either matches it or does not.
+        same = np.isclose(actual, edges[0]).mean()
+        expected_pct = np.array([1.0, 0.0])
+        actual_pct = np.array([same, 1.0 - same])
+    else:
+        edges[0], edges[-1] = -np.inf, np.inf
+        expected_pct = np.histogram(expected, edges)[0] / expected.size
+        actual_pct = np.histogram(actual, edges)[0] / actual.size
+
+    eps = 1e-6
+    expected_pct = np.clip(expected_pct, eps, None)
+    actual_pct = np.clip(actual_pct, eps, None)
+    return float(np.sum((actual_pct - expected_pct) * np.log(actual_pct / expected_pct)))
+
+
+def feature_drift(
+    reference: Sequence[Mapping[str, Any]] | np.ndarray,
+    current: Sequence[Mapping[str, Any]] | np.ndarray,
+    *,
+    extractor: FeatureExtractor | None = None,
+    bins: int = 10,
+) -> dict[str, float]:
+    """PSI per feature; inputs are application payloads or raw feature matrices."""
+
+    extractor = extractor or get_feature_extractor()
+    ref = reference if isinstance(reference, np.ndarray) else extractor.raw_matrix(reference)
+    cur = current if isinstance(current, np.ndarray) else extractor.raw_matrix(current)
+
+    return {
+        name: population_stability_index(ref[:, j], cur[:, j], bins=bins)
+        for j, name in enumerate(FEATURE_NAMES)
+    }
@@ -0,0 +1,73 @@
+"""Queue priority (hitl/prd.md §7.5), vectorized.
+
+Mirrors the ``calculate_queue_priority`` SQL function (migration 005) rule for
+rule, over arrays: 1 is the most urgent, 100 the least.
+
+  - VIP: 10, nothing else applies;
+  - baseline 50; loan amount > 5M: -15, > 2M: -10, > 1M: -5;
+  - SLA hours remaining < 2: -20, < 4: -10, < 8: -5;
+  - clamped to [1, 100].
+
+NULLs follow plpgsql: a NULL amount / SLA / VIP flag fails its comparisons and
+adjusts nothing (pass NaN for NULL floats). ``score`` is accepted for parity
+with the SQL signature but, as there, does not affect the result.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+BASELINE = 50
+VIP_PRIORITY = 10
+
+# (exclusive lower bound, adjustment), checked largest first.
+AMOUNT_STEPS = ((5_000_000, -15), (2_000_000, -10), (1_000_000, -5))
+# (exclusive upper bound in hours, adjustment), checked smallest first.
+SLA_STEPS = ((2, -20), (4, -10), (8, -5))
+
+
+def queue_priorities(
+    score: np.ndarray | None,
+    loan_amount: np.ndarray,
+    is_vip: np.ndarray | None,
+    sla_hours_remaining: np.ndarray,
+) -> np.ndarray:
+    """int32 priorities for parallel arrays (``is_vip`` None = no VIPs)."""
+
+    amount = np.asarray(loan_amount, dtype=np.float64)
+    sla = np.asarray(sla_hours_remaining, dtype=np.float64)
+
+    # np.select takes the first matching condition, like IF / ELSIF; NaN
+    # compares False everywhere and falls through to 0.
+    priority = (
+        BASELINE
+        + np.select([amount > bound for bound, _ in AMOUNT_STEPS], [adj for _, adj in AMOUNT_STEPS], 0)
+        + np.select([sla < bound for bound, _ in SLA_STEPS], [adj for _, adj in SLA_STEPS], 0)
+    )
+    priority = np.clip(priority, 1, 100).astype(np.int32)
+
+    if is_vip is not None:
+        vip = np.asarray(is_vip)
+        if vip.dtype == object:
+            vip = np.array([bool(v) for v in vip], dtype=bool)  # None (NULL) -> not VIP
+        priority = np.where(vip.astype(bool), np.int32(VIP_PRIORITY), priority)
+    return priority
+
+
+def queue_priority(
+    score: int | None,
+    loan_amount: float | None,
+    is_vip: bool | None = False,
+    sla_hours_remaining: float | None = 24,
+) -> int:
+    """Single-entry form of :func:`queue_priorities`."""
+
+    nan = float("nan")
+    return int(
+        queue_priorities(
+            None,
+            np.array([nan if loan_amount is None else float(loan_amount)]),
+            np.array([bool(is_vip)]),
+            np.array([nan if sla_hours_remaining is None else float(sla_hours_remaining)]),
+        )[0]
+    )
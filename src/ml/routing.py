@@ -0,0 +1,241 @@
+"""Threshold-based routing (hitl/prd.md §7.4, TODO-3.3.2).
+
+``threshold`` is a row of get_active_threshold(): auto_approve_min,
+auto_decline_max and ``rules`` (JSONB), where rules may contain:
+  max_loan_amount_auto     -> human_review / high_value_loan
+  max_term_months_auto     -> human_review / long_term
+  require_review_purposes  -> human_review / purpose:<purpose>
+
+:func:`route` is the row-at-a-time reference. :class:`DecisionRouter` is the
+same logic compiled once per threshold (rules validated, cutoffs converted,
+purposes indexed) and evaluated over NumPy arrays; :func:`get_router` caches
+routers per threshold version (id + cutoffs + rules). A stored threshold whose
+rules do not validate sends every application to human review
+(``invalid_threshold_rules``) instead of failing the scoring batch.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable
+
+import numpy as np
+
+logger = logging.getLogger("hitl.ml")
+
+
+def route(
+    score: int,
+    loan_amount: float | None,
+    term_months: int | None,
+    loan_purpose: str | None,
+    threshold: dict[str, Any] | None,
+) -> tuple[str, str]:
+    """Return (routing_decision, routing_reason)."""
+
+    if threshold is None:
+        return "human_review", "no_active_threshold"
+
+    rules = threshold.get("rules") or {}
+
+    max_amount = rules.get("max_loan_amount_auto")
+    if max_amount is not None and loan_amount is not None and loan_amount > float(max_amount):
+        return "human_review", "high_value_loan"
+
+    max_term = rules.get("max_term_months_auto")
+    if max_term is not None and term_months is not None and term_months > int(max_term):
+        return "human_review", "long_term"
+
+    if loan_purpose is not None and loan_purpose in (rules.get("require_review_purposes") or []):
+        return "human_review", f"purpose:{loan_purpose}"
+
+    if score >= threshold["auto_approve_min"]:
+        return "auto_approve", "score_above_threshold"
+    if score <= threshold["auto_decline_max"]:
+        return "auto_decline", "score_below_threshold"
+    return "human_review", "borderline_score"
+
+
+RULE_KEYS = ("max_loan_amount_auto", "max_term_months_auto", "require_review_purposes")
+
+
+class InvalidRules(ValueError):
+    pass
+
+
+def validate_rules(rules: dict[str, Any] | None, *, strict: bool = False) -> dict[str, Any]:
+    """Normalized rules: {max_loan_amount_auto: float | None,
+    max_term_months_auto: int | None, require_review_purposes: tuple[str, ...]}.
+
+    Raises InvalidRules for values route() could not use. ``strict`` also
+    rejects unknown keys, which routing ignores, and negative or boolean
+    limits.
+    """
+
+    rules = rules or {}
+    if not isinstance(rules, dict):
+        raise InvalidRules("rules must be an object")
+    if strict:
+        unknown = sorted(set(rules) - set(RULE_KEYS))
+        if unknown:
+            raise InvalidRules(f"unknown rule(s): {', '.join(unknown)}")
+
+    def number(key: str, cast):
+        value = rules.get(key)
+        if value is None:
+            return None
+        if strict and isinstance(value, bool):
+            raise InvalidRules(f"{key} must be a number")
+        try:
+            value = cast(value)  # the conversion route() applies
+        except (TypeError, ValueError):
+            raise InvalidRules(f"{key} must be a number") from None
+        if strict and value < 0:
+            raise InvalidRules(f"{key} must be >= 0")
+        return value
+
+    purposes = rules.get("require_review_purposes") or []
+    if not isinstance(purposes, list) or not all(isinstance(p, str) for p in purposes):
+        raise InvalidRules("require_review_purposes must be a list of strings")
+
+    return {
+        "max_loan_amount_auto": number("max_loan_amount_auto", float),
+        "max_term_months_auto": number("max_term_months_auto", int),
+        "require_review_purposes": tuple(dict.fromkeys(purposes)),
+    }
+
+
+# Reason codes, in increasing precedence; purpose:<p> reasons follow from _PURPOSE.
+_BORDERLINE, _BELOW, _ABOVE, _NO_THRESHOLD, _LONG_TERM, _HIGH_VALUE, _INVALID_RULES, _PURPOSE = range(8)
+_FIXED_REASONS = (
+    ("human_review", "borderline_score"),
+    ("auto_decline", "score_below_threshold"),
+    ("auto_approve", "score_above_threshold"),
+    ("human_review", "no_active_threshold"),
+    ("human_review", "long_term"),
+    ("human_review", "high_value_loan"),
+    ("human_review", "invalid_threshold_rules"),
+)
+
+
+class DecisionRouter:
+    """One threshold's routing, compiled (see :func:`route` for the rules).
+
+    Rules that do not validate are logged, and every row is routed to human
+    review (``invalid_threshold_rules``): one tenant's bad threshold must not
+    fail a mixed-tenant scoring batch.
+    """
+
+    def __init__(self, threshold: dict[str, Any] | None) -> None:
+        self.threshold = threshold
+        self.invalid_rules = False
+        self._rules = validate_rules({})
+        self._approve_min = self._decline_max = None
+        if threshold is not None:
+            try:
+                self._rules = validate_rules(threshold.get("rules"))
+            except InvalidRules as e:
+                logger.error(
+                    "threshold %s has invalid rules (%s); routing its applications to human review",
+                    threshold.get("id"),
+                    e,
+                )
+                self.invalid_rules = True
+            self._approve_min = threshold["auto_approve_min"]
+            self._decline_max = threshold["auto_decline_max"]
+
+        purposes = self._rules["require_review_purposes"]
+        # Purpose precedence sits between the score reasons and long_term.
+        self._purpose_codes = {p: -(i + 1) for i, p in enumerate(purposes)}
+        reasons = list(_FIXED_REASONS) + [("human_review", f"purpose:{p}") for p in purposes]
+        self.decisions = np.array([d for d, _ in reasons], dtype=object)
+        self.reasons = np.array([r for _, r in reasons], dtype=object)
+
+    def route_codes(
+        self,
+        scores: np.ndarray,
+        loan_amounts: np.ndarray,
+        term_months: np.ndarray,
+        purposes: Iterable[Any] | None = None,
+    ) -> np.ndarray:
+        """Reason code per row (index into ``decisions`` / ``reasons``).
+
+        ``loan_amounts`` / ``term_months`` are float arrays with NaN for
+        missing; ``purposes`` is any sequence (non-strings never match).
+        """
+
+        scores = np.asarray(scores)
+        n = scores.shape[0]
+        if self.threshold is None:
+            return np.full(n, _NO_THRESHOLD, dtype=np.int32)
+        if self.invalid_rules:
+            return np.full(n, _INVALID_RULES, dtype=np.int32)
+
+        # Lowest precedence first; each later mask overrides.
+        codes = np.full(n, _BORDERLINE, dtype=np.int32)
+        codes[scores <= self._decline_max] = _BELOW
+        codes[scores >= self._approve_min] = _ABOVE
+
+        if self._purpose_codes and purposes is not None:
+            lookup = self._purpose_codes
+            matched = np.fromiter(
+                (lookup.get(p, 0) if isinstance(p, str) else 0 for p in purposes), dtype=np.int32, count=n
+            )
+            hit = matched < 0
+            codes[hit] = _PURPOSE - matched[hit] - 1
+
+        max_term = self._rules["max_term_months_auto"]
+        if max_term is not None:
+            codes[np.asarray(term_months, dtype=np.float64) > max_term] = _LONG_TERM
+        max_amount = self._rules["max_loan_amount_auto"]
+        if max_amount is not None:
+            codes[np.asarray(loan_amounts, dtype=np.float64) > max_amount] = _HIGH_VALUE
+        return codes
+
+    def route_batch(
+        self,
+        scores: np.ndarray,
+        loan_amounts: np.ndarray,
+        term_months: np.ndarray,
+        purposes: Iterable[Any] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """(decisions, reasons) object arrays, one entry per row."""
+
+        codes = self.route_codes(scores, loan_amounts, term_months, purposes)
+        return self.decisions[codes], self.reasons[codes]
+
+
+_ROUTER_CACHE_SIZE = 256
+_routers: OrderedDict[tuple, DecisionRouter] = OrderedDict()
+_routers_lock = threading.Lock()
+
+
+def _version_key(threshold: dict[str, Any] | None) -> tuple:
+    if threshold is None:
+        return (None,)
+    return (
+        str(threshold.get("id")),
+        threshold["auto_approve_min"],
+        threshold["auto_decline_max"],
+        json.dumps(threshold.get("rules") or {}, sort_keys=True, default=str),
+    )
+
+
+def get_router(threshold: dict[str, Any] | None) -> DecisionRouter:
+    """Compiled router for this threshold version (LRU of recent versions)."""
+
+    key = _version_key(threshold)
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is not None:
+            _routers.move_to_end(key)
+            return router
+    router = DecisionRouter(threshold)
+    with _routers_lock:
+        _routers[key] = router
+        while len(_routers) > _ROUTER_CACHE_SIZE:
+            _routers.popitem(last=False)
+    return router
@@ -0,0 +1,155 @@
+"""Scoring model used by the scoring worker.
+
+Models are resolved from model_registry by src.ml.model_loader; until a trained
+model is registered (TODO-3.2.x), scoring uses a fixed logistic scorecard over
+the derived ratios. The interface is batch-first: callers hand over the feature
+matrix of a whole micro-batch and get one result per row.
+
+Score mapping and risk categories follow hitl/prd.md §7.3:
+  score = int(1000 * (1 - probability_default))
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.ml.features import DEFAULT_MEDIANS, FEATURE_NAMES, FeatureStats
+
+
+@dataclass(frozen=True)
+class ScoreOutput:
+    score: int
+    probability_default: float
+    risk_category: str
+    shap_values: dict[str, float]
+    top_factors: dict[str, Any]
+
+
+def risk_category(score: int) -> str:
+    if score >= 750:
+        return "very_low"
+    if score >= 650:
+        return "low"
+    if score >= 550:
+        return "medium"
+    if score >= 450:
+        return "high"
+    return "very_high"
+
+
+def build_outputs(
+    X: np.ndarray,
+    pd: np.ndarray,
+    shap: np.ndarray | None,
+    *,
+    top_n: int = 3,
+    used: list[int] | None = None,
+) -> list[ScoreOutput]:
+    """Assemble per-row results from batch predictions and (optional) SHAP rows.
+
+    ``used`` restricts shap_values/top_factors to those feature columns
+    (default: all of them).
+    """
+
+    pd = np.round(np.clip(pd, 0.0, 0.9999), 4)
+    scores = (1000 * (1 - pd)).astype(int)
+
+    if used is None:
+        used = list(range(len(FEATURE_NAMES)))
+
+    outputs: list[ScoreOutput] = []
+    for i in range(X.shape[0]):
+        score = int(scores[i])
+        shap_values: dict[str, float] = {}
+        factors: list[dict[str, Any]] = []
+        if shap is not None:
+            row = shap[i]
+            shap_values = {FEATURE_NAMES[j]: round(float(row[j]), 6) for j in used}
+            factors = [
+                {
+                    "feature": FEATURE_NAMES[j],
+                    "value": float(X[i, j]),
+                    "impact": round(float(row[j]), 6),
+                    "direction": "increases_risk" if row[j] > 0 else "decreases_risk",
+                }
+                for j in sorted(used, key=lambda j: abs(row[j]), reverse=True)[:top_n]
+            ]
+        outputs.append(
+            ScoreOutput(
+                score=score,
+                probability_default=float(pd[i]),
+                risk_category=risk_category(score),
+                shap_values=shap_values,
+                top_factors={"factors": factors},
+            )
+        )
+    return outputs
+
+
+class LinearScorecard:
+    """Logistic scorecard: pd = sigmoid(intercept + X @ coef).
+
+    Takes the imputed feature matrix from
+    :meth:`src.ml.features.FeatureExtractor.transform` (columns in
+    FEATURE_NAMES order). Contributions are coef * (x - reference), which for a
+    linear model are exact SHAP values in log-odds space.
+
+    ``coef`` / ``reference`` may be read-only memory-mapped arrays (see
+    src.ml.model_loader); they are only ever read.
+    """
+
+    # Exact SHAP is one multiply per cell; a cache lookup would cost more.
+    explanation_cacheable = False
+
+    def __init__(
+        self,
+        *,
+        model_id: str,
+        version: str,
+        coef: np.ndarray,
+        intercept: float,
+        reference: np.ndarray,
+        feature_stats: FeatureStats | None = None,
+    ) -> None:
+        self.model_id = model_id
+        self.version = version
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.reference = reference
+        self.feature_stats = feature_stats or FeatureStats()
+
+    def predict_pd(self, X: np.ndarray) -> np.ndarray:
+        z = self.intercept + X @ self.coef
+        return 1.0 / (1.0 + np.exp(-np.clip(z, -700, 700)))
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        return (X - self.reference) * self.coef
+
+    def score_batch(self, X: np.ndarray, *, top_n: int = 3) -> list[ScoreOutput]:
+        used = [j for j in range(len(FEATURE_NAMES)) if self.coef[j] != 0]
+        return build_outputs(X, self.predict_pd(X), self.shap_values(X), top_n=top_n, used=used)
+
+
+# Built-in fallback used while no model is registered/active.
+BASELINE_COEFFICIENTS = {"dti_ratio": 2.5, "loan_to_income": 1.0, "payment_to_income": 3.0}
+
+
+def baseline_scorecard() -> LinearScorecard:
+    return LinearScorecard(
+        model_id="baseline-scorecard",
+        version="v1",
+        coef=np.array([BASELINE_COEFFICIENTS.get(name, 0.0) for name in FEATURE_NAMES]),
+        intercept=-3.0,
+        reference=np.array([DEFAULT_MEDIANS[name] for name in FEATURE_NAMES]),
+    )
+
+
+def get_scoring_model() -> LinearScorecard:
+    """The active model (src.ml.model_loader); re-resolved periodically."""
+
+    from src.ml.model_loader import get_model_loader
+
+    return get_model_loader().current()
@@ -0,0 +1,299 @@
+"""Threshold what-if simulation over historical scores.
+
+Answers "what would a different DecisionThreshold have done?" for a tenant:
+
+  1. :func:`load_history` streams each application's latest scoring result,
+     left-joined to its latest loan outcome, through a server-side cursor into
+     columnar NumPy arrays (:class:`ScoreHistory`). Memory is one fetch chunk
+     of Python rows plus the arrays (~50 bytes per application);
+  2. :func:`simulate_thresholds` evaluates any number of candidate
+     (auto_approve_min, auto_decline_max) pairs at once. Rows are sorted by
+     score once and every metric becomes a prefix sum, so a candidate costs
+     two ``searchsorted`` lookups whatever the row count.
+
+Threshold ``rules`` (max_loan_amount_auto, ...) are shared by all candidates:
+rows they send to review are queued under every pair, exactly as in
+:mod:`src.ml.routing`.
+
+Per candidate the result has the approve / queue / decline split plus, for
+the approved and declined sets, the observed default rate (rows with an
+outcome), the expected default rate (mean ``probability_default``) and the
+realized loss. ``curve`` gives the same approved-set metrics over a grid of
+approve cutoffs (the loss curve; it does not depend on auto_decline_max).
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+import psycopg
+
+from src.ml.routing import validate_rules
+
+_HISTORY_SQL = """
+SELECT s.score,
+       s.probability_default::float8,
+       COALESCE(o.defaulted::int::float8, 'NaN'::float8),
+       COALESCE(o.loss_amount::float8, 0),
+       COALESCE(a.loan_amount::float8, 'NaN'::float8),
+       CASE WHEN a.loan_request->>'term_months' ~ '^[0-9]+(\\.[0-9]+)?$'
+            THEN (a.loan_request->>'term_months')::float8 ELSE 'NaN'::float8 END,
+       a.loan_request->>'purpose'
+FROM applications a
+JOIN scoring_results s ON s.id = a.latest_scoring_result_id
+LEFT JOIN LATERAL (
+  SELECT lo.defaulted, lo.loss_amount
+  FROM loan_outcomes lo
+  WHERE lo.application_id = a.id
+  ORDER BY lo.observed_at DESC
+  LIMIT 1
+) o ON true
+WHERE a.tenant_id = %(tenant_id)s
+  AND (%(scored_from)s::timestamptz IS NULL OR s.created_at >= %(scored_from)s::timestamptz)
+  AND (%(scored_to)s::timestamptz IS NULL OR s.created_at < %(scored_to)s::timestamptz)
+"""
+
+MAX_CANDIDATES = 10_000
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+@dataclass
+class ScoreHistory:
+    """One row per scored application; NaN marks a missing value (``defaulted``
+    is NaN when no outcome has been observed yet)."""
+
+    scores: np.ndarray  # int32
+    probability_default: np.ndarray
+    defaulted: np.ndarray
+    loss_amount: np.ndarray
+    loan_amounts: np.ndarray
+    term_months: np.ndarray
+    purposes: np.ndarray  # object
+    load_ms: float = 0.0
+
+    def __len__(self) -> int:
+        return int(self.scores.shape[0])
+
+
+def load_history(
+    conn: psycopg.Connection,
+    tenant_id: uuid.UUID,
+    *,
+    scored_from: datetime | None = None,
+    scored_to: datetime | None = None,
+    chunk_size: int = 50_000,
+) -> ScoreHistory:
+    """Stream the tenant's history (latest score per application, scored in
+    [scored_from, scored_to)) into columnar arrays."""
+
+    started = time.perf_counter()
+    columns: list[list[np.ndarray]] = [[] for _ in range(7)]
+    params = {"tenant_id": tenant_id, "scored_from": scored_from, "scored_to": scored_to}
+    with conn.transaction():
+        # A named cursor is server-side: rows arrive chunk_size at a time.
+        with conn.cursor(name="hitl_threshold_sim") as cur:
+            cur.itersize = chunk_size
+            cur.execute(_HISTORY_SQL, params)
+            while rows := cur.fetchmany(chunk_size):
+                scores, pds, defaulted, losses, amounts, terms, purposes = zip(*rows)
+                n = len(rows)
+                columns[0].append(np.fromiter(scores, dtype=np.int32, count=n))
+                columns[1].append(np.array(pds, dtype=np.float64))  # None -> nan
+                columns[2].append(np.fromiter(defaulted, dtype=np.float64, count=n))
+                columns[3].append(np.fromiter(losses, dtype=np.float64, count=n))
+                columns[4].append(np.fromiter(amounts, dtype=np.float64, count=n))
+                columns[5].append(np.fromiter(terms, dtype=np.float64, count=n))
+                columns[6].append(np.array(purposes, dtype=object))
+
+    dtypes = (np.int32, np.float64, np.float64, np.float64, np.float64, np.float64, object)
+    arrays = [np.concatenate(c) if c else np.empty(0, dtype=t) for c, t in zip(columns, dtypes)]
+    return ScoreHistory(*arrays, load_ms=(time.perf_counter() - started) * 1000)
+
+
+def review_mask(history: ScoreHistory, rules: dict[str, Any] | None) -> np.ndarray:
+    """Rows that ``rules`` send to human review whatever the score."""
+
+    rules = validate_rules(rules)
+    forced = np.zeros(len(history), dtype=bool)
+    if rules["max_loan_amount_auto"] is not None:
+        forced |= history.loan_amounts > rules["max_loan_amount_auto"]
+    if rules["max_term_months_auto"] is not None:
+        forced |= history.term_months > rules["max_term_months_auto"]
+    if rules["require_review_purposes"]:
+        review = set(rules["require_review_purposes"])
+        forced |= np.fromiter((p in review for p in history.purposes), dtype=bool, count=len(history))
+    return forced
+
+
+class _PrefixSums:
+    """Score-sorted prefix sums: count, labelled, defaults, pd (+ count), loss."""
+
+    def __init__(self, history: ScoreHistory, keep: np.ndarray) -> None:
+        order = np.argsort(history.scores[keep], kind="stable")
+        self.scores = history.scores[keep][order]
+        defaulted = history.defaulted[keep][order]
+        pd = history.probability_default[keep][order]
+        labelled = ~np.isnan(defaulted)
+        has_pd = ~np.isnan(pd)
+
+        def cum(values: np.ndarray) -> np.ndarray:
+            return np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+
+        self.count = np.arange(self.scores.shape[0] + 1, dtype=np.float64)
+        self.labelled = cum(labelled)
+        self.defaults = cum(np.where(labelled, defaulted, 0.0))
+        self.pd_count = cum(has_pd)
+        self.pd_sum = cum(np.where(has_pd, pd, 0.0))
+        self.loss = cum(np.where(labelled, history.loss_amount[keep][order], 0.0))
+
+    def above(self, cutoffs: np.ndarray) -> dict[str, np.ndarray]:
+        """Totals over rows with score >= cutoff."""
+
+        idx = np.searchsorted(self.scores, cutoffs, side="left")
+        return {k: getattr(self, k)[-1] - getattr(self, k)[idx] for k in _SUMS}
+
+    def at_or_below(self, cutoffs: np.ndarray) -> dict[str, np.ndarray]:
+        """Totals over rows with score <= cutoff."""
+
+        idx = np.searchsorted(self.scores, cutoffs, side="right")
+        return {k: getattr(self, k)[idx] for k in _SUMS}
+
+
+_SUMS = ("count", "labelled", "defaults", "pd_count", "pd_sum", "loss")
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / np.where(den > 0, den, 1), np.nan)
+
+
+def _segment(totals: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return {
+        "default_rate": _ratio(totals["defaults"], totals["labelled"]),
+        "expected_default_rate": _ratio(totals["pd_sum"], totals["pd_count"]),
+        "with_outcome": totals["labelled"],
+        "defaults": totals["defaults"],
+        "loss": totals["loss"],
+    }
+
+
+def _rows(columns: dict[str, np.ndarray], size: int) -> list[dict[str, Any]]:
+    def value(v):
+        if isinstance(v, np.floating) and np.isnan(v):
+            return None
+        return v.item() if isinstance(v, np.generic) else v
+
+    return [{k: value(col[i]) for k, col in columns.items()} for i in range(size)]
+
+
+def simulate_thresholds(
+    history: ScoreHistory,
+    candidates: Sequence[tuple[int, int]],
+    *,
+    rules: dict[str, Any] | None = None,
+    curve_cutoffs: Iterable[int] | None = None,
+) -> dict[str, Any]:
+    """Evaluate every (auto_approve_min, auto_decline_max) pair over ``history``.
+
+    Returns ``{"rows", "forced_review", "candidates": [...], "curve": [...],
+    "eval_ms"}``; rates are fractions of ``rows`` and None where undefined.
+    Raises ValueError for a pair with auto_decline_max >= auto_approve_min
+    (chk_threshold_range) and :class:`~src.ml.routing.InvalidRules`.
+    """
+
+    started = time.perf_counter()
+    pairs = np.asarray(candidates, dtype=np.int64).reshape(-1, 2)
+    approve_min, decline_max = pairs[:, 0], pairs[:, 1]
+    if np.any(decline_max >= approve_min):
+        raise ValueError("auto_decline_max must be < auto_approve_min")
+
+    forced = review_mask(history, rules)
+    sums = _PrefixSums(history, ~forced)
+    total = len(history)
+
+    approved = sums.above(approve_min)
+    declined = sums.at_or_below(decline_max)
+    queued = total - approved["count"] - declined["count"]
+    columns: dict[str, np.ndarray] = {
+        "auto_approve_min": approve_min,
+        "auto_decline_max": decline_max,
+        "approved": approved["count"].astype(np.int64),
+        "queued": queued.astype(np.int64),
+        "declined": declined["count"].astype(np.int64),
+        "approve_rate": _ratio(approved["count"], np.full(len(pairs), total)),
+        "queue_rate": _ratio(queued, np.full(len(pairs), total)),
+        "decline_rate": _ratio(declined["count"], np.full(len(pairs), total)),
+    }
+    for prefix, totals in (("approved", approved), ("declined", declined)):
+        for key, col in _segment(totals).items():
+            columns[f"{prefix}_{key}"] = col.astype(np.int64) if key in ("with_outcome", "defaults") else col
+
+    if curve_cutoffs is None:
+        curve_cutoffs = np.unique(sums.scores)
+    cutoffs = np.asarray(list(curve_cutoffs), dtype=np.int64)
+    curve_approved = sums.above(cutoffs)
+    curve = {
+        "auto_approve_min": cutoffs,
+        "approve_rate": _ratio(curve_approved["count"], np.full(len(cutoffs), total)),
+        **{k: v for k, v in _segment(curve_approved).items() if k not in ("with_outcome", "defaults")},
+    }
+
+    return {
+        "rows": total,
+        "forced_review": int(forced.sum()),
+        "candidates": _rows(columns, len(pairs)),
+        "curve": _rows(curve, len(cutoffs)),
+        "eval_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def active_rules(conn: psycopg.Connection, tenant_id: uuid.UUID) -> dict[str, Any]:
+    """Rules of the tenant's active threshold ({} when there is none)."""
+
+    row = conn.execute("SELECT rules FROM get_active_threshold(%s)", (tenant_id,)).fetchone()
+    return (row[0] if row else None) or {}
+
+
+def run_simulation(
+    database_url: str,
+    tenant_id: uuid.UUID,
+    candidates: Sequence[tuple[int, int]],
+    *,
+    rules: dict[str, Any] | None = None,
+    scored_from: datetime | None = None,
+    scored_to: datetime | None = None,
+    curve_step: int | None = 10,
+) -> dict[str, Any]:
+    """Load + simulate on a connection of its own (blocking; the API runs it
+    in a worker thread). ``rules=None`` uses the active threshold's rules;
+    the curve has a point every ``curve_step`` score points (None: every
+    distinct score). Adds ``load_ms`` to the result."""
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        if rules is None:
+            rules = active_rules(conn, tenant_id)
+        validate_rules(rules)  # fail before streaming anything
+        history = load_history(conn, tenant_id, scored_from=scored_from, scored_to=scored_to)
+
+    curve_cutoffs = None
+    if curve_step is not None and len(history):
+        low, high = int(history.scores.min()), int(history.scores.max())
+        curve_cutoffs = range(low, high + curve_step, curve_step)
+    result = simulate_thresholds(history, candidates, rules=rules, curve_cutoffs=curve_cutoffs)
+    result["rules"] = rules
+    result["load_ms"] = history.load_ms
+    return result
+
+
+def candidate_grid(approve_mins: Iterable[int], decline_maxes: Iterable[int]) -> list[tuple[int, int]]:
+    """Every valid (approve_min, decline_max) combination of the two ranges."""
+
+    return [(a, d) for a in approve_mins for d in decline_maxes if d < a]
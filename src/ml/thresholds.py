@@ -0,0 +1,220 @@
+"""Per-process cache of each tenant's active decision threshold.
+
+Routing needs ``get_active_threshold(tenant_id)`` after every scoring batch.
+:class:`ThresholdCache` keeps the result per tenant (including "no active
+threshold") until the earliest of:
+
+  - the next boundary at which the answer can change by time alone, i.e. the
+    cached threshold's ``effective_to`` or the next future ``effective_from``
+    of an active threshold of the tenant (compared on the database clock);
+  - a ``hitl_threshold_changes`` notification for the tenant, sent by trigger
+    on every decision_thresholds insert / update / delete (migration 019) and
+    received by one listener thread per process;
+  - THRESHOLD_CACHE_TTL_SECONDS (default 300), a backstop.
+
+While the listener is not connected, nothing is cached (every lookup goes to
+the database), so a lost notification can never serve a stale threshold. In
+steady state routing a batch costs no threshold query.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from typing import Any, Iterable
+
+import psycopg
+
+logger = logging.getLogger("hitl.ml")
+
+CHANNEL = "hitl_threshold_changes"
+
+_LOAD_SQL = """
+SELECT t.tenant_id, th.threshold_id, th.auto_approve_min, th.auto_decline_max, th.rules,
+       EXTRACT(EPOCH FROM clock_timestamp()),
+       EXTRACT(EPOCH FROM LEAST(
+         (SELECT dt.effective_to FROM decision_thresholds dt WHERE dt.id = th.threshold_id),
+         (SELECT min(dt.effective_from) FROM decision_thresholds dt
+          WHERE dt.tenant_id = t.tenant_id AND dt.is_active AND dt.effective_from > NOW())
+       ))
+FROM unnest(%(tenant_ids)s::uuid[]) AS t(tenant_id)
+LEFT JOIN LATERAL get_active_threshold(t.tenant_id) AS th ON true
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+class ThresholdCache:
+    """Tenant -> active threshold dict (``id``, ``auto_approve_min``,
+    ``auto_decline_max``, ``rules``) or None."""
+
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        ttl_seconds: float = 300.0,
+        reconnect_seconds: float = 1.0,
+    ) -> None:
+        self._dsn = _sync_dsn(database_url)
+        self.ttl_seconds = ttl_seconds
+        self.reconnect_seconds = reconnect_seconds
+        self._lock = threading.Lock()
+        # tenant -> (threshold | None, expires_at on the database clock)
+        self._entries: dict[uuid.UUID, tuple[dict[str, Any] | None, float]] = {}
+        # Bumped on every invalidation; a load only stores its result if no
+        # invalidation for the tenant arrived while it was running.
+        self._generation: dict[uuid.UUID, int] = {}
+        self._epoch = 0
+        self._clock_offset = 0.0
+        self._listening = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    @property
+    def listening(self) -> bool:
+        return self._listening.is_set()
+
+    def get_many(self, conn: psycopg.Connection, tenant_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, dict | None]:
+        """Active threshold per tenant; misses are loaded in one query on ``conn``
+        (inside the caller's transaction)."""
+
+        self.start()
+        now = time.time() + self._clock_offset
+        result: dict[uuid.UUID, dict | None] = {}
+        missing: list[uuid.UUID] = []
+        with self._lock:
+            for tenant_id in set(tenant_ids):
+                entry = self._entries.get(tenant_id)
+                if entry is not None and now < entry[1]:
+                    result[tenant_id] = entry[0]
+                    self._stats["hits"] += 1
+                else:
+                    missing.append(tenant_id)
+            self._stats["misses"] += len(missing)
+            if not missing:
+                return result
+            self._stats["loads"] += 1
+            epoch = self._epoch
+            generations = {t: self._generation.get(t, 0) for t in missing}
+            cacheable = self._listening.is_set()
+
+        with conn.cursor() as cur:
+            cur.execute(_LOAD_SQL, {"tenant_ids": missing})
+            rows = cur.fetchall()
+
+        loaded = {}
+        for tenant_id, threshold_id, approve_min, decline_max, rules, db_now, next_change in rows:
+            threshold = None
+            if threshold_id is not None:
+                threshold = {
+                    "id": threshold_id,
+                    "auto_approve_min": approve_min,
+                    "auto_decline_max": decline_max,
+                    "rules": rules,
+                }
+            self._clock_offset = float(db_now) - time.time()
+            expires_at = float(db_now) + self.ttl_seconds
+            if next_change is not None:
+                expires_at = min(expires_at, float(next_change))
+            loaded[tenant_id] = (threshold, expires_at)
+            result[tenant_id] = threshold
+
+        if cacheable:
+            with self._lock:
+                if self._epoch == epoch:
+                    for tenant_id, entry in loaded.items():
+                        if self._generation.get(tenant_id, 0) == generations[tenant_id]:
+                            self._entries[tenant_id] = entry
+        return result
+
+    def invalidate(self, tenant_id: uuid.UUID | None = None) -> None:
+        """Drop one tenant's entry, or everything (``tenant_id=None``)."""
+
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if tenant_id is None:
+                self._entries.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(tenant_id, None)
+                self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+
+    def start(self) -> None:
+        """Start the invalidation listener thread (idempotent; get_many calls it)."""
+
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._listen, name="hitl-threshold-cache", daemon=True)
+                    self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _on_notify(self, notify: psycopg.Notify) -> None:
+        try:
+            self.invalidate(uuid.UUID(notify.payload))
+        except ValueError:
+            self.invalidate()
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self._dsn, autocommit=True) as conn:
+                    conn.add_notify_handler(self._on_notify)
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    # Anything cached before LISTEN took effect may have missed a change.
+                    self.invalidate()
+                    self._listening.set()
+                    while not self._stop.is_set():
+                        if select.select([conn.fileno()], [], [], 1.0)[0]:
+                            conn.execute("SELECT 1")  # drains pending notifications into _on_notify
+            except psycopg.Error:
+                logger.exception("threshold cache: listener connection failed")
+            finally:
+                self._listening.clear()
+                self.invalidate()
+            self._stop.wait(self.reconnect_seconds)
+
+
+_cache: ThresholdCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_threshold_cache() -> ThresholdCache:
+    """Process-wide cache (THRESHOLD_CACHE_TTL_SECONDS=300)."""
+
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from src.config import settings
+
+            _cache = ThresholdCache(
+                settings.database_url,
+                ttl_seconds=float(os.getenv("THRESHOLD_CACHE_TTL_SECONDS", "300")),
+            )
+        return _cache
+
+
+def _reset_after_fork() -> None:
+    # The listener thread does not survive fork; start over in the child.
+    global _cache, _cache_lock
+    _cache = None
+    _cache_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -11,3 +11,6 @@ from .model_registry import ModelRegistry  # noqa: F401
 from .similar_case import SimilarCase  # noqa: F401
 from .notification import Notification  # noqa: F401
 from .loan_outcome import LoanOutcome  # noqa: F401
+from .task_outbox import TaskOutbox  # noqa: F401
+from .queue_summary_counter import QueueSummaryCounter  # noqa: F401
+from .queue_event import QueueEvent  # noqa: F401
@@ -14,6 +14,8 @@ class AnalystQueue(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
+    # Denormalized from applications.tenant_id by trigger (migration 014); writers may omit it.
+    tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
     analyst_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
     priority: Mapped[int] = mapped_column(Integer, nullable=False, server_default="50")
@@ -27,9 +29,16 @@ class AnalystQueue(Base):
 
     sla_deadline: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
     sla_breached: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    # Set by the SLA sweeper (src.tasks.sla) when the warning notification is created.
+    sla_warned_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     routing_reason: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Auto-assignment only hands the entry to analysts with this skill (NULL = anyone).
+    required_skill: Mapped[str | None] = mapped_column(String(100), nullable=True)
     score_at_routing: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # Bumped by trigger on every update (migration 018); optimistic concurrency token.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
     created_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
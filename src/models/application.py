@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import uuid
+from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, String, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Computed, DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -23,9 +24,36 @@ class Application(Base):
     loan_request: Mapped[dict] = mapped_column(JSONB, nullable=False)
     credit_bureau_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
+    # Typed projection of loan_request.loan_amount (migrations 011, 023); NULL if
+    # not a numeric literal of bounded size.
+    loan_amount: Mapped[Decimal | None] = mapped_column(
+        Numeric,
+        Computed(
+            r"CASE WHEN (loan_request->>'loan_amount') "
+            r"~ '^\s*[-+]?([0-9]{1,30}(\.[0-9]{0,30})?|\.[0-9]{1,30})([eE][-+]?[0-9]{1,2})?\s*$' "
+            "THEN (loan_request->>'loan_amount')::numeric END",
+            persisted=True,
+        ),
+    )
+
     source: Mapped[str] = mapped_column(String(50), nullable=False, server_default="web")
     meta: Mapped[dict] = mapped_column("metadata", JSONB, nullable=False, server_default='{}')
 
+    # Maintained by Postgres (migration 009); deferred so listings never load it.
+    search_vector: Mapped[object | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', hitl_search_fold(coalesce(external_id, '') || ' ' || coalesce(applicant_data->>'name', '')))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Denormalized latest ScoringResult, maintained by trigger (migration 010).
+    latest_scoring_result_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    latest_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    latest_scored_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     submitted_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     expires_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
@@ -12,6 +12,8 @@ from .base import Base
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
+    # The table is range-partitioned by month on created_at (migration 020), so
+    # its database primary key is (id, created_at); id alone identifies a row.
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
     user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
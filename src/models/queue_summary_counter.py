@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, SmallInteger, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class QueueSummaryCounter(Base):
+    """Open queue entries per tenant x status x priority bucket (migration 015).
+
+    Maintained by a trigger on analyst_queues; each (tenant, status, bucket)
+    is spread over several ``shard`` rows, so readers sum over shards.
+    """
+
+    __tablename__ = "queue_summary_counters"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(30), primary_key=True)
+    priority_bucket: Mapped[str] = mapped_column(String(10), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+
+    n: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
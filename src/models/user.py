@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -23,6 +23,8 @@ class User(Base):
 
     permissions: Mapped[list] = mapped_column(JSONB, nullable=False, server_default='[]')
     preferences: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default='{}')
+    # Matched against analyst_queues.required_skill by auto-assignment; empty = generalist.
+    skills: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=False, server_default="{}")
 
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="true")
     last_login_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
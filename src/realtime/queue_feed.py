@@ -0,0 +1,238 @@
+"""Per-process fan-out of queue change events (TODO-2.2: analyst workbench).
+
+Every analyst_queues change writes a queue_events row and a NOTIFY on
+``hitl_queue_events`` (migration 016). Each API process runs ONE listener
+connection (:class:`QueueEventHub`) and fans notifications out to its
+subscribers by tenant, so N open workbenches cost one database connection
+instead of N pollers.
+
+Subscribers get a bounded in-memory queue. A subscriber that falls behind
+(queue full), or any subscriber when the listener connection drops, is marked
+``lagged``: its stream ends and the client reconnects with its last SSE id;
+the gap is replayed from queue_events.
+
+SSE ids are resume cursors, not event ids: queue_events ids are assigned at
+insert and can commit out of order, so the cursor is the xmin of the snapshot
+the event was written under (migration 021). Resuming from it replays every
+event whose transaction was still open then, at the cost of some repeats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from collections import defaultdict
+from typing import AsyncIterator, Awaitable, Callable
+
+import asyncpg
+
+logger = logging.getLogger("hitl.realtime")
+
+CHANNEL = "hitl_queue_events"
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+class Subscription:
+    def __init__(self, tenant_id: str, max_pending: int) -> None:
+        self.tenant_id = tenant_id
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_pending)
+        self.lagged = False
+        self._wakeup = asyncio.Event()
+
+    def _deliver(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._mark_lagged()
+
+    def _mark_lagged(self) -> None:
+        self.lagged = True
+        self._wakeup.set()
+
+    async def get(self, timeout: float) -> dict | None:
+        """Next event, or None on timeout or when the subscription has lagged."""
+
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+        if self.lagged:
+            return None
+        getter = asyncio.ensure_future(self.queue.get())
+        waker = asyncio.ensure_future(self._wakeup.wait())
+        try:
+            done, _ = await asyncio.wait({getter, waker}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waker.cancel()
+        if getter.done() and not getter.cancelled():
+            return getter.result()
+        getter.cancel()
+        return None
+
+
+class QueueEventHub:
+    """One LISTEN connection per process, fanning events out by tenant."""
+
+    def __init__(self, database_url: str, *, max_pending: int = 1000, reconnect_seconds: float = 1.0) -> None:
+        self._dsn = _asyncpg_dsn(database_url)
+        self.max_pending = max_pending
+        self.reconnect_seconds = reconnect_seconds
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._task: asyncio.Task | None = None
+        self._listening = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, tenant_id: uuid.UUID, *, timeout: float = 10.0) -> AsyncIterator[Subscription]:
+        """Register for the tenant's events; enters once the listener is active
+        (raises TimeoutError if it cannot LISTEN within ``timeout`` seconds).
+        """
+
+        sub = Subscription(str(tenant_id), self.max_pending)
+        self._subscribers[sub.tenant_id].add(sub)
+        try:
+            self._ensure_started()
+            await asyncio.wait_for(self._listening.wait(), timeout)
+            yield sub
+        finally:
+            subs = self._subscribers.get(sub.tenant_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.tenant_id]
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="hitl-queue-event-hub")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("queue event hub: malformed payload %r", payload[:200])
+            return
+        for sub in list(self._subscribers.get(event.get("tenant_id"), ())):
+            sub._deliver(event)
+
+    def _on_connection_lost(self) -> None:
+        # Notifications sent while disconnected are gone; make every stream
+        # reconnect and replay from its cursor.
+        self._listening.clear()
+        for subs in self._subscribers.values():
+            for sub in subs:
+                sub._mark_lagged()
+
+    async def _run(self) -> None:
+        while True:
+            conn: asyncpg.Connection | None = None
+            try:
+                conn = await asyncpg.connect(self._dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _c: lost.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                self._listening.set()
+                logger.info("queue event hub listening on %s", CHANNEL)
+                await lost.wait()
+                logger.warning("queue event hub: listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncpg.PostgresError):
+                logger.exception("queue event hub: listener connection failed")
+            finally:
+                self._on_connection_lost()
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(self.reconnect_seconds)
+
+
+def format_sse(event: str, data: dict, *, event_id: int | None = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return "\n".join(lines) + "\n\n"
+
+
+async def queue_event_stream(
+    hub: QueueEventHub,
+    tenant_id: uuid.UUID,
+    *,
+    cursor: int | None,
+    replay: Callable[[int, int], Awaitable[list[dict]]],
+    latest: Callable[[], Awaitable[int]],
+    replay_limit: int = 1000,
+    heartbeat_seconds: float = 15.0,
+) -> AsyncIterator[str]:
+    """SSE body for one client.
+
+    Takes the current cursor and subscribes (so nothing committed from here
+    on is missed), then:
+      - with a cursor: replays queue_events from it, or sends ``reset`` when
+        more than ``replay_limit`` were missed (client should refetch the
+        list/summary and continue from the reset id);
+      - sends ``ready`` carrying the cursor taken before subscribing;
+      - streams live events (``queue.created`` / ``queue.updated`` /
+        ``queue.completed`` / ``queue.deleted``), with a comment heartbeat.
+
+    Ends when the subscription lags; the client reconnects with Last-Event-ID.
+    Delivery is at-least-once: clients should ignore event ids (``data.id``)
+    they have already seen.
+    """
+
+    # Taken before LISTEN starts: every transaction that commits after that
+    # has xid >= current, so resuming from it misses nothing sent live.
+    current = await latest()
+    async with hub.subscribe(tenant_id) as sub:
+        replayed: set[int] = set()
+        if cursor is not None:
+            missed = await replay(cursor, replay_limit + 1)
+            if len(missed) > replay_limit:
+                yield format_sse("reset", {"reason": "too_many_missed_events"}, event_id=current)
+            else:
+                for event in missed:
+                    replayed.add(event["id"])
+                    yield format_sse(f"queue.{event['event']}", event, event_id=event["cursor"])
+
+        yield format_sse("ready", {"cursor": current}, event_id=current)
+
+        while True:
+            event = await sub.get(heartbeat_seconds)
+            if event is not None:
+                # The replay covers transactions still open when it ran, so
+                # their events can also arrive live: skip those by id.
+                if event["id"] not in replayed:
+                    yield format_sse(f"queue.{event['event']}", event, event_id=event["cursor"])
+                continue
+            if sub.lagged:
+                yield format_sse("lagged", {"reason": "reconnect with Last-Event-ID"})
+                return
+            yield ": keep-alive\n\n"
+
+
+_hub: QueueEventHub | None = None
+
+
+def get_queue_event_hub() -> QueueEventHub:
+    """Process-wide hub, bound to the running event loop."""
+
+    global _hub
+    loop = asyncio.get_running_loop()
+    if _hub is None or _hub._loop is not loop:
+        from src.config import settings
+
+        _hub = QueueEventHub(settings.database_url)
+        _hub._loop = loop
+    return _hub
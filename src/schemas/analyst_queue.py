@@ -13,6 +13,7 @@ QueueStatus = Literal["pending", "assigned", "in_progress", "completed"]
 class AnalystQueueRead(BaseModel):
     id: UUID
     application_id: UUID
+    tenant_id: UUID
     analyst_id: UUID | None
 
     priority: int
@@ -50,3 +51,14 @@ class AnalystQueueSummaryResponse(BaseModel):
     breached_sla: int
 
     by_priority: dict[str, int]
+
+
+class QueueClaimRequest(BaseModel):
+    tenant_id: UUID
+    analyst_id: UUID
+
+
+class QueueClaimResponse(BaseModel):
+    item: AnalystQueueRead | None = None
+    active_cases: int
+    max_active_cases: int
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field, model_validator
 
+from src.schemas.analyst_queue import AnalystQueueRead
 from src.schemas.scoring_result import ScoringResultRead
+from src.schemas.similar_case import SimilarCaseRead
 
 
 class ApplicationCreate(BaseModel):
@@ -62,6 +64,26 @@ class ApplicationCreate(BaseModel):
         return self
 
 
+class ApplicationBatchRequest(BaseModel):
+    # Items are validated one by one (as ApplicationCreate) so a bad item does
+    # not reject the whole batch.
+    items: list[dict[str, Any]] = Field(max_length=10_000)
+
+
+class ApplicationBatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "error"]
+    id: UUID | None = None
+    external_id: str | None = None
+    errors: list[dict[str, Any]] | None = None
+
+
+class ApplicationBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[ApplicationBatchItemResult]
+
+
 class ApplicationListItem(BaseModel):
     id: UUID
     tenant_id: UUID
@@ -69,6 +91,9 @@ class ApplicationListItem(BaseModel):
     external_id: str | None
     status: str
 
+    loan_amount: float | None = None
+    latest_score: int | None = None
+
     submitted_at: datetime
     created_at: datetime
     updated_at: datetime
@@ -79,9 +104,11 @@ class ApplicationListItem(BaseModel):
 
 class ApplicationListResponse(BaseModel):
     items: list[ApplicationListItem]
-    total: int
+    # None when total_mode=none; approximate when total_mode=estimate.
+    total: int | None
     page: int
     page_size: int
+    next_cursor: str | None = None
 
 
 class ApplicationRead(BaseModel):
@@ -101,6 +128,8 @@ class ApplicationRead(BaseModel):
 
     # TODO-2.1.3: extend with related resources as we build them out.
     scoring_result: ScoringResultRead | None = None
+    queue_info: AnalystQueueRead | None = None
+    similar_cases: list[SimilarCaseRead] = Field(default_factory=list)
 
     submitted_at: datetime
     expires_at: datetime | None
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class OutboxMetricsResponse(BaseModel):
+    pending: int
+    oldest_pending_age_seconds: float | None
+    retrying: int
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.ml.simulation import MAX_CANDIDATES
+
+
+class ThresholdCandidate(BaseModel):
+    auto_approve_min: int
+    auto_decline_max: int
+
+    @model_validator(mode="after")
+    def _validate_range(self) -> "ThresholdCandidate":
+        # Same rule as chk_threshold_range on decision_thresholds.
+        if self.auto_decline_max >= self.auto_approve_min:
+            raise ValueError("auto_decline_max must be < auto_approve_min")
+        return self
+
+
+class ThresholdSimulationRequest(BaseModel):
+    tenant_id: UUID
+    candidates: list[ThresholdCandidate] = Field(min_length=1, max_length=MAX_CANDIDATES)
+    # None: the rules of the tenant's active threshold.
+    rules: dict[str, Any] | None = None
+    scored_from: datetime | None = None
+    scored_to: datetime | None = None
+    # Loss-curve resolution in score points; None = every distinct score.
+    curve_step: int | None = Field(10, ge=1)
+
+    @model_validator(mode="after")
+    def _validate_dates(self) -> "ThresholdSimulationRequest":
+        if self.scored_from and self.scored_to and self.scored_from > self.scored_to:
+            raise ValueError("scored_from must be <= scored_to")
+        return self
+
+
+class ThresholdSimulationResult(BaseModel):
+    auto_approve_min: int
+    auto_decline_max: int
+    approved: int
+    queued: int
+    declined: int
+    approve_rate: float | None
+    queue_rate: float | None
+    decline_rate: float | None
+    approved_default_rate: float | None
+    approved_expected_default_rate: float | None
+    approved_with_outcome: int
+    approved_defaults: int
+    approved_loss: float
+    declined_default_rate: float | None
+    declined_expected_default_rate: float | None
+    declined_with_outcome: int
+    declined_defaults: int
+    declined_loss: float
+
+
+class ThresholdCurvePoint(BaseModel):
+    auto_approve_min: int
+    approve_rate: float | None
+    default_rate: float | None
+    expected_default_rate: float | None
+    loss: float
+
+
+class ThresholdSimulationResponse(BaseModel):
+    rows: int
+    forced_review: int
+    rules: dict[str, Any]
+    candidates: list[ThresholdSimulationResult]
+    curve: list[ThresholdCurvePoint]
+    load_ms: float
+    eval_ms: float
@@ -0,0 +1,93 @@
+"""Recompute applications.metadata.derived with the current feature extractor.
+
+Uses the batch API of src.ml.features (one feature matrix per batch) and
+writes back with one UPDATE per batch, skipping rows whose stored features are
+already current. Idempotent and batched (keyset over applications.id, one
+commit per batch), so it can run against a live database and be resumed.
+
+Usage:
+  DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.backfill_features [--batch-size 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import uuid
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+from src.ml.features import get_feature_extractor
+
+_SELECT_SQL = """
+SELECT id, applicant_data, financial_data, loan_request, credit_bureau_data
+FROM applications
+WHERE id > %(after)s
+ORDER BY id
+LIMIT %(batch_size)s
+"""
+
+_UPDATE_SQL = """
+UPDATE applications a
+SET metadata = jsonb_set(COALESCE(a.metadata, '{}'::jsonb), '{derived}', v.derived)
+FROM unnest(%(ids)s::uuid[], %(derived)s::jsonb[]) AS v(id, derived)
+WHERE a.id = v.id
+  AND a.metadata->'derived' IS DISTINCT FROM v.derived
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def backfill_features(database_url: str, *, batch_size: int = 5000) -> int:
+    """Backfill all applications; returns the number of rows updated."""
+
+    extractor = get_feature_extractor()
+    after = uuid.UUID(int=0)
+    total_updated = 0
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        while True:
+            with conn.cursor() as cur:
+                cur.execute(_SELECT_SQL, {"after": after, "batch_size": batch_size})
+                rows = cur.fetchall()
+                if not rows:
+                    break
+
+                X = extractor.raw_matrix(
+                    {
+                        "applicant_data": applicant_data,
+                        "financial_data": financial_data,
+                        "loan_request": loan_request,
+                        "credit_bureau_data": credit_bureau_data,
+                    }
+                    for _, applicant_data, financial_data, loan_request, credit_bureau_data in rows
+                )
+                cur.execute(
+                    _UPDATE_SQL,
+                    {"ids": [row[0] for row in rows], "derived": [Jsonb(d) for d in extractor.to_dicts(X)]},
+                )
+                total_updated += cur.rowcount
+            conn.commit()
+            after = rows[-1][0]
+
+    return total_updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute applications.metadata.derived features")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    updated = backfill_features(database_url, batch_size=args.batch_size)
+    print(f"Recomputed derived features for {updated} application(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Backfill applications.latest_* from scoring_results.
+
+New scoring results keep these columns current via trigger (migration 010);
+this script fills them for rows that existed before the migration.
+
+Idempotent and batched (keyset over applications.id, one commit per batch), so
+it can run against a live database and be resumed at any point.
+
+Usage:
+  DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.backfill_latest_scores [--batch-size 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import uuid
+
+import psycopg
+
+_BATCH_SQL = """
+WITH batch AS (
+  SELECT id
+  FROM applications
+  WHERE id > %(after)s
+  ORDER BY id
+  LIMIT %(batch_size)s
+),
+latest AS (
+  SELECT DISTINCT ON (sr.application_id)
+    sr.application_id, sr.id, sr.score, sr.created_at
+  FROM scoring_results sr
+  JOIN batch b ON b.id = sr.application_id
+  ORDER BY sr.application_id, sr.created_at DESC, sr.id DESC
+),
+updated AS (
+  UPDATE applications a
+  SET latest_scoring_result_id = l.id,
+      latest_score = l.score,
+      latest_scored_at = l.created_at
+  FROM latest l
+  WHERE a.id = l.application_id
+    AND a.latest_scoring_result_id IS DISTINCT FROM l.id
+  RETURNING a.id
+)
+SELECT (SELECT id FROM batch ORDER BY id DESC LIMIT 1), (SELECT count(*) FROM batch), (SELECT count(*) FROM updated)
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def backfill_latest_scores(database_url: str, *, batch_size: int = 5000) -> int:
+    """Backfill all applications; returns the number of rows updated."""
+
+    after = uuid.UUID(int=0)
+    total_updated = 0
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        while True:
+            with conn.cursor() as cur:
+                cur.execute(_BATCH_SQL, {"after": after, "batch_size": batch_size})
+                last_id, scanned, updated = cur.fetchone()
+            conn.commit()
+
+            total_updated += updated
+            if not scanned:
+                break
+            after = last_id
+
+    return total_updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill applications.latest_* from scoring_results")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    updated = backfill_latest_scores(database_url, batch_size=args.batch_size)
+    print(f"Backfilled latest score for {updated} application(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark: one auto_assign_cases run (load / solve / commit timings).
+
+Seeds --tenants throwaway tenants, each with --analysts analysts (every
+fourth one skilled in ``high_value_loan``) and --cases pending entries due
+within the hour (every seventh requiring that skill), then runs the engine
+once over those tenants and prints the per-phase timings.
+
+Usage:
+  DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.bench_auto_assign [--tenants 5] [--analysts 200] [--cases 1000] [--keep]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import uuid
+
+import psycopg
+
+from src.tasks.auto_assign import auto_assign_cases
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _seed(cur: psycopg.Cursor, tenant_id: uuid.UUID, analysts: int, cases: int) -> None:
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Bench Tenant", f"bench-{tenant_id.hex[:8]}"),
+    )
+    cur.execute(
+        """
+        INSERT INTO users (id, tenant_id, email, role, skills)
+        SELECT gen_random_uuid(), %(tenant_id)s, 'bench-' || gen_random_uuid() || '@example.com', 'analyst',
+               CASE WHEN i %% 4 = 0 THEN ARRAY['high_value_loan'] ELSE '{}'::text[] END
+        FROM generate_series(1, %(n)s) AS i
+        """,
+        {"tenant_id": tenant_id, "n": analysts},
+    )
+    cur.execute(
+        """
+        WITH apps AS (
+          INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+          SELECT gen_random_uuid(), %(tenant_id)s, 'BENCH-' || gen_random_uuid(), 'review', '{}', '{}', '{}'
+          FROM generate_series(1, %(n)s)
+          RETURNING id
+        )
+        INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline, required_skill)
+        SELECT gen_random_uuid(), id, 1 + (random() * 99)::int, 'pending',
+               NOW() + random() * INTERVAL '1 hour',
+               CASE WHEN random() < 1.0 / 7 THEN 'high_value_loan' END
+        FROM apps
+        """,
+        {"tenant_id": tenant_id, "n": cases},
+    )
+
+
+def run(database_url: str, *, tenants: int, analysts: int, cases: int, keep: bool):
+    tenant_ids = [uuid.uuid4() for _ in range(tenants)]
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        with conn.cursor() as cur:
+            print(f"seeding {tenants} tenants x ({analysts} analysts, {cases} pending entries) ...")
+            for tenant_id in tenant_ids:
+                _seed(cur, tenant_id, analysts, cases)
+            cur.execute("ANALYZE analyst_queues")
+            cur.execute("ANALYZE users")
+        conn.commit()
+
+        results = [auto_assign_cases(conn, tenant_id=tenant_id, horizon_hours=1) for tenant_id in tenant_ids]
+
+        if not keep:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM audit_logs WHERE tenant_id = ANY(%s)", (tenant_ids,))
+                cur.execute("DELETE FROM applications WHERE tenant_id = ANY(%s)", (tenant_ids,))
+                cur.execute("DELETE FROM users WHERE tenant_id = ANY(%s)", (tenant_ids,))
+                cur.execute("DELETE FROM tenants WHERE id = ANY(%s)", (tenant_ids,))
+            conn.commit()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=5)
+    parser.add_argument("--analysts", type=int, default=200, help="analysts per tenant")
+    parser.add_argument("--cases", type=int, default=1000, help="pending entries per tenant")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded tenants")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    results = run(database_url, tenants=args.tenants, analysts=args.analysts, cases=args.cases, keep=args.keep)
+    print(f"{'cases':>7}{'analysts':>10}{'assigned':>10}{'load ms':>9}{'solve ms':>10}{'commit ms':>11}{'total ms':>10}")
+    for r in results:
+        t = r.timings_ms
+        print(
+            f"{r.cases:>7}{r.analysts:>10}{r.assigned:>10}"
+            f"{t['load']:>9.1f}{t['solve']:>10.1f}{t['commit']:>11.1f}{t['total']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
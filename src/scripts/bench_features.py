@@ -0,0 +1,79 @@
+"""Benchmark: feature extraction rows/second, per-row vs batch API.
+
+Generates N synthetic application payloads in memory (no database) and times
+FeatureExtractor.extract_one() in a loop against one
+FeatureExtractor.transform() call over the whole list.
+
+Usage:
+  python -m src.scripts.bench_features [--rows 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from src.ml.features import FeatureExtractor
+
+
+def _payloads(rows: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    contract_types = ["permanent", "fixed_term", "temporary", "self_employed", None]
+    payloads = []
+    for _ in range(rows):
+        income = rng.choice([0, rng.uniform(500, 8000)])
+        amount = rng.uniform(1000, 100000)
+        payloads.append(
+            {
+                "applicant_data": {
+                    "name": "Bench",
+                    "years_employed": rng.choice([None, rng.uniform(0, 30)]),
+                    "contract_type": rng.choice(contract_types),
+                },
+                "financial_data": {
+                    "net_monthly_income": income,
+                    "monthly_obligations": rng.uniform(0, 2000),
+                    "existing_loans_payment": rng.uniform(0, 500),
+                    "savings": rng.choice([None, rng.uniform(0, 50000)]),
+                    "existing_loans": rng.uniform(0, 20000),
+                },
+                "loan_request": {"loan_amount": amount, "estimated_payment": amount / 48},
+                "credit_bureau_data": rng.choice(
+                    [None, {"total_balance": rng.uniform(0, 5000), "total_credit_limit": rng.uniform(1000, 10000)}]
+                ),
+            }
+        )
+    return payloads
+
+
+def run(rows: int) -> tuple[float, float]:
+    payloads = _payloads(rows)
+    extractor = FeatureExtractor()
+
+    start = time.perf_counter()
+    for payload in payloads:
+        extractor.extract_one(payload, impute=True)
+    per_row = rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    extractor.transform(payloads)
+    batch = rows / (time.perf_counter() - start)
+
+    return per_row, batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    per_row, batch = run(args.rows)
+    print(f"{'mode':<10}{'rows/s':>14}")
+    print(f"{'per-row':<10}{per_row:>14,.0f}")
+    print(f"{'batch':<10}{batch:>14,.0f}")
+    print(f"speedup {batch / max(per_row, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
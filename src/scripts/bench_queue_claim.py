@@ -0,0 +1,163 @@
+"""Benchmark: concurrent queue claims (POST /api/v1/queue/claim-next path).
+
+Seeds one throwaway tenant with --analysts analysts and --entries pending
+queue entries, then, for each concurrency level, lets that many simulated
+analysts loop over claim_next_case() (completing each case right away so the
+5-active-case limit never stalls them) until the queue is drained. Prints
+claims/s, latency percentiles and collisions (entries handed to more than one
+analyst) per level; collisions must be 0 and latency should stay flat as
+concurrency grows.
+
+Usage:
+  DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.bench_queue_claim [--analysts 1,10,50] [--entries 2000] [--keep]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from collections import Counter
+
+import psycopg
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.crud.queue import claim_next_case
+from src.models.analyst_queue import AnalystQueue
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _seed(cur: psycopg.Cursor, tenant_id: uuid.UUID, analysts: int, entries: int) -> list[uuid.UUID]:
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Bench Tenant", f"bench-{tenant_id.hex[:8]}"),
+    )
+    analyst_ids = [uuid.uuid4() for _ in range(analysts)]
+    cur.executemany(
+        "INSERT INTO users (id, tenant_id, email) VALUES (%s, %s, %s)",
+        [(a, tenant_id, f"bench-{a.hex[:8]}@example.com") for a in analyst_ids],
+    )
+    _refill(cur, tenant_id, entries)
+    return analyst_ids
+
+
+def _refill(cur: psycopg.Cursor, tenant_id: uuid.UUID, entries: int) -> None:
+    cur.execute(
+        """
+        WITH apps AS (
+          INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+          SELECT gen_random_uuid(), %(tenant_id)s, 'BENCH-' || gen_random_uuid(), 'review', '{}', '{}', '{}'
+          FROM generate_series(1, %(entries)s)
+          RETURNING id
+        )
+        INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline)
+        SELECT gen_random_uuid(), id, 1 + (random() * 99)::int, 'pending', NOW() + INTERVAL '8 hours'
+        FROM apps
+        """,
+        {"tenant_id": tenant_id, "entries": entries},
+    )
+
+
+async def _run_level(database_url: str, tenant_id: uuid.UUID, analyst_ids: list[uuid.UUID]) -> dict:
+    engine = create_async_engine(database_url, pool_size=len(analyst_ids), max_overflow=0)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    latencies: list[float] = []
+    claimed: list[uuid.UUID] = []
+
+    async def analyst_loop(analyst_id: uuid.UUID) -> None:
+        while True:
+            async with sessions() as session:
+                start = time.perf_counter()
+                result = await claim_next_case(session, tenant_id=tenant_id, analyst_id=analyst_id)
+                latencies.append(time.perf_counter() - start)
+                item = result["item"]
+                if item is None:
+                    return
+                claimed.append(item.id)
+                await session.execute(
+                    update(AnalystQueue).where(AnalystQueue.id == item.id).values(status="completed")
+                )
+                await session.commit()
+
+    async def connect() -> None:
+        async with sessions() as session:
+            await session.execute(select(1))
+            await asyncio.sleep(0.1)  # hold it so every analyst gets its own connection
+
+    try:
+        # Open the pool up front so connection setup is not counted as claim latency.
+        await asyncio.gather(*(connect() for _ in analyst_ids))
+        start = time.perf_counter()
+        await asyncio.gather(*(analyst_loop(a) for a in analyst_ids))
+        elapsed = time.perf_counter() - start
+    finally:
+        await engine.dispose()
+
+    latencies.sort()
+    ms = [x * 1000 for x in latencies]
+    return {
+        "claims": len(claimed),
+        "collisions": sum(n - 1 for n in Counter(claimed).values() if n > 1),
+        "claims_per_s": len(claimed) / elapsed,
+        "p50": statistics.median(ms),
+        "p95": ms[int(0.95 * (len(ms) - 1))],
+        "p99": ms[int(0.99 * (len(ms) - 1))],
+    }
+
+
+def run(database_url: str, *, levels: list[int], entries: int, keep: bool) -> list[tuple[int, dict]]:
+    tenant_id = uuid.uuid4()
+    results = []
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        with conn.cursor() as cur:
+            print(f"seeding {max(levels)} analysts / {entries} entries for tenant {tenant_id} ...")
+            analyst_ids = _seed(cur, tenant_id, max(levels), entries)
+        conn.commit()
+
+        for i, level in enumerate(levels):
+            if i:
+                with conn.cursor() as cur:
+                    _refill(cur, tenant_id, entries)
+                conn.commit()
+            results.append((level, asyncio.run(_run_level(database_url, tenant_id, analyst_ids[:level]))))
+
+        if not keep:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM audit_logs WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM applications WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM users WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM tenants WHERE id = %s", (tenant_id,))
+            conn.commit()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analysts", default="1,10,50", help="comma-separated concurrency levels")
+    parser.add_argument("--entries", type=int, default=2000, help="pending entries per level")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded tenant")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    levels = [int(x) for x in args.analysts.split(",")]
+    results = run(database_url, levels=levels, entries=args.entries, keep=args.keep)
+    print(f"{'analysts':>9}{'claims':>8}{'collisions':>12}{'claims/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for level, r in results:
+        print(
+            f"{level:>9}{r['claims']:>8}{r['collisions']:>12}{r['claims_per_s']:>10.1f}"
+            f"{r['p50']:>9.2f}{r['p95']:>9.2f}{r['p99']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark: scoring throughput, one application per call vs micro-batches.
+
+Seeds one throwaway tenant (with an active threshold) and N pending
+applications, then scores half of them one id per score_applications() call
+(the per-message path) and the other half in batches of --batch-size, and
+prints scores/second for each.
+
+Usage:
+  DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.bench_scoring [--rows 2000] [--batch-size 50] [--keep]
+
+The target from hitl/todo.md is 50 scores/s sustained on a single worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import psycopg
+
+from src.tasks.batch_scoring import score_applications
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _seed(cur: psycopg.Cursor, tenant_id: uuid.UUID, rows: int) -> list[uuid.UUID]:
+    user_id = uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Bench Tenant", f"bench-{tenant_id.hex[:8]}"),
+    )
+    cur.execute(
+        "INSERT INTO users (id, tenant_id, email) VALUES (%s, %s, %s)",
+        (user_id, tenant_id, f"bench-{user_id.hex[:8]}@example.com"),
+    )
+    cur.execute(
+        """
+        INSERT INTO decision_thresholds (
+          id, tenant_id, name, auto_approve_min, auto_decline_max, is_active, effective_from, created_by
+        ) VALUES (%s, %s, 'Bench', 700, 500, true, %s, %s)
+        """,
+        (uuid.uuid4(), tenant_id, datetime.now(timezone.utc) - timedelta(days=1), user_id),
+    )
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, applicant_data, financial_data, loan_request)
+        SELECT
+          gen_random_uuid(),
+          %(tenant_id)s,
+          'BENCH-' || lpad(g::text, 8, '0'),
+          jsonb_build_object('name', 'Bench ' || g),
+          jsonb_build_object(
+            'net_monthly_income', 800 + g %% 4000,
+            'monthly_obligations', g %% 900,
+            'existing_loans_payment', g %% 300
+          ),
+          jsonb_build_object('loan_amount', 1000 + g %% 50000, 'estimated_payment', 50 + g %% 900)
+        FROM generate_series(1, %(rows)s) AS g
+        RETURNING id
+        """,
+        {"tenant_id": tenant_id, "rows": rows},
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def _throughput(conn: psycopg.Connection, ids: list[uuid.UUID], batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(ids), batch_size):
+        score_applications(conn, ids[i : i + batch_size])
+    return len(ids) / (time.perf_counter() - start)
+
+
+def run(database_url: str, *, rows: int, batch_size: int, keep: bool) -> tuple[float, float]:
+    tenant_id = uuid.uuid4()
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        with conn.cursor() as cur:
+            print(f"seeding {rows} applications for tenant {tenant_id} ...")
+            ids = _seed(cur, tenant_id, rows)
+        conn.commit()
+
+        half = len(ids) // 2
+        single = _throughput(conn, ids[:half], 1)
+        batched = _throughput(conn, ids[half:], batch_size)
+
+        if not keep:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM audit_logs WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM applications WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM decision_thresholds WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM users WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM tenants WHERE id = %s", (tenant_id,))
+            conn.commit()
+
+    return single, batched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded tenant")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    single, batched = run(database_url, rows=args.rows, batch_size=args.batch_size, keep=args.keep)
+    print(f"{'mode':<14}{'scores/s':>12}")
+    print(f"{'per-item':<14}{single:>12.1f}")
+    print(f"{f'batch={args.batch_size}':<14}{batched:>12.1f}")
+    print(f"speedup {batched / max(single, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark: applications search, legacy ILIKE vs search_vector / prefix index.
+
+Seeds one throwaway tenant with N applications (default 1,000,000) directly in
+SQL, runs each query shape a few times and prints median latency.
+
+Usage:
+  DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.bench_search [--rows 1000000] [--repeat 5] [--keep]
+
+Sync psycopg like the other scripts; the tenant is deleted afterwards unless --keep.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+import uuid
+
+import psycopg
+
+from src.crud.search import build_tsquery
+
+_NAMES = ["Đorđe Petrović", "Marko Marković", "Ana Jovanović", "Milica Nikolić", "Nemanja Ilić", "Jelena Đukić"]
+
+_LEGACY_SQL = """
+SELECT id FROM applications
+WHERE tenant_id = %(tenant_id)s
+  AND (external_id ILIKE %(like)s OR applicant_data->>'name' ILIKE %(like)s)
+ORDER BY created_at DESC
+LIMIT 20
+"""
+
+_FTS_SQL = """
+SELECT id FROM applications
+WHERE tenant_id = %(tenant_id)s
+  AND search_vector @@ to_tsquery('simple', hitl_search_fold(%(tsquery)s))
+ORDER BY created_at DESC
+LIMIT 20
+"""
+
+_PREFIX_SQL = """
+SELECT id FROM applications
+WHERE tenant_id = %(tenant_id)s
+  AND lower(external_id) LIKE %(prefix)s
+ORDER BY created_at DESC
+LIMIT 20
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _seed(cur: psycopg.Cursor, tenant_id: uuid.UUID, rows: int) -> None:
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Bench Tenant", f"bench-{tenant_id.hex[:8]}"),
+    )
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, applicant_data, financial_data, loan_request)
+        SELECT
+          gen_random_uuid(),
+          %(tenant_id)s,
+          'BENCH-' || lpad(g::text, 8, '0'),
+          jsonb_build_object('name', (%(names)s::text[])[1 + g %% %(n_names)s] || ' ' || g),
+          '{}'::jsonb,
+          jsonb_build_object('loan_amount', 1000 + g %% 100000)
+        FROM generate_series(1, %(rows)s) AS g
+        """,
+        {"tenant_id": tenant_id, "names": _NAMES, "n_names": len(_NAMES), "rows": rows},
+    )
+    cur.execute("ANALYZE applications")
+
+
+def _time(cur: psycopg.Cursor, sql: str, params: dict, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(sql, params)
+        cur.fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(database_url: str, *, rows: int, repeat: int, keep: bool) -> list[tuple[str, float, float]]:
+    tenant_id = uuid.uuid4()
+    results: list[tuple[str, float, float]] = []
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        with conn.cursor() as cur:
+            print(f"seeding {rows} applications for tenant {tenant_id} ...")
+            _seed(cur, tenant_id, rows)
+            conn.commit()
+
+            cases = [
+                ("name", "petrovic"),
+                ("name (rare)", f"jelena dukic {rows - 7}"),
+                ("external_id", f"BENCH-{rows // 2:08d}"),
+            ]
+            for label, term in cases:
+                legacy = _time(cur, _LEGACY_SQL, {"tenant_id": tenant_id, "like": f"%{term}%"}, repeat)
+                if label == "external_id":
+                    new = _time(cur, _PREFIX_SQL, {"tenant_id": tenant_id, "prefix": term.lower() + "%"}, repeat)
+                else:
+                    new = _time(cur, _FTS_SQL, {"tenant_id": tenant_id, "tsquery": build_tsquery(term)}, repeat)
+                results.append((label, legacy, new))
+
+            if not keep:
+                cur.execute("DELETE FROM applications WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM tenants WHERE id = %s", (tenant_id,))
+                conn.commit()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded tenant")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    results = run(database_url, rows=args.rows, repeat=args.repeat, keep=args.keep)
+    print(f"{'query':<14}{'legacy ms':>12}{'new ms':>12}{'speedup':>10}")
+    for label, legacy, new in results:
+        print(f"{label:<14}{legacy:>12.2f}{new:>12.2f}{legacy / max(new, 1e-6):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: set-based SLA sweep (check_sla_status) against a large open queue.
+
+Seeds one throwaway tenant with --open open queue entries whose deadlines are
+far in the future, times an idle sweep, then for each --due level inserts that
+many already-overdue entries and times the sweep that flags and notifies them.
+Sweep time should track the number of rows changing state, not the size of
+the open queue.
+
+Usage:
+  DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.bench_sla_sweep [--open 100000] [--due 100,1000,10000] [--keep]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import uuid
+
+import psycopg
+
+from src.tasks.sla import sweep_sla
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _insert_entries(cur: psycopg.Cursor, tenant_id: uuid.UUID, n: int, sla: str) -> None:
+    cur.execute(
+        """
+        WITH apps AS (
+          INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+          SELECT gen_random_uuid(), %(tenant_id)s, 'BENCH-' || gen_random_uuid(), 'review', '{}', '{}', '{}'
+          FROM generate_series(1, %(n)s)
+          RETURNING id
+        )
+        INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline)
+        SELECT gen_random_uuid(), id, 1 + (random() * 99)::int, 'pending', NOW() + %(sla)s::interval
+        FROM apps
+        """,
+        {"tenant_id": tenant_id, "n": n, "sla": sla},
+    )
+
+
+def run(database_url: str, *, open_entries: int, levels: list[int], keep: bool) -> list[tuple[str, dict]]:
+    tenant_id = uuid.uuid4()
+    results = []
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        with conn.cursor() as cur:
+            print(f"seeding {open_entries} open entries for tenant {tenant_id} ...")
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Bench Tenant", f"bench-{tenant_id.hex[:8]}"),
+            )
+            _insert_entries(cur, tenant_id, open_entries, "30 days")
+        conn.commit()
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE analyst_queues")
+        conn.commit()
+
+        # Drain whatever else is due in this database so the timings are ours.
+        sweep_sla(conn)
+        results.append(("idle", sweep_sla(conn)))
+        for n in levels:
+            with conn.cursor() as cur:
+                _insert_entries(cur, tenant_id, n, "-1 minute")
+            conn.commit()
+            results.append((str(n), sweep_sla(conn)))
+
+        if not keep:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM notifications WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM applications WHERE tenant_id = %s", (tenant_id,))
+                cur.execute("DELETE FROM tenants WHERE id = %s", (tenant_id,))
+            conn.commit()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--open", type=int, default=100_000, dest="open_entries", help="open entries not yet due")
+    parser.add_argument("--due", default="100,1000,10000", help="comma-separated overdue batch sizes")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded tenant")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    levels = [int(x) for x in args.due.split(",")]
+    results = run(database_url, open_entries=args.open_entries, levels=levels, keep=args.keep)
+    print(f"{'due':>7}{'breached':>10}{'warned':>8}{'sweep ms':>10}{'us/row':>8}")
+    for label, r in results:
+        per_row = r["duration_ms"] * 1000 / r["breached"] if r["breached"] else 0.0
+        print(f"{label:>7}{r['breached']:>10}{r['warned']:>8}{r['duration_ms']:>10.1f}{per_row:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""What-if: how candidate decision thresholds would have split a tenant's history.
+
+Streams the tenant's scored applications (latest score, latest outcome) once
+and evaluates every (auto_approve_min, auto_decline_max) combination of the
+given ranges in one vectorized pass (src/ml/simulation.py). Rules default to
+the active threshold's.
+
+Usage:
+  DATABASE_URL=... python -m src.scripts.simulate_thresholds --tenant-id <uuid> \\
+      [--approve 650:800:10] [--decline 450:650:10] [--rules '{"max_loan_amount_auto": 50000}'] \\
+      [--from 2026-01-01] [--to 2026-07-01] [--curve] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import uuid
+from datetime import datetime
+
+from src.ml.simulation import MAX_CANDIDATES, candidate_grid, run_simulation
+
+
+def _score_range(value: str) -> range:
+    start, stop, *step = (int(v) for v in value.split(":"))
+    return range(start, stop + 1, step[0] if step else 10)
+
+
+def _pct(value: float | None) -> str:
+    return "-" if value is None else f"{value * 100:.2f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenant-id", type=uuid.UUID, required=True)
+    parser.add_argument("--approve", type=_score_range, default=_score_range("650:800:10"), help="start:stop[:step]")
+    parser.add_argument("--decline", type=_score_range, default=_score_range("450:650:10"), help="start:stop[:step]")
+    parser.add_argument("--rules", type=json.loads, default=None, help="JSON rules (default: active threshold's)")
+    parser.add_argument("--from", dest="scored_from", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--to", dest="scored_to", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--curve", action="store_true", help="also print the approve-cutoff loss curve")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    candidates = candidate_grid(args.approve, args.decline)
+    if not candidates or len(candidates) > MAX_CANDIDATES:
+        raise SystemExit(f"need 1..{MAX_CANDIDATES} valid (approve, decline) pairs, got {len(candidates)}")
+
+    r = run_simulation(
+        database_url,
+        args.tenant_id,
+        candidates,
+        rules=args.rules,
+        scored_from=args.scored_from,
+        scored_to=args.scored_to,
+    )
+    if args.json:
+        print(json.dumps(r, indent=2, default=str))
+        return
+
+    print(f"rows={r['rows']} forced_review={r['forced_review']} load_ms={r['load_ms']:.1f} eval_ms={r['eval_ms']:.1f}")
+    print(f"{'approve':>8}{'decline':>8}{'auto_appr':>10}{'queue':>10}{'auto_decl':>10}{'appr_dr':>10}{'appr_pd':>10}{'appr_loss':>14}")
+    for c in r["candidates"]:
+        print(
+            f"{c['auto_approve_min']:>8}{c['auto_decline_max']:>8}{_pct(c['approve_rate']):>10}"
+            f"{_pct(c['queue_rate']):>10}{_pct(c['decline_rate']):>10}{_pct(c['approved_default_rate']):>10}"
+            f"{_pct(c['approved_expected_default_rate']):>10}{c['approved_loss']:>14,.2f}"
+        )
+    if args.curve:
+        print(f"\n{'cutoff':>8}{'approve':>10}{'dr':>10}{'pd':>10}{'loss':>14}")
+        for p in r["curve"]:
+            print(
+                f"{p['auto_approve_min']:>8}{_pct(p['approve_rate']):>10}{_pct(p['default_rate']):>10}"
+                f"{_pct(p['expected_default_rate']):>10}{p['loss']:>14,.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
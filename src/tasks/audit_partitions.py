@@ -0,0 +1,293 @@
+"""Partition maintenance for audit_logs (monthly range partitions, migration 020).
+
+Each run, in one short transaction per step:
+
+  - creates the partitions for the current month and the next
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD (default 3) months, so inserts never
+    fall into ``audit_logs_default``. Rows that did land there (e.g. a clock
+    far ahead) are moved when their month is created;
+  - with AUDIT_LOG_RETENTION_MONTHS set, drops every partition that ends
+    before the start of the month that many months back. Retention is a
+    ``DROP TABLE`` per month, not a bulk DELETE; unset keeps everything;
+  - creates (AUDIT_LOG_BRIN=1) or drops (unset / 0) ``idx_audit_created_brin``,
+    a BRIN index on ``created_at`` for time-range scans across tenants. It
+    is a few pages per partition because rows arrive in time order.
+
+Every step needs a strong lock on audit_logs. A lock request queued behind a
+long transaction would block every audit insert behind it, so each step runs
+with ``lock_timeout`` (AUDIT_LOG_LOCK_TIMEOUT_MS, default 2000) and is retried
+a few times with backoff instead.
+
+A plain ``CREATE INDEX`` on the parent would hold a SHARE lock on every
+partition for the whole build and block inserts meanwhile. The BRIN index is
+therefore built with ``CREATE INDEX CONCURRENTLY`` on each partition, then
+created ``ON ONLY audit_logs`` and the partition indexes are attached to it.
+The attach step only holds locks briefly. Partitions created later get the
+index automatically.
+
+Usage:
+  DATABASE_URL=... python -m src.tasks.audit_partitions
+
+Also scheduled by celery beat (``maintain_audit_partitions``, daily).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, TypeVar
+
+import psycopg
+from psycopg import sql
+
+logger = logging.getLogger("hitl.tasks")
+
+T = TypeVar("T")
+
+# Month arithmetic on the UTC wall-clock timestamp, then back to timestamptz:
+# independent of the session time zone.
+_RETENTION_CUTOFF_SQL = """
+SELECT (date_trunc('month', NOW() AT TIME ZONE 'UTC') - %(months)s * INTERVAL '1 month') AT TIME ZONE 'UTC'
+"""
+
+
+# Partitions of audit_logs and whether each already has an index attached to
+# idx_audit_created_brin (false for all while the parent index is missing).
+_BRIN_PARTITIONS_SQL = """
+SELECT c.relname,
+       EXISTS (
+           SELECT 1
+           FROM pg_index x
+           JOIN pg_inherits xi ON xi.inhrelid = x.indexrelid
+           WHERE x.indrelid = c.oid AND xi.inhparent = to_regclass('idx_audit_created_brin')
+       )
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'audit_logs'::regclass
+ORDER BY c.relname
+"""
+
+# NULL when the index does not exist.
+_INDEX_VALID_SQL = """
+SELECT x.indisvalid FROM pg_index x WHERE x.indexrelid = to_regclass(%s)
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def months_ahead() -> int:
+    return int(os.getenv("AUDIT_LOG_PARTITION_MONTHS_AHEAD", "3"))
+
+
+def retention_months() -> int | None:
+    value = os.getenv("AUDIT_LOG_RETENTION_MONTHS")
+    return int(value) if value else None
+
+
+def brin_enabled() -> bool:
+    return os.getenv("AUDIT_LOG_BRIN", "0") == "1"
+
+
+def lock_timeout_ms() -> int:
+    return int(os.getenv("AUDIT_LOG_LOCK_TIMEOUT_MS", "2000"))
+
+
+def retention_cutoff(conn: psycopg.Connection, months: int) -> datetime:
+    """Start of the UTC month ``months`` months before the current one."""
+
+    with conn.cursor() as cur:
+        cur.execute(_RETENTION_CUTOFF_SQL, {"months": months})
+        (cutoff,) = cur.fetchone()
+    conn.commit()
+    return cutoff
+
+
+def _with_lock_timeout(
+    conn: psycopg.Connection,
+    step: Callable[[psycopg.Cursor], T],
+    *,
+    lock_timeout_ms: int,
+    attempts: int,
+    retry_seconds: float,
+) -> T:
+    """Run ``step`` in its own transaction under ``lock_timeout``; retry on lock timeouts."""
+
+    attempt = 1
+    while True:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT set_config('lock_timeout', %s, true)", (f"{lock_timeout_ms}ms",))
+                result = step(cur)
+            conn.commit()
+            return result
+        except psycopg.errors.LockNotAvailable:
+            conn.rollback()
+            if attempt >= attempts:
+                raise
+            logger.warning("audit partitions: lock timeout (attempt %d/%d); retrying", attempt, attempts)
+            time.sleep(retry_seconds * attempt)
+            attempt += 1
+
+
+def _create_index_concurrently(
+    conn: psycopg.Connection,
+    name: str,
+    table: str,
+    *,
+    lock_timeout_ms: int,
+    attempts: int,
+    retry_seconds: float,
+) -> None:
+    """``CREATE INDEX CONCURRENTLY`` a BRIN index on ``created_at`` of ``table``.
+
+    Runs outside a transaction (autocommit) under ``lock_timeout`` and retries on
+    lock timeouts. A build that timed out leaves an invalid index, which is
+    dropped before the next try.
+    """
+
+    index = sql.Identifier(name)
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        conn.execute(sql.SQL("SET lock_timeout = {}").format(sql.Literal(f"{lock_timeout_ms}ms")))
+        attempt = 1
+        while True:
+            try:
+                (valid,) = conn.execute(_INDEX_VALID_SQL, (name,)).fetchone() or (None,)
+                if valid is False:
+                    conn.execute(sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(index))
+                conn.execute(
+                    sql.SQL("CREATE INDEX CONCURRENTLY IF NOT EXISTS {} ON {} USING brin (created_at)").format(
+                        index, sql.Identifier(table)
+                    )
+                )
+                return
+            except psycopg.errors.LockNotAvailable:
+                if attempt >= attempts:
+                    raise
+                logger.warning(
+                    "audit partitions: lock timeout building %s (attempt %d/%d); retrying", name, attempt, attempts
+                )
+                time.sleep(retry_seconds * attempt)
+                attempt += 1
+    finally:
+        conn.execute("RESET lock_timeout")
+        conn.autocommit = autocommit
+
+
+def _sync_brin_index(
+    conn: psycopg.Connection,
+    *,
+    lock_timeout_ms: int,
+    attempts: int,
+    retry_seconds: float,
+) -> None:
+    """Build idx_audit_created_brin without blocking inserts (see module docstring)."""
+
+    retry = {"lock_timeout_ms": lock_timeout_ms, "attempts": attempts, "retry_seconds": retry_seconds}
+
+    with conn.cursor() as cur:
+        cur.execute(_INDEX_VALID_SQL, ("idx_audit_created_brin",))
+        (valid,) = cur.fetchone() or (None,)
+        cur.execute(_BRIN_PARTITIONS_SQL)
+        missing = [name for name, attached in cur.fetchall() if not attached]
+    conn.commit()
+    if valid:
+        return
+
+    for partition in missing:
+        _create_index_concurrently(conn, f"{partition}_created_brin", partition, **retry)
+
+    def attach(cur: psycopg.Cursor) -> None:
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_created_brin ON ONLY audit_logs USING brin (created_at)")
+        cur.execute(_BRIN_PARTITIONS_SQL)
+        for partition, attached in cur.fetchall():
+            if attached:
+                continue
+            # A partition created since the builds above has no index yet; the
+            # parent stays invalid until the next run builds and attaches it.
+            cur.execute(_INDEX_VALID_SQL, (f"{partition}_created_brin",))
+            if cur.fetchone() is None:
+                logger.warning("audit partitions: %s has no BRIN index yet", partition)
+                continue
+            cur.execute(
+                sql.SQL("ALTER INDEX idx_audit_created_brin ATTACH PARTITION {}").format(
+                    sql.Identifier(f"{partition}_created_brin")
+                )
+            )
+
+    _with_lock_timeout(conn, attach, **retry)
+
+
+def maintain_audit_partitions(
+    conn: psycopg.Connection,
+    *,
+    months_ahead: int = 3,
+    retention_months: int | None = None,
+    brin: bool = False,
+    lock_timeout_ms: int = 2000,
+    attempts: int = 5,
+    retry_seconds: float = 1.0,
+) -> dict:
+    """Create upcoming partitions, apply retention, sync the BRIN index.
+
+    Returns {created: [...], dropped: [...]} partition names. Raises
+    ``psycopg.errors.LockNotAvailable`` when a step still cannot get its
+    locks after ``attempts`` tries.
+    """
+
+    def run(step: Callable[[psycopg.Cursor], T]) -> T:
+        return _with_lock_timeout(
+            conn, step, lock_timeout_ms=lock_timeout_ms, attempts=attempts, retry_seconds=retry_seconds
+        )
+
+    def ensure(cur: psycopg.Cursor) -> list[str]:
+        cur.execute("SELECT ensure_audit_log_partitions(%s)", (months_ahead,))
+        return [name for (name,) in cur.fetchall()]
+
+    created = run(ensure)
+
+    dropped: list[str] = []
+    if retention_months is not None:
+        cutoff = retention_cutoff(conn, retention_months)
+
+        def drop(cur: psycopg.Cursor) -> list[str]:
+            cur.execute("SELECT drop_audit_log_partitions(%s)", (cutoff,))
+            return [name for (name,) in cur.fetchall()]
+
+        dropped = run(drop)
+
+    if brin:
+        _sync_brin_index(conn, lock_timeout_ms=lock_timeout_ms, attempts=attempts, retry_seconds=retry_seconds)
+    else:
+        # Drops the partitions' attached indexes with it.
+        run(lambda cur: cur.execute("DROP INDEX IF EXISTS idx_audit_created_brin"))
+
+    logger.info("audit partitions created=%s dropped=%s brin=%s", created, dropped, brin)
+    return {"created": created, "dropped": dropped}
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        result = maintain_audit_partitions(
+            conn,
+            months_ahead=months_ahead(),
+            retention_months=retention_months(),
+            brin=brin_enabled(),
+            lock_timeout_ms=lock_timeout_ms(),
+        )
+    print(f"created={result['created']} dropped={result['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Auto-assignment engine (TODO-2.2.2: auto_assign_cases).
+
+Every AUTO_ASSIGN_SECONDS (celery beat) pending queue entries whose SLA
+deadline falls within AUTO_ASSIGN_SLA_HOURS are handed to analysts with spare
+capacity. A run is:
+
+  1. load: two queries. First the due pending entries in priority / deadline
+     order (idx_queue_pending_sla), then the active analysts of those tenants
+     with fewer than MAX_ACTIVE_CASES active cases (idx_queue_analyst_active);
+  2. solve, in memory (:func:`plan_assignments`): per tenant and skill, a heap
+     of analysts keyed by current load. Entries are taken in priority order
+     and each goes to the least-loaded eligible analyst. An entry's
+     ``required_skill`` must be in the analyst's ``skills``; entries without
+     one can go to anyone. Tenants never mix;
+  3. commit, in one transaction: lock the chosen analysts' users rows (the
+     same lock as claim-next, in id order), re-count their active cases and
+     drop assignments over the limit. Then write every assignment with one
+     ``UPDATE ... FROM unnest(...)``, guarded by ``status = 'pending'`` and the
+     row ``version`` read in step 1 (migration 018). An entry that changed in
+     between (claimed, re-prioritized, ...) is skipped, not overwritten. The
+     same statement inserts an audit row for each assignment that landed.
+
+Returns counts plus per-phase timings (``timings_ms``), which are also logged.
+
+Usage:
+  DATABASE_URL=... python -m src.tasks.auto_assign
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import psycopg
+
+from src.crud.queue import MAX_ACTIVE_CASES
+
+logger = logging.getLogger("hitl.tasks")
+
+ASSIGNABLE_ROLES = ("analyst", "senior_analyst")
+
+_CASES_SQL = """
+SELECT id, tenant_id, application_id, priority, sla_deadline, required_skill, version
+FROM analyst_queues
+WHERE status = 'pending'
+  AND sla_deadline <= NOW() + %(horizon_hours)s * INTERVAL '1 hour'
+  AND (%(tenant_id)s::uuid IS NULL OR tenant_id = %(tenant_id)s::uuid)
+ORDER BY priority, sla_deadline, id
+LIMIT %(max_cases)s
+"""
+
+_ANALYSTS_SQL = """
+SELECT u.id, u.tenant_id, u.skills, count(q.id)
+FROM users u
+LEFT JOIN analyst_queues q
+  ON q.analyst_id = u.id AND q.status IN ('assigned', 'in_progress')
+WHERE u.tenant_id = ANY(%(tenant_ids)s::uuid[])
+  AND u.is_active
+  AND u.role = ANY(%(roles)s::text[])
+GROUP BY u.id
+HAVING count(q.id) < %(max_active)s
+"""
+
+_LOCK_ANALYSTS_SQL = """
+SELECT id FROM users
+WHERE id = ANY(%(ids)s::uuid[])
+ORDER BY id
+FOR NO KEY UPDATE
+"""
+
+_ACTIVE_COUNTS_SQL = """
+SELECT analyst_id, count(*)
+FROM analyst_queues
+WHERE analyst_id = ANY(%(ids)s::uuid[]) AND status IN ('assigned', 'in_progress')
+GROUP BY analyst_id
+"""
+
+_ASSIGN_SQL = """
+WITH assigned AS (
+  UPDATE analyst_queues q
+  SET analyst_id = v.analyst_id, status = 'assigned', assigned_at = NOW()
+  FROM unnest(%(ids)s::uuid[], %(analyst_ids)s::uuid[], %(versions)s::int[]) AS v(id, analyst_id, version)
+  WHERE q.id = v.id
+    AND q.status = 'pending'
+    AND q.version = v.version
+  RETURNING q.id, q.tenant_id, q.application_id, q.analyst_id
+)
+INSERT INTO audit_logs (id, tenant_id, user_id, entity_type, entity_id, action, old_value, new_value, change_summary)
+SELECT gen_random_uuid(), tenant_id, NULL, 'analyst_queue', id, 'assign',
+       jsonb_build_object('status', 'pending'),
+       jsonb_build_object('status', 'assigned', 'analyst_id', analyst_id, 'application_id', application_id),
+       'queue entry auto-assigned'
+FROM assigned
+"""
+
+
+@dataclass(frozen=True)
+class PendingCase:
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    application_id: uuid.UUID
+    priority: int
+    sla_deadline: datetime
+    required_skill: str | None
+    version: int
+
+
+@dataclass(frozen=True)
+class Analyst:
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    skills: tuple[str, ...] = ()
+    active_cases: int = 0
+
+
+@dataclass(frozen=True)
+class Assignment:
+    case: PendingCase
+    analyst_id: uuid.UUID
+
+
+@dataclass
+class AutoAssignResult:
+    cases: int = 0
+    analysts: int = 0
+    assigned: int = 0
+    unassigned: int = 0
+    # Planned, then dropped: entry changed since loading / analyst filled up meanwhile.
+    version_conflicts: int = 0
+    capacity_conflicts: int = 0
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def plan_assignments(
+    cases: list[PendingCase],
+    analysts: list[Analyst],
+    *,
+    max_active: int = MAX_ACTIVE_CASES,
+) -> list[Assignment]:
+    """Assign ``cases`` (taken in list order) to the least-loaded eligible analyst.
+
+    One min-heap of (load, analyst_id) per (tenant, skill) plus one per tenant
+    for entries without a required skill. A load change pushes fresh heap
+    items; outdated ones are skipped when they surface.
+    """
+
+    load: dict[uuid.UUID, int] = {}
+    pools: dict[tuple[uuid.UUID, str | None], list[tuple[int, uuid.UUID]]] = {}
+    memberships: dict[uuid.UUID, list[list[tuple[int, uuid.UUID]]]] = {}
+    for analyst in analysts:
+        if analyst.active_cases >= max_active:
+            continue
+        load[analyst.id] = analyst.active_cases
+        keys = [(analyst.tenant_id, None)] + [(analyst.tenant_id, skill) for skill in analyst.skills]
+        memberships[analyst.id] = [pools.setdefault(key, []) for key in keys]
+        for pool in memberships[analyst.id]:
+            pool.append((analyst.active_cases, analyst.id))
+    for pool in pools.values():
+        heapq.heapify(pool)
+
+    assignments = []
+    for case in cases:
+        pool = pools.get((case.tenant_id, case.required_skill))
+        while pool and pool[0][0] != load[pool[0][1]]:
+            heapq.heappop(pool)
+        if not pool:
+            continue
+        _, analyst_id = heapq.heappop(pool)
+        assignments.append(Assignment(case, analyst_id))
+        load[analyst_id] += 1
+        if load[analyst_id] < max_active:
+            for member_pool in memberships[analyst_id]:
+                heapq.heappush(member_pool, (load[analyst_id], analyst_id))
+    return assignments
+
+
+def _load(
+    conn: psycopg.Connection,
+    *,
+    tenant_id: uuid.UUID | None,
+    horizon_hours: float,
+    max_cases: int,
+    max_active: int,
+) -> tuple[list[PendingCase], list[Analyst]]:
+    with conn.cursor() as cur:
+        cur.execute(_CASES_SQL, {"horizon_hours": horizon_hours, "tenant_id": tenant_id, "max_cases": max_cases})
+        cases = [PendingCase(*row) for row in cur.fetchall()]
+        if not cases:
+            return cases, []
+        cur.execute(
+            _ANALYSTS_SQL,
+            {
+                "tenant_ids": list({c.tenant_id for c in cases}),
+                "roles": list(ASSIGNABLE_ROLES),
+                "max_active": max_active,
+            },
+        )
+        analysts = [Analyst(a_id, a_tenant, tuple(skills or ()), int(n)) for a_id, a_tenant, skills, n in cur.fetchall()]
+    return cases, analysts
+
+
+def _commit(
+    conn: psycopg.Connection,
+    assignments: list[Assignment],
+    *,
+    max_active: int,
+    result: AutoAssignResult,
+) -> None:
+    analyst_ids = sorted({a.analyst_id for a in assignments})
+    with conn.cursor() as cur:
+        cur.execute(_LOCK_ANALYSTS_SQL, {"ids": analyst_ids})
+        cur.execute(_ACTIVE_COUNTS_SQL, {"ids": analyst_ids})
+        active = dict(cur.fetchall())
+
+        # Claims made since loading count against the limit; assignments are
+        # in priority order, so the least urgent ones are dropped.
+        accepted = []
+        for a in assignments:
+            if active.get(a.analyst_id, 0) < max_active:
+                active[a.analyst_id] = active.get(a.analyst_id, 0) + 1
+                accepted.append(a)
+        result.capacity_conflicts = len(assignments) - len(accepted)
+
+        cur.execute(
+            _ASSIGN_SQL,
+            {
+                "ids": [a.case.id for a in accepted],
+                "analyst_ids": [a.analyst_id for a in accepted],
+                "versions": [a.case.version for a in accepted],
+            },
+        )
+        result.assigned = cur.rowcount  # one audit row per assignment that landed
+        result.version_conflicts = len(accepted) - result.assigned
+    conn.commit()
+
+
+def auto_assign_cases(
+    conn: psycopg.Connection,
+    *,
+    tenant_id: uuid.UUID | None = None,
+    horizon_hours: float = 4.0,
+    max_cases: int = 10_000,
+    max_active: int = MAX_ACTIVE_CASES,
+) -> AutoAssignResult:
+    """Run one load / solve / commit cycle (all tenants, or just ``tenant_id``)."""
+
+    result = AutoAssignResult()
+    t0 = time.perf_counter()
+    cases, analysts = _load(
+        conn, tenant_id=tenant_id, horizon_hours=horizon_hours, max_cases=max_cases, max_active=max_active
+    )
+    conn.commit()
+    t1 = time.perf_counter()
+    assignments = plan_assignments(cases, analysts, max_active=max_active)
+    t2 = time.perf_counter()
+    if assignments:
+        _commit(conn, assignments, max_active=max_active, result=result)
+    t3 = time.perf_counter()
+
+    result.cases = len(cases)
+    result.analysts = len(analysts)
+    result.unassigned = len(cases) - len(assignments)
+    result.timings_ms = {
+        "load": (t1 - t0) * 1000,
+        "solve": (t2 - t1) * 1000,
+        "commit": (t3 - t2) * 1000,
+        "total": (t3 - t0) * 1000,
+    }
+    logger.info(
+        "auto-assign cases=%d analysts=%d assigned=%d unassigned=%d version_conflicts=%d "
+        "capacity_conflicts=%d load_ms=%.1f solve_ms=%.1f commit_ms=%.1f total_ms=%.1f",
+        result.cases,
+        result.analysts,
+        result.assigned,
+        result.unassigned,
+        result.version_conflicts,
+        result.capacity_conflicts,
+        result.timings_ms["load"],
+        result.timings_ms["solve"],
+        result.timings_ms["commit"],
+        result.timings_ms["total"],
+    )
+    return result
+
+
+def horizon_hours() -> float:
+    return float(os.getenv("AUTO_ASSIGN_SLA_HOURS", "4"))
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        result = auto_assign_cases(conn, horizon_hours=horizon_hours())
+    timings = " ".join(f"{k}_ms={v:.1f}" for k, v in result.timings_ms.items())
+    print(f"cases={result.cases} analysts={result.analysts} assigned={result.assigned} {timings}")
+
+
+if __name__ == "__main__":
+    main()
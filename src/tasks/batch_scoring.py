@@ -0,0 +1,370 @@
+"""Micro-batched application scoring (TODO-2.4.2).
+
+Scoring one application at a time costs a handful of round trips plus a model
+call per message. Instead, each ``score_application`` task hands its id to a
+process-wide :class:`MicroBatcher`, which flushes up to SCORING_BATCH_SIZE ids
+(or whatever arrived within SCORING_BATCH_WAIT_MS) into one
+:func:`score_applications` call:
+
+  - one ``WHERE id = ANY(...)`` load of the pending applications (row-locked,
+    SKIP LOCKED, so duplicate deliveries are harmless);
+  - active thresholds from the per-process cache (src.ml.thresholds; one
+    get_active_threshold() statement for the tenants it misses);
+  - one feature matrix (src.ml.features) and one model call for the whole batch;
+  - routing per tenant with the threshold's compiled router (src.ml.routing);
+  - pipelined multi-row writes: scoring_results, decisions (auto routes),
+    analyst_queues (human_review), audit_logs, and one status UPDATE;
+  - one commit.
+
+Each task blocks until its batch is done, so acks_late/retry semantics are
+unchanged. A batch that fails is rescored one id at a time, so one bad
+application fails (and retries) alone instead of with its batch.
+
+Batches only form when the worker runs tasks concurrently
+(``celery worker --pool threads --concurrency <SCORING_BATCH_SIZE>``).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Generic, TypeVar
+
+import numpy as np
+import psycopg
+from psycopg.types.json import Jsonb
+
+from src.ml.explain import get_explanation_cache
+from src.ml.features import FeatureExtractor
+from src.ml.routing import get_router
+from src.ml.scoring import get_scoring_model
+from src.ml.thresholds import get_threshold_cache
+
+logger = logging.getLogger("hitl.tasks")
+
+K = TypeVar("K")
+R = TypeVar("R")
+
+# Default SLA for human review (TODO-2.2.1).
+SLA_HOURS = 8
+
+_DECISION_OUTCOMES = {"auto_approve": "approved", "auto_decline": "declined"}
+_APPLICATION_STATUS = {"auto_approve": "approved", "auto_decline": "declined", "human_review": "review"}
+
+_LOAD_SQL = """
+SELECT id, tenant_id, applicant_data, financial_data, loan_request, credit_bureau_data, loan_amount
+FROM applications
+WHERE id = ANY(%(ids)s) AND status = 'pending'
+FOR UPDATE SKIP LOCKED
+"""
+
+_INSERT_SCORING_SQL = """
+INSERT INTO scoring_results (
+  id, application_id, model_id, model_version,
+  score, probability_default, risk_category, routing_decision, threshold_config_id,
+  features, shap_values, top_factors, scoring_time_ms
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+_INSERT_DECISION_SQL = """
+INSERT INTO decisions (id, application_id, scoring_result_id, decision_type, decision_outcome, reasoning)
+VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+_INSERT_QUEUE_SQL = """
+INSERT INTO analyst_queues (
+  id, application_id, priority, priority_reason, status,
+  sla_deadline, routing_reason, score_at_routing
+) VALUES (
+  %(id)s, %(application_id)s,
+  calculate_queue_priority(%(score)s::int, %(loan_amount)s::numeric, false, %(sla_hours)s::numeric), %(routing_reason)s, 'pending',
+  NOW() + %(sla_hours)s * INTERVAL '1 hour', %(routing_reason)s, %(score)s
+)
+"""
+
+_INSERT_AUDIT_SQL = """
+INSERT INTO audit_logs (id, tenant_id, entity_type, entity_id, action, new_value, change_summary)
+VALUES (%s, %s, 'application', %s, 'score', %s, 'application scored')
+"""
+
+_UPDATE_STATUS_SQL = """
+UPDATE applications a
+SET status = v.status
+FROM unnest(%(ids)s::uuid[], %(statuses)s::text[]) AS v(id, status)
+WHERE a.id = v.id
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _route_batch(apps: list[tuple], outputs: list, thresholds: dict) -> tuple[np.ndarray, np.ndarray]:
+    """Route the batch with each tenant's compiled router (src.ml.routing)."""
+
+    scores = np.array([out.score for out in outputs])
+    amounts = np.array([_as_float(row[6]) for row in apps])
+    requests = [row[4] or {} for row in apps]
+    terms = np.array([_as_float(r.get("term_months")) for r in requests])
+    purposes = [r.get("purpose") for r in requests]
+
+    by_tenant: dict[uuid.UUID, list[int]] = {}
+    for i, row in enumerate(apps):
+        by_tenant.setdefault(row[1], []).append(i)
+
+    decisions = np.empty(len(apps), dtype=object)
+    reasons = np.empty(len(apps), dtype=object)
+    for tenant_id, idx in by_tenant.items():
+        rows = np.array(idx)
+        decisions[rows], reasons[rows] = get_router(thresholds.get(tenant_id)).route_batch(
+            scores[rows], amounts[rows], terms[rows], [purposes[i] for i in idx]
+        )
+    return decisions, reasons
+
+
+def score_applications(
+    conn: psycopg.Connection,
+    application_ids: list[uuid.UUID],
+    *,
+    model=None,
+) -> dict[uuid.UUID, str]:
+    """Score a batch of applications in one transaction.
+
+    Returns {application_id: routing_decision} for the applications scored by
+    this call; ids that are unknown, no longer pending, or being scored by
+    another worker are skipped (absent from the result).
+    """
+
+    model = model or get_scoring_model()
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(_LOAD_SQL, {"ids": list(application_ids)})
+            apps = cur.fetchall()
+            if not apps:
+                conn.commit()
+                return {}
+
+            thresholds = get_threshold_cache().get_many(conn, {tenant_id for _, tenant_id, *_ in apps})
+
+            # Imputation statistics travel with the model version.
+            extractor = FeatureExtractor(model.feature_stats)
+            started = time.perf_counter()
+            X = extractor.transform(
+                {
+                    "applicant_data": applicant_data,
+                    "financial_data": financial_data,
+                    "loan_request": loan_request,
+                    "credit_bureau_data": credit_bureau_data,
+                }
+                for _, _, applicant_data, financial_data, loan_request, credit_bureau_data, _ in apps
+            )
+            outputs = model.score_batch(X)
+            features = extractor.to_dicts(X)
+            scoring_time_ms = int((time.perf_counter() - started) * 1000 / len(apps))
+
+            scoring_rows: list[tuple] = []
+            decision_rows: list[tuple] = []
+            queue_rows: list[dict[str, Any]] = []
+            audit_rows: list[tuple] = []
+            statuses: list[str] = []
+            routed: dict[uuid.UUID, str] = {}
+
+            decisions, reasons = _route_batch(apps, outputs, thresholds)
+
+            for i, ((app_id, tenant_id, _, _, _, _, loan_amount), feats, out) in enumerate(
+                zip(apps, features, outputs)
+            ):
+                threshold = thresholds.get(tenant_id)
+                decision, reason = decisions[i], reasons[i]
+
+                scoring_id = uuid.uuid4()
+                scoring_rows.append(
+                    (
+                        scoring_id,
+                        app_id,
+                        model.model_id,
+                        model.version,
+                        out.score,
+                        out.probability_default,
+                        out.risk_category,
+                        decision,
+                        threshold["id"] if threshold else None,
+                        Jsonb(feats),
+                        Jsonb(out.shap_values),
+                        Jsonb(out.top_factors),
+                        scoring_time_ms,
+                    )
+                )
+                if decision in _DECISION_OUTCOMES:
+                    decision_rows.append(
+                        (uuid.uuid4(), app_id, scoring_id, decision, _DECISION_OUTCOMES[decision], reason)
+                    )
+                else:
+                    queue_rows.append(
+                        {
+                            "id": uuid.uuid4(),
+                            "application_id": app_id,
+                            "score": out.score,
+                            "loan_amount": loan_amount or 0,
+                            "sla_hours": SLA_HOURS,
+                            "routing_reason": reason,
+                        }
+                    )
+                audit_rows.append(
+                    (
+                        uuid.uuid4(),
+                        tenant_id,
+                        app_id,
+                        Jsonb(
+                            {
+                                "scoring_result_id": str(scoring_id),
+                                "score": out.score,
+                                "routing_decision": decision,
+                                "routing_reason": reason,
+                            }
+                        ),
+                    )
+                )
+                statuses.append(_APPLICATION_STATUS[decision])
+                routed[app_id] = decision
+
+            # executemany() runs in pipeline mode: one round trip per statement kind.
+            cur.executemany(_INSERT_SCORING_SQL, scoring_rows)
+            if decision_rows:
+                cur.executemany(_INSERT_DECISION_SQL, decision_rows)
+            if queue_rows:
+                cur.executemany(_INSERT_QUEUE_SQL, queue_rows)
+            cur.executemany(_INSERT_AUDIT_SQL, audit_rows)
+            cur.execute(_UPDATE_STATUS_SQL, {"ids": [row[0] for row in apps], "statuses": statuses})
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return routed
+
+
+class MicroBatcher(Generic[K, R]):
+    """Collect items from many threads and process them in batches.
+
+    A batch is flushed when ``max_items`` are waiting or ``max_wait_ms`` has
+    passed since its first item. ``handler`` runs on a single background
+    thread and returns {item: result}; items missing from the result resolve
+    to None. If the handler raises on a batch of several items, they are
+    retried one at a time, so one bad item fails only its own future.
+    """
+
+    def __init__(self, handler: Callable[[list[K]], dict[K, R]], *, max_items: int, max_wait_ms: float) -> None:
+        self._handler = handler
+        self._max_items = max_items
+        self._max_wait = max_wait_ms / 1000
+        self._queue: queue.SimpleQueue[tuple[K, Future]] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: K) -> Future:
+        future: Future = Future()
+        self._queue.put((item, future))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hitl-microbatch", daemon=True)
+                self._thread.start()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch: list[tuple[K, Future]]) -> None:
+        items = list(dict.fromkeys(item for item, _ in batch))
+        try:
+            results = self._handler(items)
+        except Exception as e:
+            if len(items) == 1:
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+            logger.warning("batch of %d failed (%s: %s); retrying items one at a time", len(items), type(e).__name__, e)
+            for item in items:
+                self._flush([(i, f) for i, f in batch if i == item])
+            return
+        for item, future in batch:
+            future.set_result(results.get(item))
+
+
+_batcher: MicroBatcher[uuid.UUID, str] | None = None
+_batcher_lock = threading.Lock()
+_conn: psycopg.Connection | None = None
+
+
+def _score_batch_handler(application_ids: list[uuid.UUID]) -> dict[uuid.UUID, str]:
+    """Batcher handler: reuses one connection, owned by the flusher thread."""
+
+    global _conn
+
+    from src.config import settings
+
+    if _conn is None or _conn.closed:
+        _conn = psycopg.connect(_sync_dsn(settings.database_url))
+    try:
+        routed = score_applications(_conn, application_ids)
+    except psycopg.OperationalError:
+        _conn.close()
+        raise
+    shap_cache = get_explanation_cache().stats()
+    logger.info(
+        "scored batch size=%d scored=%d shap_cache_hit_rate=%.3f shap_cache_lookups=%d",
+        len(application_ids),
+        len(routed),
+        shap_cache["hit_rate"],
+        shap_cache["lookups"],
+    )
+    return routed
+
+
+def get_scoring_batcher() -> MicroBatcher[uuid.UUID, str]:
+    """Process-wide batcher (SCORING_BATCH_SIZE=50, SCORING_BATCH_WAIT_MS=50)."""
+
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = MicroBatcher(
+                _score_batch_handler,
+                max_items=int(os.getenv("SCORING_BATCH_SIZE", "50")),
+                max_wait_ms=float(os.getenv("SCORING_BATCH_WAIT_MS", "50")),
+            )
+        return _batcher
+
+
+def _reset_after_fork() -> None:
+    global _batcher, _conn, _batcher_lock
+    _batcher = None
+    _conn = None
+    _batcher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
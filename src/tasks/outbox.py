@@ -0,0 +1,209 @@
+"""Transactional outbox relay.
+
+With TASK_OUTBOX_ENABLED=1 the API does not publish scoring tasks itself; it
+writes task_outbox rows in the same transaction as the application + audit
+rows. This relay drains the table to Celery:
+
+  - claims a batch of due rows with SELECT ... FOR UPDATE SKIP LOCKED, so any
+    number of relays can run side by side without double-claiming;
+  - publishes the batch through one pooled producer (no dedup needed here:
+    the partial unique index allows one pending row per dedup_key);
+  - marks the batch published in one UPDATE and commits;
+  - on a publish failure, leaves the rows pending with exponential backoff.
+
+Delivery is at-least-once (a crash between publish and commit republishes the
+batch), so consumers must be idempotent.
+
+Usage:
+  DATABASE_URL=... CELERY_ENABLED=1 CELERY_BROKER_URL=... python -m src.tasks.outbox
+
+Optional:
+  OUTBOX_BATCH_SIZE=1000, OUTBOX_POLL_INTERVAL=0.5 (seconds, when idle),
+  OUTBOX_RETENTION_HOURS=24 (published rows older than this are deleted)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Callable
+
+import psycopg
+
+from src.crud.outbox import OUTBOX_LAG_SQL, outbox_lag_row
+from src.tasks.score_application import get_producer_app, producer_settings
+
+logger = logging.getLogger("hitl.tasks")
+
+# (task_name, payload) messages -> None; raises if the batch could not be published.
+Publisher = Callable[[list[tuple[str, dict]]], None]
+
+_CLAIM_SQL = """
+SELECT id, task_name, payload
+FROM task_outbox
+WHERE published_at IS NULL
+  AND available_at <= NOW()
+ORDER BY id
+LIMIT %(batch_size)s
+FOR UPDATE SKIP LOCKED
+"""
+
+_MARK_PUBLISHED_SQL = """
+UPDATE task_outbox
+SET published_at = NOW(), attempts = attempts + 1, last_error = NULL
+WHERE id = ANY(%(ids)s)
+"""
+
+_MARK_FAILED_SQL = """
+UPDATE task_outbox
+SET attempts = attempts + 1,
+    last_error = %(error)s,
+    available_at = NOW() + LEAST(power(2, attempts), %(max_backoff)s) * INTERVAL '1 second'
+WHERE id = ANY(%(ids)s)
+"""
+
+_PURGE_SQL = """
+DELETE FROM task_outbox
+WHERE id IN (
+  SELECT id FROM task_outbox
+  WHERE published_at < NOW() - %(retention)s * INTERVAL '1 hour'
+  LIMIT %(limit)s
+)
+"""
+
+MAX_BACKOFF_SECONDS = 300
+
+
+def outbox_enabled() -> bool:
+    return os.getenv("TASK_OUTBOX_ENABLED") == "1"
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def celery_publisher() -> Publisher | None:
+    """Publisher over the process-wide producer app; None when Celery is disabled."""
+
+    settings = producer_settings()
+    if settings is None:
+        return None
+    broker_url, backend, _ = settings
+    celery_app = get_producer_app(broker_url, backend)
+
+    def publish(messages: list[tuple[str, dict]]) -> None:
+        with celery_app.producer_or_acquire() as producer:
+            for task_name, payload in messages:
+                celery_app.send_task(
+                    task_name,
+                    args=payload.get("args", []),
+                    kwargs=payload.get("kwargs", {}),
+                    producer=producer,
+                )
+
+    return publish
+
+
+def relay_outbox_batch(conn: psycopg.Connection, publish: Publisher, *, batch_size: int = 1000) -> int:
+    """Claim, publish and mark one batch; returns the number of rows claimed."""
+
+    with conn.cursor() as cur:
+        cur.execute(_CLAIM_SQL, {"batch_size": batch_size})
+        rows = cur.fetchall()
+        if not rows:
+            conn.commit()
+            return 0
+
+        ids = [row[0] for row in rows]
+        messages = [(task_name, payload) for _, task_name, payload in rows]
+
+        try:
+            publish(messages)
+        except Exception as e:
+            logger.exception("outbox relay: failed to publish %d message(s)", len(messages))
+            cur.execute(
+                _MARK_FAILED_SQL,
+                {"ids": ids, "error": repr(e)[:1000], "max_backoff": MAX_BACKOFF_SECONDS},
+            )
+        else:
+            cur.execute(_MARK_PUBLISHED_SQL, {"ids": ids})
+    conn.commit()
+    return len(rows)
+
+
+def outbox_lag(conn: psycopg.Connection) -> dict:
+    """Same shape as :func:`src.crud.outbox.outbox_metrics`."""
+
+    with conn.cursor() as cur:
+        cur.execute(OUTBOX_LAG_SQL)
+        row = cur.fetchone()
+    conn.commit()
+    return outbox_lag_row(row)
+
+
+def purge_published(conn: psycopg.Connection, *, retention_hours: float, limit: int = 10_000) -> int:
+    with conn.cursor() as cur:
+        cur.execute(_PURGE_SQL, {"retention": retention_hours, "limit": limit})
+        deleted = cur.rowcount
+    conn.commit()
+    return deleted
+
+
+def run_relay(
+    database_url: str,
+    publish: Publisher,
+    *,
+    batch_size: int = 1000,
+    poll_interval: float = 0.5,
+    retention_hours: float = 24,
+    metrics_interval: float = 30,
+) -> None:
+    """Drain the outbox forever: back-to-back batches while there is work,
+    ``poll_interval`` sleeps when idle, lag metrics logged every ``metrics_interval``.
+    """
+
+    last_metrics = 0.0
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        while True:
+            claimed = relay_outbox_batch(conn, publish, batch_size=batch_size)
+
+            now = time.monotonic()
+            if now - last_metrics >= metrics_interval:
+                last_metrics = now
+                lag = outbox_lag(conn)
+                purged = purge_published(conn, retention_hours=retention_hours)
+                logger.info(
+                    "outbox relay pending=%d oldest_pending_age_seconds=%s retrying=%d purged=%d",
+                    lag["pending"],
+                    lag["oldest_pending_age_seconds"],
+                    lag["retrying"],
+                    purged,
+                )
+
+            if claimed < batch_size:
+                time.sleep(poll_interval)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    publish = celery_publisher()
+    if publish is None:
+        raise SystemExit("CELERY_ENABLED=1 and CELERY_BROKER_URL are required to run the outbox relay")
+
+    run_relay(
+        database_url,
+        publish,
+        batch_size=int(os.getenv("OUTBOX_BATCH_SIZE", "1000")),
+        poll_interval=float(os.getenv("OUTBOX_POLL_INTERVAL", "0.5")),
+        retention_hours=float(os.getenv("OUTBOX_RETENTION_HOURS", "24")),
+    )
+
+
+if __name__ == "__main__":
+    main()
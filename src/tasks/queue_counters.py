@@ -0,0 +1,95 @@
+"""Consistency check for queue_summary_counters (migration 015).
+
+The counters are maintained by trigger in the same transaction as every queue
+transition, so they only drift through out-of-band changes (e.g. triggers
+disabled during a bulk load, manual fixes). This job recounts open queue
+entries and adds the difference back as a correction.
+
+The recount and the correction are one statement: both tables are read from
+the same snapshot, and the correction is additive (n = n + delta), so
+transitions committed while the job runs are neither lost nor double counted.
+
+Usage:
+  DATABASE_URL=... python -m src.tasks.queue_counters [--tenant-id UUID]
+
+Also scheduled by celery beat (``repair_queue_counters``,
+QUEUE_COUNTER_REPAIR_SECONDS, default 300).
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import uuid
+
+import psycopg
+
+logger = logging.getLogger("hitl.tasks")
+
+_REPAIR_SQL = """
+WITH actual AS (
+  SELECT tenant_id, status, queue_priority_bucket(priority) AS priority_bucket, count(*) AS n
+  FROM analyst_queues
+  WHERE status IN ('pending', 'assigned', 'in_progress')
+    AND (%(tenant_id)s::uuid IS NULL OR tenant_id = %(tenant_id)s::uuid)
+  GROUP BY 1, 2, 3
+),
+counted AS (
+  SELECT tenant_id, status, priority_bucket, sum(n) AS n
+  FROM queue_summary_counters
+  WHERE %(tenant_id)s::uuid IS NULL OR tenant_id = %(tenant_id)s::uuid
+  GROUP BY 1, 2, 3
+),
+drift AS (
+  SELECT tenant_id, status, priority_bucket, coalesce(a.n, 0) - coalesce(c.n, 0) AS delta
+  FROM actual a
+  FULL JOIN counted c USING (tenant_id, status, priority_bucket)
+  WHERE coalesce(a.n, 0) <> coalesce(c.n, 0)
+),
+repaired AS (
+  INSERT INTO queue_summary_counters AS qc (tenant_id, status, priority_bucket, shard, n)
+  SELECT tenant_id, status, priority_bucket, 0, delta FROM drift
+  ON CONFLICT (tenant_id, status, priority_bucket, shard) DO UPDATE SET n = qc.n + EXCLUDED.n
+)
+SELECT tenant_id, status, priority_bucket, delta FROM drift
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def repair_queue_counters(conn: psycopg.Connection, *, tenant_id: uuid.UUID | None = None) -> list[tuple]:
+    """Correct drifted counters; returns (tenant_id, status, priority_bucket, delta) per corrected cell."""
+
+    with conn.cursor() as cur:
+        cur.execute(_REPAIR_SQL, {"tenant_id": tenant_id})
+        drift = cur.fetchall()
+    conn.commit()
+
+    for tenant, status, bucket, delta in drift:
+        logger.warning(
+            "queue counters drift repaired tenant=%s status=%s priority_bucket=%s delta=%+d", tenant, status, bucket, delta
+        )
+    return drift
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Repair drift in queue_summary_counters")
+    parser.add_argument("--tenant-id", type=uuid.UUID, default=None)
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        drift = repair_queue_counters(conn, tenant_id=args.tenant_id)
+    print(f"repaired {len(drift)} counter cell(s)")
+
+
+if __name__ == "__main__":
+    main()
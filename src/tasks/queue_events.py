@@ -0,0 +1,67 @@
+"""Retention for queue_events (the change-feed log, migration 016).
+
+Clients only replay what they missed while disconnected, so the log is kept
+for QUEUE_EVENTS_RETENTION_HOURS (default 24); a client whose cursor is older
+gets a ``reset`` and refetches the queue.
+
+Usage:
+  DATABASE_URL=... python -m src.tasks.queue_events
+
+Also scheduled by celery beat (``purge_queue_events``, hourly).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+import psycopg
+
+logger = logging.getLogger("hitl.tasks")
+
+_PURGE_SQL = """
+DELETE FROM queue_events
+WHERE id IN (
+  SELECT id FROM queue_events
+  WHERE created_at < NOW() - %(retention)s * INTERVAL '1 hour'
+  LIMIT %(limit)s
+)
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def retention_hours() -> float:
+    return float(os.getenv("QUEUE_EVENTS_RETENTION_HOURS", "24"))
+
+
+def purge_queue_events(conn: psycopg.Connection, *, retention: float, limit: int = 10_000) -> int:
+    """Delete expired events in batches of ``limit``; returns the number deleted."""
+
+    total = 0
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(_PURGE_SQL, {"retention": retention, "limit": limit})
+            deleted = cur.rowcount
+        conn.commit()
+        total += deleted
+        if deleted < limit:
+            return total
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        deleted = purge_queue_events(conn, retention=retention_hours())
+    print(f"deleted {deleted} queue event(s)")
+
+
+if __name__ == "__main__":
+    main()
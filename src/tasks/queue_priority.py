@@ -0,0 +1,129 @@
+"""Periodic priority recompute for open queue entries.
+
+``analyst_queues.priority`` is computed at routing time, but its SLA term
+(hours remaining until ``sla_deadline``) moves with the clock, so stored
+priorities go stale. This job walks the open entries in id order, in batches,
+and for each batch:
+
+  - reads score, loan amount and hours remaining (from the database clock);
+  - recomputes priorities with the vectorized engine (src/ml/priority.py,
+    identical to ``calculate_queue_priority``);
+  - writes only the rows whose priority changed, in one
+    ``UPDATE ... FROM unnest(...)`` and commits.
+
+Unchanged rows are never written, so a run that changes nothing fires no
+counter or queue-event triggers. No VIP flag is stored yet, so entries are
+not VIP (as at routing time).
+
+Usage:
+  DATABASE_URL=... python -m src.tasks.queue_priority
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+
+import numpy as np
+import psycopg
+
+from src.ml.priority import queue_priorities
+
+logger = logging.getLogger("hitl.tasks")
+
+_LOAD_SQL = """
+SELECT q.id, q.priority, q.score_at_routing, a.loan_amount,
+       EXTRACT(EPOCH FROM q.sla_deadline - NOW()) / 3600
+FROM analyst_queues q
+JOIN applications a ON a.id = q.application_id
+WHERE q.status IN ('pending', 'assigned', 'in_progress')
+  AND q.id > %(after)s
+  AND (%(tenant_id)s::uuid IS NULL OR q.tenant_id = %(tenant_id)s::uuid)
+ORDER BY q.id
+LIMIT %(batch_size)s
+"""
+
+_UPDATE_SQL = """
+UPDATE analyst_queues q
+SET priority = v.priority
+FROM unnest(%(ids)s::uuid[], %(priorities)s::int[]) AS v(id, priority)
+WHERE q.id = v.id
+  AND q.status IN ('pending', 'assigned', 'in_progress')
+  AND q.priority IS DISTINCT FROM v.priority
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _as_float(values: list) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+def recompute_queue_priorities(
+    conn: psycopg.Connection,
+    *,
+    tenant_id: uuid.UUID | None = None,
+    batch_size: int = 5000,
+) -> dict:
+    """Recompute open entries' priorities; returns {scanned, updated, duration_ms}."""
+
+    started = time.perf_counter()
+    scanned = updated = 0
+    after = uuid.UUID(int=0)
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(_LOAD_SQL, {"after": after, "tenant_id": tenant_id, "batch_size": batch_size})
+            rows = cur.fetchall()
+            if not rows:
+                conn.commit()
+                break
+
+            ids, current, scores, amounts, sla_hours = zip(*rows)
+            priorities = queue_priorities(
+                np.array([np.nan if s is None else s for s in scores], dtype=np.float64),
+                _as_float(amounts),
+                None,
+                _as_float(sla_hours),
+            )
+            old = np.array([-1 if p is None else p for p in current], dtype=np.int32)
+            changed = np.flatnonzero(priorities != old)
+            if changed.size:
+                cur.execute(
+                    _UPDATE_SQL,
+                    {"ids": [ids[i] for i in changed], "priorities": priorities[changed].tolist()},
+                )
+                updated += cur.rowcount
+        conn.commit()
+        scanned += len(rows)
+        after = ids[-1]
+        if len(rows) < batch_size:
+            break
+
+    result = {"scanned": scanned, "updated": updated, "duration_ms": (time.perf_counter() - started) * 1000}
+    logger.info(
+        "queue priority recompute scanned=%d updated=%d duration_ms=%.1f",
+        scanned,
+        updated,
+        result["duration_ms"],
+    )
+    return result
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        result = recompute_queue_priorities(conn)
+    print(f"scanned={result['scanned']} updated={result['updated']} duration_ms={result['duration_ms']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
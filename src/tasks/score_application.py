@@ -2,18 +2,162 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger("hitl.tasks")
 
 
+# Process-wide producer state. The Celery app (and therefore kombu's broker
+# connection + producer pools) is created lazily on first emission and reused;
+# previously every emission built a new app and opened a new connection.
+_lock = threading.Lock()
+_celery_app = None
+_celery_app_key: tuple[str, str | None] | None = None
+
+# Background emission (CELERY_EMIT_MODE=background).
+_executor: ThreadPoolExecutor | None = None
+_pending = 0
+
+
+def score_application_task_name() -> str:
+    return os.getenv("CELERY_TASK_SCORE_APPLICATION_NAME", "score_application")
+
+
+def producer_settings() -> tuple[str, str | None, str] | None:
+    """Return (broker_url, backend, task_name), or None when emission is disabled."""
+
+    if os.getenv("CELERY_ENABLED") != "1":
+        return None
+
+    broker_url = os.getenv("CELERY_BROKER_URL")
+    if not broker_url:
+        logger.warning("CELERY_ENABLED=1 but CELERY_BROKER_URL is not set; skipping")
+        return None
+
+    return broker_url, os.getenv("CELERY_RESULT_BACKEND"), score_application_task_name()
+
+
+def get_producer_app(broker_url: str, backend: str | None):
+    """Return the process-wide Celery app used for publishing (created once).
+
+    Configured with a bounded broker connection pool and publisher confirms
+    (honoured by AMQP brokers; a no-op on Redis), and retries publishing on
+    transient connection errors.
+    """
+
+    global _celery_app, _celery_app_key
+
+    key = (broker_url, backend)
+    with _lock:
+        if _celery_app is None or _celery_app_key != key:
+            # Imported lazily to avoid introducing a hard dependency for default CI.
+            from celery import Celery  # type: ignore
+
+            _celery_app = Celery(
+                "hitl",
+                broker=broker_url,
+                backend=backend,
+                broker_pool_limit=int(os.getenv("CELERY_BROKER_POOL_LIMIT", "10")),
+                broker_transport_options={"confirm_publish": True},
+                task_publish_retry=True,
+            )
+            _celery_app_key = key
+        return _celery_app
+
+
+def reset_producer() -> None:
+    """Drop the cached producer app and background executor (tests use it to
+    swap in a fake Celery)."""
+
+    global _celery_app, _celery_app_key, _executor, _pending
+
+    with _lock:
+        _celery_app = None
+        _celery_app_key = None
+        executor, _executor = _executor, None
+        _pending = 0
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _reset_after_fork() -> None:
+    # Pools must not be shared across processes, and the executor's threads do
+    # not survive fork. Never touch the parent's lock: another thread may have
+    # held it at fork time.
+    global _lock, _celery_app, _celery_app_key, _executor, _pending
+    _lock = threading.Lock()
+    _celery_app = None
+    _celery_app_key = None
+    _executor = None
+    _pending = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _publish(broker_url: str, backend: str | None, task_name: str, application_ids: list[uuid.UUID]) -> None:
+    try:
+        celery_app = get_producer_app(broker_url, backend)
+        if len(application_ids) == 1:
+            # send_task draws from the app's pooled producer itself.
+            celery_app.send_task(task_name, args=[str(application_ids[0])])
+            return
+        with celery_app.producer_or_acquire() as producer:
+            for application_id in application_ids:
+                celery_app.send_task(task_name, args=[str(application_id)], producer=producer)
+    except Exception:
+        logger.exception(
+            "Failed to emit Celery task %s for application_id(s)=%s",
+            task_name,
+            ", ".join(str(i) for i in application_ids),
+        )
+
+
+def _publish_in_background(*args) -> None:
+    global _pending
+    try:
+        _publish(*args)
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+def _dispatch(application_ids: list[uuid.UUID]) -> None:
+    global _executor, _pending
+
+    settings = producer_settings()
+    if settings is None:
+        return
+
+    if os.getenv("CELERY_EMIT_MODE", "sync") == "background":
+        max_pending = int(os.getenv("CELERY_EMIT_MAX_PENDING", "10000"))
+        with _lock:
+            if _pending < max_pending:
+                if _executor is None:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=int(os.getenv("CELERY_EMIT_WORKERS", "2")),
+                        thread_name_prefix="hitl-emit",
+                    )
+                _pending += 1
+                _executor.submit(_publish_in_background, *settings, application_ids)
+                return
+        # Backpressure: the broker is not keeping up; publish inline rather than
+        # buffering without bound.
+        logger.warning("background emission backlog >= %d; publishing synchronously", max_pending)
+
+    _publish(*settings, application_ids)
+
+
 def emit_score_application_task(application_id: uuid.UUID) -> None:
     """Emit an async scoring task for the given application.
 
     This is a small compatibility wrapper:
     - In local/dev/CI where Celery isn't configured, it should be a no-op.
-    - In environments that do have a broker + Celery installed, it can send a
-      fire-and-forget task using `send_task`.
+    - In environments that do have a broker + Celery installed, it sends a
+      fire-and-forget task using `send_task` over a process-wide producer.
 
     Enable by setting:
       CELERY_ENABLED=1
@@ -22,28 +166,23 @@ def emit_score_application_task(application_id: uuid.UUID) -> None:
     Optional:
       CELERY_RESULT_BACKEND=...
       CELERY_TASK_SCORE_APPLICATION_NAME=score_application
+      CELERY_BROKER_POOL_LIMIT=10
+      CELERY_EMIT_MODE=sync|background
+        background: hand the publish to a small thread pool and return
+        immediately, so request latency does not include broker latency.
+      CELERY_EMIT_WORKERS=2, CELERY_EMIT_MAX_PENDING=10000 (background only)
     """
 
-    if os.getenv("CELERY_ENABLED") != "1":
-        return
+    _dispatch([application_id])
 
-    broker_url = os.getenv("CELERY_BROKER_URL")
-    if not broker_url:
-        logger.warning("CELERY_ENABLED=1 but CELERY_BROKER_URL is not set; skipping")
-        return
 
-    task_name = os.getenv("CELERY_TASK_SCORE_APPLICATION_NAME", "score_application")
-    backend = os.getenv("CELERY_RESULT_BACKEND")
+def emit_score_application_tasks(application_ids: list[uuid.UUID]) -> None:
+    """Batch variant of :func:`emit_score_application_task` for bulk intake.
 
-    try:
-        # Imported lazily to avoid introducing a hard dependency for default CI.
-        from celery import Celery  # type: ignore
+    Publishes all tasks through one acquired producer. Same enablement env vars;
+    same best-effort semantics (failures are logged, never raised).
+    """
 
-        celery_app = Celery("hitl", broker=broker_url, backend=backend)
-        celery_app.send_task(task_name, args=[str(application_id)])
-    except Exception:
-        logger.exception(
-            "Failed to emit Celery task %s for application_id=%s",
-            task_name,
-            application_id,
-        )
+    if not application_ids:
+        return
+    _dispatch(list(application_ids))
@@ -0,0 +1,138 @@
+"""Set-based SLA sweeper (TODO-2.2.3: check_sla_status).
+
+Every minute (celery beat) two statements run, each in batches:
+
+  - breach: open entries with sla_deadline <= now() and sla_breached = false
+    are flagged ``sla_breached = true`` (and ``sla_warned_at``, so a late
+    entry is not warned after the fact) and one ``sla_breach`` notification
+    per entry is inserted, in the same statement (UPDATE ... RETURNING feeding
+    INSERT ... SELECT);
+  - warn: open entries due within SLA_WARNING_HOURS (default 2) that have no
+    ``sla_warned_at`` get it set plus one ``sla_warning`` notification.
+
+The flags are the per-row high-water mark: a row is flagged and notified in
+one atomic statement, and flagged rows drop out of the partial indexes the
+sweeps scan (idx_queue_sla_unbreached / idx_queue_sla_unwarned, migration
+017). So every entry is warned and breached exactly once, even with
+overlapping sweeps (SKIP LOCKED), and a sweep costs O(rows changing state),
+not O(open queue). A single global mark would miss entries created with a
+deadline already behind it (e.g. a 1-hour SLA).
+
+Notifications go to the assigned analyst (user_id NULL = tenant-wide for
+unassigned entries); payload carries queue/application ids and external_id.
+
+Usage:
+  DATABASE_URL=... python -m src.tasks.sla
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+import psycopg
+
+logger = logging.getLogger("hitl.tasks")
+
+_OPEN = "('pending', 'assigned', 'in_progress')"
+
+_BREACH_SQL = f"""
+WITH due AS (
+  SELECT id FROM analyst_queues
+  WHERE status IN {_OPEN} AND NOT sla_breached AND sla_deadline <= NOW()
+  ORDER BY sla_deadline
+  LIMIT %(batch_size)s
+  FOR UPDATE SKIP LOCKED
+),
+flagged AS (
+  UPDATE analyst_queues q
+  SET sla_breached = true, sla_warned_at = COALESCE(q.sla_warned_at, NOW())
+  FROM due
+  WHERE q.id = due.id
+  RETURNING q.id, q.tenant_id, q.application_id, q.analyst_id, q.priority, q.sla_deadline
+)
+INSERT INTO notifications (id, tenant_id, user_id, kind, payload)
+SELECT gen_random_uuid(), f.tenant_id, f.analyst_id, 'sla_breach',
+       jsonb_build_object(
+         'queue_id', f.id, 'application_id', f.application_id, 'external_id', a.external_id,
+         'priority', f.priority, 'sla_deadline', f.sla_deadline
+       )
+FROM flagged f
+JOIN applications a ON a.id = f.application_id
+"""
+
+_WARN_SQL = f"""
+WITH due AS (
+  SELECT id FROM analyst_queues
+  WHERE status IN {_OPEN} AND sla_warned_at IS NULL
+    AND sla_deadline <= NOW() + %(warning_hours)s * INTERVAL '1 hour'
+  ORDER BY sla_deadline
+  LIMIT %(batch_size)s
+  FOR UPDATE SKIP LOCKED
+),
+flagged AS (
+  UPDATE analyst_queues q
+  SET sla_warned_at = NOW()
+  FROM due
+  WHERE q.id = due.id
+  RETURNING q.id, q.tenant_id, q.application_id, q.analyst_id, q.priority, q.sla_deadline
+)
+INSERT INTO notifications (id, tenant_id, user_id, kind, payload)
+SELECT gen_random_uuid(), f.tenant_id, f.analyst_id, 'sla_warning',
+       jsonb_build_object(
+         'queue_id', f.id, 'application_id', f.application_id, 'external_id', a.external_id,
+         'priority', f.priority, 'sla_deadline', f.sla_deadline
+       )
+FROM flagged f
+JOIN applications a ON a.id = f.application_id
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def warning_hours() -> float:
+    return float(os.getenv("SLA_WARNING_HOURS", "2"))
+
+
+def _drain(conn: psycopg.Connection, sql: str, params: dict, batch_size: int) -> int:
+    total = 0
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(sql, {**params, "batch_size": batch_size})
+            n = cur.rowcount
+        conn.commit()
+        total += n
+        if n < batch_size:
+            return total
+
+
+def sweep_sla(conn: psycopg.Connection, *, warning_hours: float = 2.0, batch_size: int = 5000) -> dict:
+    """Flag and notify entries whose SLA breached / is about to; returns counts + timing."""
+
+    started = time.perf_counter()
+    # Breaches first: an overdue, never-warned entry gets only the breach notice.
+    breached = _drain(conn, _BREACH_SQL, {}, batch_size)
+    warned = _drain(conn, _WARN_SQL, {"warning_hours": warning_hours}, batch_size)
+    result = {"breached": breached, "warned": warned, "duration_ms": (time.perf_counter() - started) * 1000}
+    if breached or warned:
+        logger.info("sla sweep breached=%d warned=%d duration_ms=%.1f", breached, warned, result["duration_ms"])
+    return result
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    with psycopg.connect(_sync_dsn(database_url)) as conn:
+        result = sweep_sla(conn, warning_hours=warning_hours())
+    print(f"breached={result['breached']} warned={result['warned']} duration_ms={result['duration_ms']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""In-process SLA timer: sub-minute breach / warning detection (optional).
+
+The ``check_sla_status`` beat task sweeps once a minute, so a breach can be
+flagged up to 60s late. With SLA_TIMER_ENABLED=1 every Celery worker starts
+an :class:`SlaTimer` thread (or run ``python -m src.tasks.sla_timer``):
+
+  - leader lease: the timers compete for a session-level Postgres advisory
+    lock; one holds it, the others retry every SLA_TIMER_LEASE_RETRY_SECONDS.
+    A dead leader's connection drops, which releases the lock, so a standby
+    takes over within one retry interval;
+  - the leader keeps the next SLA_TIMER_HORIZON_SECONDS of warning / breach
+    instants of open entries in a heap (:class:`DeadlineHeap`). It loads them
+    with one indexed query per reconcile (every SLA_TIMER_RECONCILE_SECONDS)
+    and keeps them current from the ``hitl_queue_events`` NOTIFY stream
+    (migration 016), so it does not poll between instants;
+  - when an instant comes due, it runs the set-based sweep
+    (:func:`src.tasks.sla.sweep_sla`). The sweep's per-row flags keep the
+    warning and breach notices exactly-once, whether the timer, the beat task
+    or a new leader gets there first.
+
+Instants are compared against the database clock (the offset is re-measured
+on every reconcile). The beat task stays on as a safety net; with the timer
+enabled its SLA_SWEEP_SECONDS can be raised.
+
+Usage:
+  DATABASE_URL=... python -m src.tasks.sla_timer
+
+Optional:
+  SLA_TIMER_HORIZON_SECONDS=900, SLA_TIMER_RECONCILE_SECONDS=300,
+  SLA_TIMER_LEASE_RETRY_SECONDS=5, SLA_WARNING_HOURS=2
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import psycopg
+
+from src.tasks.sla import sweep_sla, warning_hours
+
+logger = logging.getLogger("hitl.tasks")
+
+CHANNEL = "hitl_queue_events"
+
+# pg_advisory_lock key held by the leading timer ("SLAT").
+LEADER_LOCK_KEY = 0x534C4154
+
+_OPEN = ("pending", "assigned", "in_progress")
+
+_UPCOMING_SQL = """
+SELECT id, sla_deadline, sla_warned_at IS NULL, NOT sla_breached
+FROM analyst_queues
+WHERE status IN ('pending', 'assigned', 'in_progress')
+  AND (
+    (NOT sla_breached AND sla_deadline <= NOW() + %(horizon)s * INTERVAL '1 second')
+    OR (sla_warned_at IS NULL
+        AND sla_deadline <= NOW() + (%(horizon)s + %(warning)s) * INTERVAL '1 second')
+  )
+"""
+
+
+def _sync_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def sla_timer_enabled() -> bool:
+    return os.getenv("SLA_TIMER_ENABLED") == "1"
+
+
+class DeadlineHeap:
+    """Pending fire instants (epoch seconds) per queue entry.
+
+    Replacing or discarding an entry leaves its old heap items behind; they
+    are skipped when they surface (lazy deletion), so every operation is
+    O(log n).
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, uuid.UUID]] = []
+        self._instants: dict[uuid.UUID, tuple[float, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._instants)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._instants.clear()
+
+    def set(self, queue_id: uuid.UUID, instants: tuple[float, ...]) -> None:
+        if not instants:
+            self.discard(queue_id)
+            return
+        instants = tuple(sorted(instants))
+        if self._instants.get(queue_id) == instants:
+            return
+        self._instants[queue_id] = instants
+        for at in instants:
+            heapq.heappush(self._heap, (at, queue_id))
+
+    def discard(self, queue_id: uuid.UUID) -> None:
+        self._instants.pop(queue_id, None)
+
+    def _live(self, at: float, queue_id: uuid.UUID) -> bool:
+        return at in self._instants.get(queue_id, ())
+
+    def next_at(self) -> float | None:
+        while self._heap and not self._live(*self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list[tuple[float, uuid.UUID]]:
+        """Remove and return the live instants at or before ``now``."""
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            at, queue_id = heapq.heappop(self._heap)
+            if not self._live(at, queue_id):
+                continue
+            due.append((at, queue_id))
+            remaining = tuple(x for x in self._instants[queue_id] if x != at)
+            if remaining:
+                self._instants[queue_id] = remaining
+            else:
+                del self._instants[queue_id]
+        return due
+
+
+class SlaTimer:
+    """Leader-elected deadline scheduler that triggers :func:`sweep_sla` on time."""
+
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        warning_hours: float = 2.0,
+        horizon_seconds: float = 900.0,
+        reconcile_seconds: float = 300.0,
+        lease_retry_seconds: float = 5.0,
+        max_idle_seconds: float = 1.0,
+        fire_delay_seconds: float = 0.05,
+    ) -> None:
+        self._dsn = _sync_dsn(database_url)
+        self.warning_seconds = warning_hours * 3600
+        self.horizon_seconds = horizon_seconds
+        self.reconcile_seconds = reconcile_seconds
+        self.lease_retry_seconds = lease_retry_seconds
+        self.max_idle_seconds = max_idle_seconds
+        # Slack for clock-offset error, so the sweep's NOW() is past the instant.
+        self.fire_delay_seconds = fire_delay_seconds
+        self.deadlines = DeadlineHeap()
+        self.is_leader = False
+        self.sweeps = 0
+        self._clock_offset = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def now(self) -> float:
+        """Database clock estimate, epoch seconds."""
+
+        return time.time() + self._clock_offset
+
+    def start(self) -> threading.Thread:
+        self._thread = threading.Thread(target=self.run, name="hitl-sla-timer", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self._dsn, autocommit=True) as conn:
+                    if self._acquire_lease(conn):
+                        self._lead(conn)
+            except psycopg.Error:
+                logger.exception("sla timer: database connection failed")
+            finally:
+                if self.is_leader:
+                    logger.info("sla timer: leadership released")
+                self.is_leader = False
+                self.deadlines.clear()
+            self._stop.wait(self.lease_retry_seconds)
+
+    def _acquire_lease(self, conn: psycopg.Connection) -> bool:
+        while not self._stop.is_set():
+            if conn.execute("SELECT pg_try_advisory_lock(%s)", (LEADER_LOCK_KEY,)).fetchone()[0]:
+                self.is_leader = True
+                logger.info("sla timer: acquired leadership")
+                return True
+            self._stop.wait(self.lease_retry_seconds)
+        return False
+
+    def _lead(self, conn: psycopg.Connection) -> None:
+        conn.add_notify_handler(self._on_notify)
+        conn.execute(f"LISTEN {CHANNEL}")
+        next_reconcile = 0.0
+        while not self._stop.is_set():
+            if time.monotonic() >= next_reconcile:
+                self.reconcile(conn)
+                next_reconcile = time.monotonic() + self.reconcile_seconds
+
+            due = self.deadlines.pop_due(self.now() - self.fire_delay_seconds)
+            if due:
+                self._fire(conn, due)
+
+            timeout = min(self.max_idle_seconds, next_reconcile - time.monotonic())
+            next_at = self.deadlines.next_at()
+            if next_at is not None:
+                timeout = min(timeout, next_at + self.fire_delay_seconds - self.now())
+            if select.select([conn.fileno()], [], [], max(timeout, 0.0))[0]:
+                conn.execute("SELECT 1")  # drains pending notifications into _on_notify
+
+    def reconcile(self, conn: psycopg.Connection) -> None:
+        """Sweep anything already due, re-measure the clock offset and reload
+        the instants inside the horizon."""
+
+        result = sweep_sla(conn, warning_hours=self.warning_seconds / 3600)
+        self.sweeps += 1
+        db_now = conn.execute("SELECT EXTRACT(EPOCH FROM clock_timestamp())").fetchone()[0]
+        self._clock_offset = float(db_now) - time.time()
+        rows = conn.execute(
+            _UPCOMING_SQL, {"horizon": self.horizon_seconds, "warning": self.warning_seconds}
+        ).fetchall()
+        self.deadlines.clear()
+        for queue_id, deadline, warn_pending, breach_pending in rows:
+            self._schedule(queue_id, deadline.timestamp(), warn=warn_pending, breach=breach_pending)
+        logger.info(
+            "sla timer reconcile scheduled=%d breached=%d warned=%d",
+            len(self.deadlines),
+            result["breached"],
+            result["warned"],
+        )
+
+    def _schedule(self, queue_id: uuid.UUID, deadline: float, *, warn: bool = True, breach: bool = True) -> None:
+        limit = self.now() + self.horizon_seconds
+        instants = []
+        if warn and deadline - self.warning_seconds <= limit:
+            instants.append(deadline - self.warning_seconds)
+        if breach and deadline <= limit:
+            instants.append(deadline)
+        self.deadlines.set(queue_id, tuple(instants))
+
+    def _on_notify(self, notify: psycopg.Notify) -> None:
+        try:
+            event = json.loads(notify.payload)
+            queue_id = uuid.UUID(event["queue_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("sla timer: malformed payload %r", notify.payload[:200])
+            return
+        deadline = event.get("sla_deadline")
+        if event.get("event") == "deleted" or event.get("status") not in _OPEN or not deadline:
+            self.deadlines.discard(queue_id)
+            return
+        # The payload has no sweep flags: an instant that was already swept
+        # only costs an empty sweep.
+        self._schedule(queue_id, datetime.fromisoformat(deadline).timestamp())
+
+    def _fire(self, conn: psycopg.Connection, due: list[tuple[float, uuid.UUID]]) -> None:
+        result = sweep_sla(conn, warning_hours=self.warning_seconds / 3600)
+        self.sweeps += 1
+        lag_ms = (self.now() - min(at for at, _ in due)) * 1000
+        logger.info(
+            "sla timer fired instants=%d breached=%d warned=%d lag_ms=%.0f",
+            len(due),
+            result["breached"],
+            result["warned"],
+            lag_ms,
+        )
+
+
+def timer_from_env(database_url: str) -> SlaTimer:
+    return SlaTimer(
+        database_url,
+        warning_hours=warning_hours(),
+        horizon_seconds=float(os.getenv("SLA_TIMER_HORIZON_SECONDS", "900")),
+        reconcile_seconds=float(os.getenv("SLA_TIMER_RECONCILE_SECONDS", "300")),
+        lease_retry_seconds=float(os.getenv("SLA_TIMER_LEASE_RETRY_SECONDS", "5")),
+    )
+
+
+_timer: SlaTimer | None = None
+
+
+def start_sla_timer() -> SlaTimer:
+    """Start the process-wide timer thread (idempotent)."""
+
+    global _timer
+    if _timer is None:
+        from src.config import settings
+
+        _timer = timer_from_env(settings.database_url)
+        _timer.start()
+    return _timer
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    database_url = os.environ.get("DATABASE_URL") or os.environ.get("database_url")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env var is required")
+
+    timer_from_env(database_url).run()
+
+
+if __name__ == "__main__":
+    main()
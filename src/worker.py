@@ -1,10 +1,29 @@
 from __future__ import annotations
 
 import logging
+import os
+import uuid
 
+import psycopg
 from celery import Celery
+from celery.signals import worker_init
 
 from src.config import settings
+from src.ml.model_loader import get_model_loader
+from src.tasks.audit_partitions import (
+    brin_enabled,
+    lock_timeout_ms,
+    maintain_audit_partitions as _maintain_audit_partitions,
+    months_ahead,
+    retention_months,
+)
+from src.tasks.auto_assign import auto_assign_cases as _auto_assign_cases, horizon_hours
+from src.tasks.batch_scoring import get_scoring_batcher
+from src.tasks.queue_counters import repair_queue_counters as _repair_queue_counters
+from src.tasks.queue_events import purge_queue_events as _purge_queue_events, retention_hours
+from src.tasks.queue_priority import recompute_queue_priorities as _recompute_queue_priorities
+from src.tasks.sla import sweep_sla, warning_hours
+from src.tasks.sla_timer import sla_timer_enabled, start_sla_timer
 
 logger = logging.getLogger(__name__)
 
@@ -25,19 +44,129 @@ celery_app.conf.update(
     result_serializer="json",
     task_track_started=True,
     timezone="UTC",
+    beat_schedule={
+        "check-sla-status": {
+            "task": "check_sla_status",
+            "schedule": float(os.getenv("SLA_SWEEP_SECONDS", "60")),
+        },
+        "auto-assign-cases": {
+            "task": "auto_assign_cases",
+            "schedule": float(os.getenv("AUTO_ASSIGN_SECONDS", "300")),
+        },
+        "repair-queue-counters": {
+            "task": "repair_queue_counters",
+            "schedule": float(os.getenv("QUEUE_COUNTER_REPAIR_SECONDS", "300")),
+        },
+        "recompute-queue-priorities": {
+            "task": "recompute_queue_priorities",
+            "schedule": float(os.getenv("QUEUE_PRIORITY_RECOMPUTE_SECONDS", "300")),
+        },
+        "purge-queue-events": {
+            "task": "purge_queue_events",
+            "schedule": 3600.0,
+        },
+        "maintain-audit-partitions": {
+            "task": "maintain_audit_partitions",
+            "schedule": 86400.0,
+        },
+    },
 )
 
 
-@celery_app.task(name="score_application")
-def score_application(application_id: str) -> None:
-    """Score an application asynchronously.
+@worker_init.connect
+def _warm_model(**_kwargs) -> None:
+    # Runs in the parent before the pool forks: children inherit the
+    # memory-mapped model instead of each loading their own copy.
+    get_model_loader().warm()
+
+
+@worker_init.connect
+def _start_sla_timer(**_kwargs) -> None:
+    # Optional sub-minute SLA detection; one worker wins the leader lease.
+    if sla_timer_enabled():
+        start_sla_timer()
 
-    TODO-2.1.1 (follow-ups):
-    - Pull application payload from DB
-    - Call ML service (settings.ML_SERVICE_URL once that setting exists)
-    - Persist ScoringResult row (+ audit log)
 
-    For now, this is a stub so that the queue wiring is real end-to-end.
+@celery_app.task(
+    name="score_application",
+    acks_late=True,
+    autoretry_for=(Exception,),
+    # Bad input (a malformed id, a value the model rejects) fails the same way every time.
+    dont_autoretry_for=(ValueError,),
+    max_retries=3,
+    retry_backoff=True,
+)
+def score_application(application_id: str) -> str | None:
+    """Score an application asynchronously (TODO-2.4.2).
+
+    The id joins the process-wide micro-batch (src.tasks.batch_scoring) and the
+    task returns once that batch has been scored, routed and committed. Returns
+    the routing decision, or None when the application was not pending (e.g. a
+    duplicate delivery). Errors propagate and are retried (3x, with backoff),
+    except ValueError. A failed batch is rescored one id at a time, so an error
+    belongs to this application alone.
     """
 
-    logger.info("score_application received (application_id=%s)", application_id)
+    future = get_scoring_batcher().submit(uuid.UUID(application_id))
+    return future.result(timeout=300)
+
+
+@celery_app.task(name="repair_queue_counters")
+def repair_queue_counters() -> int:
+    """Recount open queue entries and correct drift in queue_summary_counters."""
+
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    with psycopg.connect(dsn) as conn:
+        return len(_repair_queue_counters(conn))
+
+
+@celery_app.task(name="recompute_queue_priorities")
+def recompute_queue_priorities() -> int:
+    """Refresh open entries' SLA-dependent priorities; returns the number of rows changed."""
+
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    with psycopg.connect(dsn) as conn:
+        return _recompute_queue_priorities(conn)["updated"]
+
+
+@celery_app.task(name="purge_queue_events")
+def purge_queue_events() -> int:
+    """Delete queue change-feed events older than QUEUE_EVENTS_RETENTION_HOURS."""
+
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    with psycopg.connect(dsn) as conn:
+        return _purge_queue_events(conn, retention=retention_hours())
+
+
+@celery_app.task(name="maintain_audit_partitions")
+def maintain_audit_partitions() -> dict:
+    """Create upcoming audit_logs partitions and drop those past AUDIT_LOG_RETENTION_MONTHS."""
+
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    with psycopg.connect(dsn) as conn:
+        return _maintain_audit_partitions(
+            conn,
+            months_ahead=months_ahead(),
+            retention_months=retention_months(),
+            brin=brin_enabled(),
+            lock_timeout_ms=lock_timeout_ms(),
+        )
+
+
+@celery_app.task(name="check_sla_status")
+def check_sla_status() -> dict:
+    """Flag breached / soon-due queue entries and create their notifications (TODO-2.2.3)."""
+
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    with psycopg.connect(dsn) as conn:
+        return sweep_sla(conn, warning_hours=warning_hours())
+
+
+@celery_app.task(name="auto_assign_cases")
+def auto_assign_cases() -> dict:
+    """Assign pending entries near their SLA to analysts with spare capacity (TODO-2.2.2)."""
+
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    with psycopg.connect(dsn) as conn:
+        result = _auto_assign_cases(conn, horizon_hours=horizon_hours())
+    return {"assigned": result.assigned, "unassigned": result.unassigned, "timings_ms": result.timings_ms}
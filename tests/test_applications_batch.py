@@ -0,0 +1,184 @@
+import json
+import os
+import uuid
+
+import psycopg
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _payload(tenant_id: uuid.UUID, name: str, **overrides) -> dict:
+    payload = {
+        "tenant_id": str(tenant_id),
+        "external_id": None,
+        "applicant_data": {"name": name},
+        "financial_data": {
+            "net_monthly_income": 1000,
+            "monthly_obligations": 200,
+            "existing_loans_payment": 100,
+        },
+        "loan_request": {"loan_amount": 12000, "estimated_payment": 300},
+        "credit_bureau_data": None,
+        "source": "partner",
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.fixture
+def emitted(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    from src.api.v1.endpoints import applications as applications_endpoint
+
+    calls: list[str] = []
+    monkeypatch.setattr(
+        applications_endpoint,
+        "emit_score_application_tasks",
+        lambda ids: calls.extend(str(i) for i in ids),
+    )
+    # Small chunks so the tests exercise several transactions.
+    monkeypatch.setattr(applications_endpoint, "BATCH_CHUNK_SIZE", 2)
+    return calls
+
+
+def test_batch_creates_valid_items_and_reports_invalid_ones(emitted: list[str]):
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    items = [
+        _payload(tenant_id, "A", external_id="BATCH-A"),
+        _payload(tenant_id, "B", applicant_data={}),  # missing name
+        _payload(tenant_id, "C"),
+    ]
+
+    r = client.post("/api/v1/applications:batch", json={"items": items})
+    assert r.status_code == 200, r.text
+
+    data = r.json()
+    assert (data["created"], data["failed"]) == (2, 1)
+    assert [res["status"] for res in data["results"]] == ["created", "error", "created"]
+    assert data["results"][0]["external_id"] == "BATCH-A"
+    assert data["results"][1]["errors"]
+
+    created_ids = [data["results"][0]["id"], data["results"][2]["id"]]
+    assert sorted(emitted) == sorted(created_ids)
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT metadata->'derived'->>'dti_ratio' FROM applications WHERE tenant_id = %s",
+                (tenant_id,),
+            )
+            assert [row[0] for row in cur.fetchall()] == ["0.3", "0.3"]
+
+            cur.execute(
+                "SELECT count(*) FROM audit_logs WHERE entity_type = 'application' AND entity_id = ANY(%s)",
+                ([uuid.UUID(i) for i in created_ids],),
+            )
+            assert cur.fetchone()[0] == 2
+
+
+def test_batch_unknown_tenant_fails_only_that_item(emitted: list[str]):
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    items = [
+        _payload(tenant_id, "A"),
+        _payload(tenant_id, "B"),
+        _payload(uuid.uuid4(), "C"),  # FK violation -> chunk 2 is retried per item
+        _payload(tenant_id, "D"),
+    ]
+
+    r = client.post("/api/v1/applications:batch", json={"items": items})
+    assert r.status_code == 200, r.text
+
+    data = r.json()
+    assert (data["created"], data["failed"]) == (3, 1)
+    assert [res["status"] for res in data["results"]] == ["created", "created", "error", "created"]
+    assert "foreign key" in data["results"][2]["errors"][0]["msg"]
+    assert sorted(emitted) == sorted(res["id"] for res in data["results"] if res["status"] == "created")
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT applicant_data->>'name' FROM applications WHERE tenant_id = %s ORDER BY 1",
+                (tenant_id,),
+            )
+            assert [row[0] for row in cur.fetchall()] == ["A", "B", "D"]
+
+
+def test_batch_ndjson_streams_per_line_results(emitted: list[str]):
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    lines = [
+        json.dumps(_payload(tenant_id, "Đorđe")),
+        "{not json",
+        "",
+        json.dumps(_payload(tenant_id, "Ana")),
+        json.dumps(_payload(tenant_id, "Zero", financial_data={
+            "net_monthly_income": 0,
+            "monthly_obligations": 0,
+            "existing_loans_payment": 0,
+        })),
+    ]
+    body = "\n".join(lines).encode()
+
+    r = client.post(
+        "/api/v1/applications:batch-ndjson",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+
+    results = [json.loads(line) for line in r.text.splitlines()]
+    assert [res["index"] for res in results] == [0, 1, 2, 3]
+    assert [res["status"] for res in results] == ["created", "error", "created", "error"]
+    assert len(emitted) == 2
+
+
+def test_batch_ndjson_rejects_overlong_lines(emitted: list[str], monkeypatch: pytest.MonkeyPatch):
+    from src.api.v1.endpoints import applications as applications_endpoint
+
+    monkeypatch.setattr(applications_endpoint, "MAX_NDJSON_LINE_BYTES", 1000)
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    def stream():
+        yield (json.dumps(_payload(tenant_id, "A")) + "\n").encode()
+        # An overlong line split across reads, with no newline for a while.
+        for _ in range(3):
+            yield b"x" * 600
+        yield b"x\n" + json.dumps(_payload(tenant_id, "B")).encode()
+
+    r = client.post(
+        "/api/v1/applications:batch-ndjson",
+        content=stream(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200, r.text
+
+    results = [json.loads(line) for line in r.text.splitlines()]
+    assert [(res["index"], res["status"]) for res in results] == [(0, "created"), (1, "error"), (2, "created")]
+    assert "exceeds 1000 bytes" in results[1]["errors"][0]["msg"]
+    assert len(emitted) == 2
@@ -182,3 +182,60 @@ def test_get_application_404_when_bad_id_format():
 
     r = client.get("/api/v1/applications/not-a-uuid")
     assert r.status_code == 404
+
+
+def test_get_application_includes_queue_info_and_similar_cases_in_one_query():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    payload = {
+        "tenant_id": str(tenant_id),
+        "external_id": None,
+        "applicant_data": {"name": "Jane"},
+        "financial_data": {
+            "net_monthly_income": 1000,
+            "monthly_obligations": 200,
+            "existing_loans_payment": 100,
+        },
+        "loan_request": {"loan_amount": 12000, "estimated_payment": 300},
+        "credit_bureau_data": None,
+        "source": "web",
+    }
+
+    created = client.post("/api/v1/applications", json=payload)
+    assert created.status_code == 201, created.text
+    app_id = uuid.UUID(created.json()["id"])
+
+    scoring_id = _insert_scoring_result(application_id=app_id)
+    queue_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline)
+                VALUES (%s, %s, 40, 'pending', NOW() + interval '8 hours')
+                """,
+                (queue_id, app_id),
+            )
+            for match_score in (0.7, 0.9):
+                cur.execute(
+                    """
+                    INSERT INTO similar_cases (
+                      id, application_id, matched_application_id, match_score,
+                      features_snapshot, outcome_snapshot
+                    ) VALUES (%s, %s, %s, %s, %s, %s)
+                    """,
+                    (uuid.uuid4(), app_id, uuid.uuid4(), match_score, Json({"dti_ratio": 0.3}), Json({"defaulted": False})),
+                )
+        conn.commit()
+
+    r = client.get(f"/api/v1/applications/{app_id}?tenant_id={tenant_id}")
+    assert r.status_code == 200, r.text
+    assert r.headers["X-DB-Query-Count"] == "1"
+
+    data = r.json()
+    assert data["scoring_result"]["id"] == str(scoring_id)
+    assert data["queue_info"]["id"] == str(queue_id)
+    assert data["queue_info"]["priority"] == 40
+    assert [c["match_score"] for c in data["similar_cases"]] == [0.9, 0.7]
+    assert data["similar_cases"][0]["outcome_snapshot"] == {"defaulted": False}
@@ -0,0 +1,145 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import psycopg
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.scripts.backfill_latest_scores import backfill_latest_scores
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _create_application(client: TestClient, *, tenant_id: uuid.UUID) -> str:
+    payload = {
+        "tenant_id": str(tenant_id),
+        "external_id": None,
+        "applicant_data": {"name": "Jane"},
+        "financial_data": {
+            "net_monthly_income": 1000,
+            "monthly_obligations": 200,
+            "existing_loans_payment": 100,
+        },
+        "loan_request": {"loan_amount": 12000, "estimated_payment": 300},
+        "credit_bureau_data": None,
+        "source": "web",
+    }
+    r = client.post("/api/v1/applications", json=payload)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _insert_score(
+    cur, *, application_id: str, score: int, created_at: datetime, scoring_id: uuid.UUID | None = None
+) -> uuid.UUID:
+    scoring_id = scoring_id or uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO scoring_results (
+          id, application_id, model_id, model_version,
+          score, probability_default, risk_category, routing_decision,
+          features, shap_values, top_factors, scoring_time_ms, created_at
+        ) VALUES (%s, %s, 'demo', 'v1', %s, 0.1, 'medium', 'human_review',
+                  '{}'::jsonb, '{}'::jsonb, '{}'::jsonb, 1, %s)
+        """,
+        (scoring_id, application_id, score, created_at),
+    )
+    return scoring_id
+
+
+def _latest(cur, application_id: str) -> tuple:
+    cur.execute(
+        "SELECT latest_scoring_result_id, latest_score, updated_at FROM applications WHERE id = %s",
+        (application_id,),
+    )
+    return cur.fetchone()
+
+
+def test_latest_score_follows_newest_result_and_not_updated_at():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+    app_id = _create_application(client, tenant_id=tenant_id)
+
+    now = datetime.now(timezone.utc)
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            _, _, updated_at_before = _latest(cur, app_id)
+
+            newer = _insert_score(cur, application_id=app_id, score=650, created_at=now)
+            # Backdated result must not replace the newer one.
+            older = _insert_score(cur, application_id=app_id, score=900, created_at=now - timedelta(days=1))
+
+            latest_id, latest_score, updated_at_after = _latest(cur, app_id)
+            assert (latest_id, latest_score) == (newer, 650)
+            assert updated_at_after == updated_at_before
+
+            cur.execute("DELETE FROM scoring_results WHERE id = %s", (newer,))
+            assert _latest(cur, app_id)[:2] == (older, 900)
+        conn.commit()
+
+    r = client.get(f"/api/v1/applications/{app_id}")
+    assert r.status_code == 200, r.text
+    assert r.json()["scoring_result"]["id"] == str(older)
+
+    listing = client.get(f"/api/v1/applications?tenant_id={tenant_id}")
+    assert listing.json()["items"][0]["latest_score"] == 900
+
+
+def test_equal_created_at_ties_break_on_id_on_every_path():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+    app_id = _create_application(client, tenant_id=tenant_id)
+
+    now = datetime.now(timezone.utc)
+    high, low = uuid.UUID(int=2**128 - 1 - uuid.uuid4().int % 2**64), uuid.UUID(int=uuid.uuid4().int % 2**64)
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            _insert_score(cur, application_id=app_id, score=700, created_at=now, scoring_id=high)
+            _insert_score(cur, application_id=app_id, score=500, created_at=now, scoring_id=low)
+            assert _latest(cur, app_id)[:2] == (high, 700)
+
+            # refresh_application_latest_score() (UPDATE/DELETE path; same order as the backfill) agrees.
+            cur.execute("SELECT refresh_application_latest_score(%s)", (app_id,))
+            assert _latest(cur, app_id)[:2] == (high, 700)
+        conn.commit()
+
+
+def test_backfill_latest_scores_fills_missing_columns():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+    app_id = _create_application(client, tenant_id=tenant_id)
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            scoring_id = _insert_score(cur, application_id=app_id, score=720, created_at=datetime.now(timezone.utc))
+            # Simulate a row that predates migration 010.
+            cur.execute(
+                "UPDATE applications SET latest_scoring_result_id = NULL, latest_score = NULL, latest_scored_at = NULL WHERE id = %s",
+                (app_id,),
+            )
+        conn.commit()
+
+    assert backfill_latest_scores(os.environ["DATABASE_URL"], batch_size=2) >= 1
+    # Idempotent: a second run has nothing left to do for this row.
+    backfill_latest_scores(os.environ["DATABASE_URL"], batch_size=2)
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            assert _latest(cur, app_id)[:2] == (scoring_id, 720)
@@ -252,3 +252,39 @@ def test_list_applications_sorts_by_score_desc_with_nulls_last():
 
     ids = [i["id"] for i in r.json()["items"]]
     assert ids[:3] == [a_high, a_low, a_none]
+
+
+def test_list_applications_filters_by_amount_range():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    ids = {}
+    for name, amount in (("Small", 1000), ("Mid", 5000), ("Big", 20000)):
+        payload = {
+            "tenant_id": str(tenant_id),
+            "external_id": None,
+            "applicant_data": {"name": name},
+            "financial_data": {
+                "net_monthly_income": 1000,
+                "monthly_obligations": 200,
+                "existing_loans_payment": 100,
+            },
+            "loan_request": {"loan_amount": amount, "estimated_payment": 50},
+            "credit_bureau_data": None,
+            "source": "web",
+        }
+        r = client.post("/api/v1/applications", json=payload)
+        assert r.status_code == 201, r.text
+        ids[name] = r.json()["id"]
+
+    r = client.get(
+        f"/api/v1/applications?tenant_id={tenant_id}&min_amount=1000&max_amount=5000&sort_by=amount&sort_order=desc"
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["total"] == 2
+    assert [i["id"] for i in data["items"]] == [ids["Mid"], ids["Small"]]
+    assert [i["loan_amount"] for i in data["items"]] == [5000, 1000]
+
+    r_bad = client.get(f"/api/v1/applications?tenant_id={tenant_id}&min_amount=10&max_amount=1")
+    assert r_bad.status_code == 422
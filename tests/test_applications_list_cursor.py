@@ -0,0 +1,142 @@
+import os
+import uuid
+
+import psycopg
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _create_application(client: TestClient, *, tenant_id: uuid.UUID, loan_amount: int) -> str:
+    payload = {
+        "tenant_id": str(tenant_id),
+        "external_id": None,
+        "applicant_data": {"name": "Cursor"},
+        "financial_data": {
+            "net_monthly_income": 1000,
+            "monthly_obligations": 200,
+            "existing_loans_payment": 100,
+        },
+        "loan_request": {
+            "loan_amount": loan_amount,
+            "estimated_payment": 300,
+        },
+        "credit_bureau_data": None,
+        "source": "web",
+    }
+
+    r = client.post("/api/v1/applications", json=payload)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _insert_score(application_id: str, score: int) -> None:
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO scoring_results (
+                  id, application_id, model_id, model_version,
+                  score, probability_default, risk_category, routing_decision,
+                  features, shap_values, top_factors, scoring_time_ms
+                ) VALUES (%s, %s, 'demo', 'v1', %s, 0.1, 'medium', 'human_review',
+                          '{}'::jsonb, '{}'::jsonb, '{}'::jsonb, 1)
+                """,
+                (uuid.uuid4(), application_id, score),
+            )
+        conn.commit()
+
+
+def _walk(client: TestClient, query: str) -> list[str]:
+    ids: list[str] = []
+    cursor = None
+    for _ in range(20):
+        url = f"/api/v1/applications?{query}&page_size=2&total_mode=none"
+        if cursor:
+            url += f"&cursor={cursor}"
+        r = client.get(url)
+        assert r.status_code == 200, r.text
+        data = r.json()
+        assert data["total"] is None
+        ids.extend(i["id"] for i in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    return ids
+
+
+def test_cursor_pagination_matches_offset_order_for_every_sort():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    # Duplicate amounts exercise the id tie-breaker.
+    created = [
+        _create_application(client, tenant_id=tenant_id, loan_amount=amount)
+        for amount in (500, 900, 900, 100, 700)
+    ]
+    _insert_score(created[0], 600)
+    _insert_score(created[1], 800)
+    _insert_score(created[2], 800)
+    # created[3] and created[4] have no score (NULLS LAST tail).
+
+    for sort_by in ("created_at", "amount", "score"):
+        for sort_order in ("asc", "desc"):
+            query = f"tenant_id={tenant_id}&sort_by={sort_by}&sort_order={sort_order}"
+
+            full = client.get(f"/api/v1/applications?{query}&page_size=100")
+            assert full.status_code == 200, full.text
+            expected = [i["id"] for i in full.json()["items"]]
+
+            assert _walk(client, query) == expected, (sort_by, sort_order)
+            assert sorted(expected) == sorted(created)
+
+
+def test_cursor_rejected_when_malformed_or_sort_changes():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    for amount in (100, 200, 300):
+        _create_application(client, tenant_id=tenant_id, loan_amount=amount)
+
+    r = client.get(f"/api/v1/applications?tenant_id={tenant_id}&page_size=1")
+    assert r.status_code == 200, r.text
+    cursor = r.json()["next_cursor"]
+    assert cursor
+
+    r_bad = client.get(f"/api/v1/applications?tenant_id={tenant_id}&cursor=not-a-cursor")
+    assert r_bad.status_code == 422
+
+    r_other_sort = client.get(f"/api/v1/applications?tenant_id={tenant_id}&sort_by=amount&cursor={cursor}")
+    assert r_other_sort.status_code == 422
+
+
+def test_total_mode_estimate_and_invalid_total_mode():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    _create_application(client, tenant_id=tenant_id, loan_amount=100)
+
+    r = client.get(f"/api/v1/applications?tenant_id={tenant_id}&total_mode=estimate")
+    assert r.status_code == 200, r.text
+    assert isinstance(r.json()["total"], int)
+
+    r_bad = client.get(f"/api/v1/applications?tenant_id={tenant_id}&total_mode=bogus")
+    assert r_bad.status_code == 422
@@ -0,0 +1,104 @@
+import os
+import uuid
+
+import psycopg
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _create_application(
+    client: TestClient,
+    *,
+    tenant_id: uuid.UUID,
+    applicant_name: str,
+    external_id: str | None = None,
+) -> str:
+    payload = {
+        "tenant_id": str(tenant_id),
+        "external_id": external_id,
+        "applicant_data": {"name": applicant_name},
+        "financial_data": {
+            "net_monthly_income": 1000,
+            "monthly_obligations": 200,
+            "existing_loans_payment": 100,
+        },
+        "loan_request": {
+            "loan_amount": 12000,
+            "estimated_payment": 300,
+        },
+        "credit_bureau_data": None,
+        "source": "web",
+    }
+
+    r = client.post("/api/v1/applications", json=payload)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _search(client: TestClient, tenant_id: uuid.UUID, term: str, **params) -> list[str]:
+    r = client.get("/api/v1/applications", params={"tenant_id": str(tenant_id), "search": term, **params})
+    assert r.status_code == 200, r.text
+    return [i["id"] for i in r.json()["items"]]
+
+
+def test_search_is_diacritic_and_case_insensitive():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    djordje = _create_application(client, tenant_id=tenant_id, applicant_name="Đorđe Petrović")
+    _create_application(client, tenant_id=tenant_id, applicant_name="Ana Jovanović")
+
+    assert _search(client, tenant_id, "djordje petrovic") == [djordje]
+    assert _search(client, tenant_id, "PETROVIĆ") == [djordje]
+    # Prefix match on each word.
+    assert _search(client, tenant_id, "petro") == [djordje]
+    # Nothing searchable: no filter (as the old ILIKE search).
+    assert sorted(_search(client, tenant_id, "&|!:*")) == sorted(_search(client, tenant_id, "  "))
+    assert len(_search(client, tenant_id, "&|!:*")) == 2
+
+
+def test_search_external_id_prefix_fast_path():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    a1 = _create_application(client, tenant_id=tenant_id, applicant_name="A", external_id="PARTNER-1001")
+    a2 = _create_application(client, tenant_id=tenant_id, applicant_name="B", external_id="PARTNER-1002")
+    _create_application(client, tenant_id=tenant_id, applicant_name="C", external_id="PARTNER-2001")
+
+    assert _search(client, tenant_id, "partner-1001") == [a1]
+    assert sorted(_search(client, tenant_id, "PARTNER-100")) == sorted([a1, a2])
+    # Prefix, not substring.
+    assert _search(client, tenant_id, "1001") == []
+
+
+def test_search_relevance_sort():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    both = _create_application(client, tenant_id=tenant_id, applicant_name="Marko Marković")
+    one = _create_application(client, tenant_id=tenant_id, applicant_name="Marko Ilić")
+
+    ids = _search(client, tenant_id, "marko", sort_by="relevance")
+    assert ids == [both, one]
+
+    r = client.get("/api/v1/applications", params={"tenant_id": str(tenant_id), "sort_by": "relevance"})
+    assert r.status_code == 422
@@ -0,0 +1,160 @@
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import psycopg
+import pytest
+
+from src.tasks.audit_partitions import maintain_audit_partitions, retention_cutoff
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        conn.execute(
+            "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+            (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+        )
+    return tenant_id
+
+
+def _insert_audit(cur, tenant_id: uuid.UUID, created_at: datetime | None = None) -> str:
+    """Insert one audit row; returns the partition it landed in."""
+
+    cur.execute(
+        """
+        INSERT INTO audit_logs (id, tenant_id, entity_type, entity_id, action, created_at)
+        VALUES (%s, %s, 'application', %s, 'create', COALESCE(%s, NOW()))
+        RETURNING tableoid::regclass::text
+        """,
+        (uuid.uuid4(), tenant_id, uuid.uuid4(), created_at),
+    )
+    return cur.fetchone()[0]
+
+
+def _partitions(cur) -> set[str]:
+    cur.execute(
+        """
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'audit_logs'::regclass
+        """
+    )
+    return {name for (name,) in cur.fetchall()}
+
+
+def test_partitions_are_created_ahead_and_rows_route_by_month():
+    tenant_id = _create_tenant()
+    with psycopg.connect(_sync_dsn()) as conn:
+        maintain_audit_partitions(conn, months_ahead=3)
+        # Idempotent: nothing left to create.
+        assert maintain_audit_partitions(conn, months_ahead=3) == {"created": [], "dropped": []}
+
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT to_char(date_trunc('month', NOW() AT TIME ZONE 'UTC') + m * INTERVAL '1 month', 'YYYYMM')
+                FROM generate_series(0, 3) AS m
+                """
+            )
+            expected = {f"audit_logs_p{month}" for (month,) in cur.fetchall()}
+            assert expected <= _partitions(cur)
+
+            this_month = datetime.now(timezone.utc).strftime("%Y%m")
+            assert _insert_audit(cur, tenant_id) == f"audit_logs_p{this_month}"
+        conn.commit()
+
+
+def test_default_partition_rows_move_and_retention_drops_whole_months():
+    tenant_id = _create_tenant()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            # No partition for 2001 yet: the row is kept in the default partition.
+            stray = datetime(2001, 3, 15, tzinfo=timezone.utc)
+            assert _insert_audit(cur, tenant_id, stray) == "audit_logs_default"
+            conn.commit()
+
+            cur.execute("SELECT create_audit_log_partition('2001-03-01')")
+            assert cur.fetchone()[0] == "audit_logs_p200103"
+            cur.execute(
+                "SELECT tableoid::regclass::text, count(*) FROM audit_logs WHERE tenant_id = %s GROUP BY 1",
+                (tenant_id,),
+            )
+            assert cur.fetchall() == [("audit_logs_p200103", 1)]
+            # Indexes and primary key came along with the attach.
+            cur.execute("SELECT count(*) FROM pg_indexes WHERE tablename = 'audit_logs_p200103'")
+            assert cur.fetchone()[0] == 3
+            conn.commit()
+
+            # Ends at 2001-04-01: kept by an earlier cutoff, dropped at it.
+            cur.execute("SELECT drop_audit_log_partitions('2001-03-31T23:59:59Z')")
+            assert cur.fetchall() == []
+            cur.execute("SELECT drop_audit_log_partitions('2001-04-01T00:00:00Z')")
+            assert cur.fetchall() == [("audit_logs_p200103",)]
+            assert "audit_logs_p200103" not in _partitions(cur)
+            cur.execute("SELECT count(*) FROM audit_logs WHERE tenant_id = %s", (tenant_id,))
+            assert cur.fetchone()[0] == 0
+        conn.commit()
+
+
+def _brin_state(cur) -> tuple[bool, int, int]:
+    """(parent index valid, attached partition indexes, partitions)."""
+
+    cur.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = 'idx_audit_created_brin'::regclass")
+    (valid,) = cur.fetchone()
+    cur.execute("SELECT count(*) FROM pg_inherits WHERE inhparent = 'idx_audit_created_brin'::regclass")
+    (attached,) = cur.fetchone()
+    return valid, attached, len(_partitions(cur))
+
+
+def test_optional_brin_index():
+    with psycopg.connect(_sync_dsn()) as conn:
+        maintain_audit_partitions(conn, brin=True)
+        with conn.cursor() as cur:
+            cur.execute("SELECT indexdef FROM pg_indexes WHERE indexname = 'idx_audit_created_brin'")
+            assert "ON ONLY public.audit_logs USING brin (created_at)" in cur.fetchone()[0]
+            valid, attached, partitions = _brin_state(cur)
+            assert valid and attached == partitions
+        conn.commit()
+
+        # Built per partition, then attached; later partitions inherit it.
+        maintain_audit_partitions(conn, months_ahead=5, brin=True)
+        with conn.cursor() as cur:
+            valid, attached, partitions = _brin_state(cur)
+            assert valid and attached == partitions
+        conn.commit()
+
+        maintain_audit_partitions(conn, brin=False)
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('idx_audit_created_brin')")
+            assert cur.fetchone()[0] is None
+
+
+def test_retention_cutoff_is_a_utc_month_start_in_any_session_time_zone():
+    with psycopg.connect(_sync_dsn()) as conn:
+        conn.execute("SET TIME ZONE 'America/New_York'")
+        conn.commit()
+        cutoff = retention_cutoff(conn, 2)
+    now = datetime.now(timezone.utc)
+    months = now.year * 12 + now.month - 1 - 2
+    assert cutoff == datetime(months // 12, months % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def test_lock_timeout_gives_up_then_retries_instead_of_queueing():
+    tenant_id = _create_tenant()
+    with psycopg.connect(_sync_dsn()) as blocker, psycopg.connect(_sync_dsn()) as conn:
+        # An open transaction holding ROW EXCLUSIVE on audit_logs (an insert).
+        with blocker.cursor() as cur:
+            _insert_audit(cur, tenant_id)
+        with pytest.raises(psycopg.errors.LockNotAvailable):
+            maintain_audit_partitions(conn, brin=True, lock_timeout_ms=50, attempts=2, retry_seconds=0)
+
+        threading.Timer(0.3, blocker.commit).start()
+        maintain_audit_partitions(conn, brin=True, lock_timeout_ms=50, attempts=20, retry_seconds=0.05)
+        maintain_audit_partitions(conn, brin=False)
@@ -0,0 +1,151 @@
+import os
+import uuid
+
+import psycopg
+from fastapi.testclient import TestClient
+
+from src.audit.writer import AuditEvent, AuditWriter, get_audit_writer
+from src.main import app
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _events(tenant_id: uuid.UUID, n: int) -> list[AuditEvent]:
+    return [
+        AuditEvent(
+            tenant_id=tenant_id,
+            entity_type="application",
+            entity_id=uuid.uuid4(),
+            action="update",
+            old_value={"status": "pending"},
+            new_value={"status": "review", "i": i},
+        )
+        for i in range(n)
+    ]
+
+
+def _count(tenant_id: uuid.UUID) -> int:
+    with psycopg.connect(_sync_dsn()) as conn:
+        return conn.execute("SELECT count(*) FROM audit_logs WHERE tenant_id = %s", (tenant_id,)).fetchone()[0]
+
+
+class _PausedWriter(AuditWriter):
+    """Flusher not started until resume(): the buffer only fills."""
+
+    def _ensure_started(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        AuditWriter._ensure_started(self)
+
+
+def test_create_application_audit_row_carries_request_context():
+    tenant_id = _create_tenant()
+    request_id = uuid.uuid4()
+    client = TestClient(app)
+    r = client.post(
+        "/api/v1/applications",
+        json={
+            "tenant_id": str(tenant_id),
+            "applicant_data": {"name": "Jane"},
+            "financial_data": {"net_monthly_income": 1000, "monthly_obligations": 200, "existing_loans_payment": 100},
+            "loan_request": {"loan_amount": 12000, "estimated_payment": 300},
+        },
+        headers={"X-Request-ID": str(request_id), "User-Agent": "audit-test/1.0"},
+    )
+    assert r.status_code == 201, r.text
+    assert get_audit_writer().flush()
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        row = conn.execute(
+            """
+            SELECT action, entity_id, request_id, user_agent, ip_address, new_value->>'status', created_at <= NOW()
+            FROM audit_logs WHERE tenant_id = %s
+            """,
+            (tenant_id,),
+        ).fetchall()
+    # TestClient's client host ("testclient") is not an IP address.
+    assert row == [("create", uuid.UUID(r.json()["id"]), request_id, "audit-test/1.0", None, "pending", True)]
+
+
+def test_writer_flushes_in_batches():
+    tenant_id = _create_tenant()
+    writer = AuditWriter(os.environ["DATABASE_URL"], batch_size=100, flush_ms=50)
+    try:
+        writer.submit(_events(tenant_id, 1000))
+        assert writer.flush()
+        stats = writer.stats()
+    finally:
+        writer.close()
+    assert _count(tenant_id) == 1000
+    assert stats["written"] == 1000 and stats["inline"] == 0 and stats["pending"] == 0
+    assert 10 <= stats["batches"] < 1000
+
+
+def test_full_buffer_writes_inline_and_bad_rows_are_isolated():
+    tenant_id = _create_tenant()
+    writer = _PausedWriter(os.environ["DATABASE_URL"], max_buffer=5)
+    good = _events(tenant_id, 7)
+    # An event for an unknown tenant (FK) must not fail the rest of its batch.
+    bad = _events(uuid.uuid4(), 1)
+    try:
+        writer.submit(good[:4] + bad + good[4:])
+        # Backpressure: the 3 that did not fit were written by the caller.
+        assert writer.stats()["inline"] == 3
+        assert _count(tenant_id) == 3
+
+        writer.resume()
+        assert writer.flush()
+        stats = writer.stats()
+    finally:
+        writer.close()
+    assert _count(tenant_id) == 7
+    assert stats["written"] == 4 and stats["dropped"] == 1
+
+
+def test_unencodable_values_are_dropped_and_the_flusher_keeps_running(monkeypatch):
+    import src.audit.writer as audit_writer
+
+    tenant_id = _create_tenant()
+    good = _events(tenant_id, 4)
+    bad = _events(tenant_id, 1)
+    bad[0].new_value = {"score": uuid.uuid4()}  # not JSON-serializable
+    writer = AuditWriter(os.environ["DATABASE_URL"], flush_ms=50, retry_seconds=60)
+    try:
+        writer.submit(good[:2] + bad + good[2:])
+        assert writer.flush()
+        assert _count(tenant_id) == 4
+        assert writer.stats()["dropped"] == 1
+
+        # A non-connection error drops the batch instead of retrying it forever.
+        def fail(conn, events):
+            raise psycopg.ProgrammingError("boom")
+
+        monkeypatch.setattr(audit_writer, "write_events", fail)
+        writer.submit(_events(tenant_id, 3))
+        assert writer.flush(timeout=5)
+        monkeypatch.undo()
+
+        writer.submit(_events(tenant_id, 2))
+        assert writer.flush()
+        stats = writer.stats()
+    finally:
+        writer.close()
+    assert _count(tenant_id) == 6
+    assert stats["written"] == 6 and stats["dropped"] == 4
@@ -0,0 +1,156 @@
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+import psycopg
+
+import src.tasks.auto_assign as auto_assign
+from src.tasks.auto_assign import Analyst, PendingCase, auto_assign_cases, plan_assignments
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(cur) -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+    )
+    return tenant_id
+
+
+def _create_user(cur, tenant_id: uuid.UUID, *, role: str = "analyst", skills: list[str] | None = None) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    cur.execute(
+        "INSERT INTO users (id, tenant_id, email, role, skills) VALUES (%s, %s, %s, %s, %s)",
+        (user_id, tenant_id, f"user-{user_id.hex[:8]}@example.com", role, skills or []),
+    )
+    return user_id
+
+
+def _create_queue_entry(
+    cur,
+    tenant_id: uuid.UUID,
+    *,
+    sla_hours: float,
+    priority: int = 50,
+    status: str = "pending",
+    analyst_id: uuid.UUID | None = None,
+    required_skill: str | None = None,
+) -> uuid.UUID:
+    app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+        VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, '{}'::jsonb)
+        """,
+        (app_id, tenant_id, f"APP-{app_id.hex[:10]}"),
+    )
+    cur.execute(
+        """
+        INSERT INTO analyst_queues (id, application_id, analyst_id, priority, status, sla_deadline, required_skill)
+        VALUES (%s, %s, %s, %s, %s, NOW() + %s * INTERVAL '1 hour', %s)
+        """,
+        (queue_id, app_id, analyst_id, priority, status, sla_hours, required_skill),
+    )
+    return queue_id
+
+
+def _case(tenant_id: uuid.UUID, priority: int, skill: str | None = None) -> PendingCase:
+    return PendingCase(uuid.uuid4(), tenant_id, uuid.uuid4(), priority, datetime.now(timezone.utc), skill, 1)
+
+
+def test_plan_assignments_balances_load_and_honours_skills_and_tenants():
+    t1, t2 = uuid.uuid4(), uuid.uuid4()
+    idle = Analyst(uuid.uuid4(), t1)
+    busy_specialist = Analyst(uuid.uuid4(), t1, ("high_value_loan",), active_cases=3)
+    other_tenant = Analyst(uuid.uuid4(), t2)
+    cases = [_case(t1, 10, "high_value_loan"), _case(t1, 20, "high_value_loan")]
+    cases += [_case(t1, 30 + i) for i in range(8)] + [_case(t1, 40, "long_term")]
+
+    plan = plan_assignments(cases, [idle, busy_specialist, other_tenant], max_active=5)
+    by_case = {a.case.id: a.analyst_id for a in plan}
+
+    # Skilled entries only go to the specialist (who then has 5).
+    assert by_case[cases[0].id] == by_case[cases[1].id] == busy_specialist.id
+    # Generalist work fills the least-loaded analyst up to the limit.
+    assert [by_case.get(c.id) for c in cases[2:7]] == [idle.id] * 5
+    # Nobody left with capacity / nobody has the skill; tenants never mix.
+    assert cases[7].id not in by_case and cases[10].id not in by_case
+    assert other_tenant.id not in by_case.values()
+
+
+def test_plan_assignments_solves_thousands_of_cases_quickly():
+    tenants = [uuid.uuid4() for _ in range(10)]
+    analysts = [Analyst(uuid.uuid4(), t, ("high_value_loan",) if i % 4 == 0 else (), i % 5) for t in tenants for i in range(100)]
+    cases = [_case(tenants[i % 10], i % 100, "high_value_loan" if i % 7 == 0 else None) for i in range(5000)]
+
+    start = time.perf_counter()
+    plan = plan_assignments(cases, analysts, max_active=5)
+    elapsed = time.perf_counter() - start
+
+    assert len(plan) == sum(5 - a.active_cases for a in analysts)
+    assert elapsed < 0.5
+
+
+def test_auto_assign_cases_assigns_due_entries_with_optimistic_checks(monkeypatch):
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            tenant_id = _create_tenant(cur)
+            analyst = _create_user(cur, tenant_id)
+            specialist = _create_user(cur, tenant_id, skills=["high_value_loan"])
+            _create_user(cur, tenant_id, role="admin")  # not assignable
+            for _ in range(4):
+                _create_queue_entry(cur, tenant_id, sla_hours=8, status="assigned", analyst_id=specialist)
+
+            skilled = _create_queue_entry(cur, tenant_id, sla_hours=1, priority=10, required_skill="high_value_loan")
+            urgent = _create_queue_entry(cur, tenant_id, sla_hours=1, priority=20)
+            changed = _create_queue_entry(cur, tenant_id, sla_hours=2, priority=30)
+            not_due = _create_queue_entry(cur, tenant_id, sla_hours=24, priority=1)
+        conn.commit()
+
+        planner = auto_assign.plan_assignments
+
+        def plan_then_touch(*args, **kwargs):
+            plan = planner(*args, **kwargs)
+            # Another writer updates an entry between load and commit.
+            with psycopg.connect(_sync_dsn()) as other:
+                other.execute("UPDATE analyst_queues SET priority = 5 WHERE id = %s", (changed,))
+            return plan
+
+        monkeypatch.setattr(auto_assign, "plan_assignments", plan_then_touch)
+        result = auto_assign_cases(conn, tenant_id=tenant_id, horizon_hours=4)
+
+        assert (result.cases, result.analysts) == (3, 2)
+        assert (result.assigned, result.version_conflicts, result.unassigned) == (2, 1, 0)
+        assert set(result.timings_ms) == {"load", "solve", "commit", "total"}
+
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, status, analyst_id FROM analyst_queues WHERE id = ANY(%s)",
+                ([skilled, urgent, changed, not_due],),
+            )
+            rows = {row[0]: row[1:] for row in cur.fetchall()}
+            assert rows[skilled] == ("assigned", specialist)
+            assert rows[urgent] == ("assigned", analyst)
+            assert rows[changed] == ("pending", None)
+            assert rows[not_due] == ("pending", None)
+
+            cur.execute(
+                "SELECT count(*) FROM audit_logs WHERE tenant_id = %s AND entity_type = 'analyst_queue' AND action = 'assign'",
+                (tenant_id,),
+            )
+            assert cur.fetchone()[0] == 2
+
+        monkeypatch.setattr(auto_assign, "plan_assignments", planner)
+        # Next run picks up the changed entry; the specialist is now full.
+        result = auto_assign_cases(conn, tenant_id=tenant_id, horizon_hours=4)
+        assert (result.cases, result.assigned) == (1, 1)
+        with conn.cursor() as cur:
+            cur.execute("SELECT analyst_id FROM analyst_queues WHERE id = %s", (changed,))
+            assert cur.fetchone()[0] == analyst
@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import psycopg
+import pytest
+from psycopg.types.json import Jsonb
+
+from src.tasks.batch_scoring import MicroBatcher, score_applications
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant_with_threshold(rules: dict) -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+            cur.execute(
+                "INSERT INTO users (id, tenant_id, email) VALUES (%s, %s, %s)",
+                (user_id, tenant_id, f"user-{user_id.hex[:8]}@example.com"),
+            )
+            cur.execute(
+                """
+                INSERT INTO decision_thresholds (
+                    id, tenant_id, name, auto_approve_min, auto_decline_max,
+                    rules, is_active, effective_from, created_by
+                ) VALUES (%s, %s, 'Default', 700, 500, %s, true, %s, %s)
+                """,
+                (uuid.uuid4(), tenant_id, Jsonb(rules), datetime.now(timezone.utc) - timedelta(days=1), user_id),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _create_application(cur, tenant_id: uuid.UUID, *, income: float, obligations: float, amount: float, payment: float, **loan) -> uuid.UUID:
+    app_id = uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (
+          id, tenant_id, external_id, status, applicant_data, financial_data, loan_request, source
+        ) VALUES (%s, %s, %s, 'pending', '{"name": "T"}'::jsonb, %s, %s, 'web')
+        """,
+        (
+            app_id,
+            tenant_id,
+            f"APP-{app_id.hex[:10]}",
+            Jsonb({"net_monthly_income": income, "monthly_obligations": obligations, "existing_loans_payment": 0}),
+            Jsonb({"loan_amount": amount, "estimated_payment": payment, **loan}),
+        ),
+    )
+    return app_id
+
+
+def test_score_applications_scores_and_routes_a_batch():
+    tenant_id = _create_tenant_with_threshold({"max_term_months_auto": 60})
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            strong = _create_application(cur, tenant_id, income=5000, obligations=100, amount=3000, payment=150)
+            weak = _create_application(cur, tenant_id, income=1000, obligations=900, amount=60000, payment=800)
+            borderline = _create_application(cur, tenant_id, income=1000, obligations=300, amount=12000, payment=300)
+            long_term = _create_application(
+                cur, tenant_id, income=5000, obligations=100, amount=3000, payment=150, term_months=84
+            )
+        conn.commit()
+
+        ids = [strong, weak, borderline, long_term]
+        routed = score_applications(conn, ids + [uuid.uuid4()])
+        assert routed == {
+            strong: "auto_approve",
+            weak: "auto_decline",
+            borderline: "human_review",
+            long_term: "human_review",
+        }
+
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, status, latest_score IS NOT NULL FROM applications WHERE id = ANY(%s)",
+                (ids,),
+            )
+            assert {row[0]: row[1:] for row in cur.fetchall()} == {
+                strong: ("approved", True),
+                weak: ("declined", True),
+                borderline: ("review", True),
+                long_term: ("review", True),
+            }
+
+            cur.execute(
+                "SELECT application_id, decision_type, decision_outcome FROM decisions WHERE application_id = ANY(%s)",
+                (ids,),
+            )
+            assert sorted(cur.fetchall()) == sorted(
+                [(strong, "auto_approve", "approved"), (weak, "auto_decline", "declined")]
+            )
+
+            cur.execute(
+                "SELECT application_id, routing_reason, priority FROM analyst_queues WHERE application_id = ANY(%s)",
+                (ids,),
+            )
+            queued = {row[0]: row[1:] for row in cur.fetchall()}
+            assert queued == {borderline: ("borderline_score", 50), long_term: ("long_term", 50)}
+
+        # Redelivery is a no-op: nothing is pending any more.
+        assert score_applications(conn, ids) == {}
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM scoring_results WHERE application_id = ANY(%s)", (ids,))
+            assert cur.fetchone()[0] == 4
+
+
+def test_micro_batcher_flushes_on_size_and_on_timeout():
+    batches: list[list[int]] = []
+
+    def handler(items: list[int]) -> dict[int, int]:
+        batches.append(items)
+        return {i: i * 10 for i in items}
+
+    batcher = MicroBatcher(handler, max_items=4, max_wait_ms=200)
+
+    futures = {}
+    threads = [threading.Thread(target=lambda i=i: futures.__setitem__(i, batcher.submit(i))) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert {i: f.result(timeout=5) for i, f in futures.items()} == {0: 0, 1: 10, 2: 20, 3: 30}
+    assert sorted(batches[0]) == [0, 1, 2, 3]
+
+    started = time.monotonic()
+    assert batcher.submit(7).result(timeout=5) == 70
+    assert time.monotonic() - started >= 0.15
+    assert batches[-1] == [7]
+
+
+def test_micro_batcher_isolates_a_failing_item():
+    batches: list[list[int]] = []
+    release = threading.Event()
+
+    def handler(items: list[int]) -> dict[int, int]:
+        release.wait(5)
+        batches.append(items)
+        if 3 in items:
+            raise ValueError("bad item")
+        return {i: i * 10 for i in items}
+
+    batcher = MicroBatcher(handler, max_items=4, max_wait_ms=200)
+    futures = {i: batcher.submit(i) for i in range(4)}
+    release.set()
+
+    assert {i: futures[i].result(timeout=5) for i in range(3)} == {0: 0, 1: 10, 2: 20}
+    with pytest.raises(ValueError):
+        futures[3].result(timeout=5)
+    assert sorted(batches[0]) == [0, 1, 2, 3]
+    assert batches[1:] == [[0], [1], [2], [3]]
@@ -210,3 +210,31 @@ def test_threshold_range_check_constraint_blocks_invalid_ranges():
                 )
 
         conn.rollback()
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("12000", 12000),
+        (" 1.5e3 ", 1500),
+        (".5", 0.5),
+        ("abc", None),
+        ("1e400", None),  # exponent out of the guard's range: NULL, not an INSERT error
+        ("1e200000", None),
+        ("9" * 200000, None),
+    ],
+)
+def test_loan_amount_generated_column_never_fails_the_insert(raw, expected):
+    tenant_id, _ = _create_tenant_and_user()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO applications (id, tenant_id, applicant_data, financial_data, loan_request)
+                VALUES (%s, %s, '{}'::jsonb, '{}'::jsonb, jsonb_build_object('loan_amount', %s::text))
+                RETURNING loan_amount
+                """,
+                (uuid.uuid4(), tenant_id, raw),
+            )
+            assert cur.fetchone()[0] == expected
+        conn.rollback()
@@ -0,0 +1,104 @@
+import numpy as np
+
+from src.ml.explain import ExplanationCache, explain_batch, quantize_keys
+from src.ml.scoring import baseline_scorecard
+
+
+class CountingExplainer:
+    """Tree-model stand-in: shap_values(X) = 2 * X, recording every batch it explains."""
+
+    model_id = "tree-test"
+    version = "v1"
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        self.calls.append(X.shape[0])
+        return 2 * X
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.ops: list[tuple] = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append((key, value, ex))
+
+    def execute(self):
+        for key, value, ex in self.ops:
+            self.redis.data[key] = value
+            self.redis.ttls[key] = ex
+
+
+def test_explain_batch_only_explains_distinct_misses_and_reports_hit_rate():
+    model = CountingExplainer()
+    cache = ExplanationCache(max_entries=100, quantum=0.01)
+
+    X = np.array([[0.30, 1.0], [0.301, 1.0], [0.50, 2.0]])  # rows 0 and 1 share a bucket
+    first = explain_batch(model, X, cache=cache)
+    assert model.calls == [2]
+    np.testing.assert_allclose(first[0], first[1])
+    np.testing.assert_allclose(first[2], [1.0, 4.0])
+
+    second = explain_batch(model, np.array([[0.5, 2.0], [0.9, 0.1]]), cache=cache)
+    assert model.calls == [2, 1]
+    np.testing.assert_allclose(second[0], first[2])
+
+    stats = cache.stats()
+    assert stats["lru_hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["lookups"] == 4
+    assert stats["hit_rate"] == 0.25
+
+    # Model versions never share explanations.
+    keys_v1 = quantize_keys(X[:1], model_id="m", version="v1", quantum=0.01)
+    keys_v2 = quantize_keys(X[:1], model_id="m", version="v2", quantum=0.01)
+    assert keys_v1 != keys_v2
+
+
+def test_lru_eviction_and_redis_tier_shared_across_processes():
+    redis = FakeRedis()
+    producer = ExplanationCache(max_entries=2, redis_client=redis, ttl_seconds=60)
+    model = CountingExplainer()
+
+    X = np.array([[0.1, 0.0], [0.2, 0.0], [0.3, 0.0]])
+    explain_batch(model, X, cache=producer)
+    assert producer.stats()["lru_size"] == 2
+    assert len(redis.data) == 3
+    assert set(redis.ttls.values()) == {60}
+
+    # A second process (empty LRU) is served from Redis without calling the explainer.
+    consumer = ExplanationCache(max_entries=10, redis_client=redis)
+    other = CountingExplainer()
+    values = explain_batch(other, X, cache=consumer)
+    assert other.calls == []
+    np.testing.assert_allclose(values, 2 * X, rtol=1e-6)
+    assert consumer.stats()["redis_hits"] == 3
+
+
+def test_linear_scorecard_bypasses_cache_with_exact_explanations():
+    model = baseline_scorecard()
+    cache = ExplanationCache()
+    X = np.array([[0.5, 1.2, 0.4, 2.0, 0.2, 0.1, 0.3]])
+
+    values = explain_batch(model, X, cache=cache)
+    np.testing.assert_allclose(values, (X - model.reference) * model.coef)
+    assert cache.stats()["lookups"] == 0
+
+    out = model.score_batch(X)[0]
+    assert set(out.shap_values) == {"dti_ratio", "loan_to_income", "payment_to_income"}
+    assert out.top_factors["factors"][0]["feature"] == "dti_ratio"
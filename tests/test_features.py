@@ -0,0 +1,134 @@
+import math
+import os
+import uuid
+
+import numpy as np
+import psycopg
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.ml.features import FEATURE_NAMES, FeatureExtractor, FeatureStats
+from src.ml.monitoring import feature_drift
+from src.scripts.backfill_features import backfill_features
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+        conn.commit()
+    return tenant_id
+
+
+_PAYLOADS = [
+    {
+        "applicant_data": {"name": "A", "years_employed": 4, "contract_type": "permanent"},
+        "financial_data": {
+            "net_monthly_income": 1000,
+            "monthly_obligations": 200,
+            "existing_loans_payment": 100,
+            "savings": 3000,
+            "existing_loans": 1200,
+        },
+        "loan_request": {"loan_amount": 12000, "estimated_payment": 300},
+        "credit_bureau_data": {"total_balance": 500, "total_credit_limit": 2000},
+    },
+    # Zero income -> income ratios undefined; nested PRD employment layout.
+    {
+        "applicant_data": {"employment": {"years_employed": 2, "contract_type": "temporary"}},
+        "financial_data": {"net_monthly_income": 0, "monthly_obligations": 50},
+        "loan_request": {"loan_amount": "6000", "estimated_payment": None},
+        "credit_bureau_data": {"credit_utilization": 0.9},
+    },
+    # Garbage and missing containers.
+    {"financial_data": {"net_monthly_income": "n/a"}, "loan_request": None, "applicant_data": "oops"},
+    # Income known, loan fields missing: income ratios count them as 0.
+    {"financial_data": {"net_monthly_income": 2000}, "loan_request": {}},
+]
+
+
+def test_batch_and_per_row_agree_and_handle_edge_cases():
+    extractor = FeatureExtractor()
+
+    X = extractor.raw_matrix(_PAYLOADS)
+    assert X.shape == (len(_PAYLOADS), len(FEATURE_NAMES))
+    rows = extractor.to_dicts(X)
+    assert rows == [extractor.extract_one(p) for p in _PAYLOADS]
+
+    assert rows[0] == {
+        "dti_ratio": 0.3,
+        "loan_to_income": 1.0,
+        "payment_to_income": 0.3,
+        "employment_stability": 4.0,
+        "savings_ratio": 0.25,
+        "existing_debt_ratio": 0.1,
+        "credit_utilization": 0.25,
+    }
+    assert rows[1]["dti_ratio"] is None and rows[1]["loan_to_income"] is None
+    assert rows[1]["employment_stability"] == 1.0
+    assert rows[1]["credit_utilization"] == 0.9
+    assert all(v is None for v in rows[2].values())
+    assert (rows[3]["dti_ratio"], rows[3]["loan_to_income"], rows[3]["payment_to_income"]) == (0.0, 0.0, 0.0)
+    assert rows[3]["savings_ratio"] is None
+
+
+def test_imputation_uses_stored_medians():
+    stats = FeatureStats.from_matrix(FeatureExtractor().raw_matrix(_PAYLOADS[:2]))
+    assert stats.medians["credit_utilization"] == (0.25 + 0.9) / 2
+
+    extractor = FeatureExtractor(FeatureStats.from_dict(stats.to_dict()))
+    imputed = extractor.transform(_PAYLOADS)
+    assert not np.isnan(imputed).any()
+    assert imputed[2, FEATURE_NAMES.index("credit_utilization")] == stats.medians["credit_utilization"]
+    assert extractor.extract_one(_PAYLOADS[2], impute=True)["dti_ratio"] == stats.medians["dti_ratio"]
+
+
+def test_feature_drift_flags_shifted_population():
+    rng = np.random.default_rng(0)
+    reference = rng.normal(0.3, 0.05, size=(2000, len(FEATURE_NAMES)))
+    same = rng.normal(0.3, 0.05, size=(2000, len(FEATURE_NAMES)))
+    shifted = same.copy()
+    shifted[:, 0] += 0.1
+
+    assert all(psi < 0.05 for psi in feature_drift(reference, same).values())
+    drift = feature_drift(reference, shifted)
+    assert drift["dti_ratio"] > 0.2
+    assert drift["loan_to_income"] < 0.05
+
+    psi = feature_drift(_PAYLOADS, _PAYLOADS)["credit_utilization"]
+    assert math.isclose(psi, 0.0, abs_tol=1e-9)
+
+
+def test_intake_stores_features_and_backfill_recomputes_them():
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    payload = {"tenant_id": str(tenant_id), "source": "web", **_PAYLOADS[0]}
+    r = client.post("/api/v1/applications", json=payload)
+    assert r.status_code == 201, r.text
+    app_id = r.json()["id"]
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT metadata->'derived' FROM applications WHERE id = %s", (app_id,))
+            assert cur.fetchone()[0]["savings_ratio"] == 0.25
+
+            cur.execute("UPDATE applications SET metadata = '{}'::jsonb WHERE id = %s", (app_id,))
+        conn.commit()
+
+    assert backfill_features(os.environ["DATABASE_URL"], batch_size=1000) >= 1
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT metadata->'derived' FROM applications WHERE id = %s", (app_id,))
+            assert cur.fetchone()[0] == FeatureExtractor().extract_one(_PAYLOADS[0])
@@ -0,0 +1,94 @@
+import os
+import uuid
+
+import numpy as np
+import psycopg
+import pytest
+from psycopg.types.json import Jsonb
+
+from src.ml.features import FEATURE_NAMES, FeatureExtractor
+from src.ml.model_loader import ModelLoader, load_artifact, save_linear_artifact
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+@pytest.fixture
+def registry():
+    """Insert model_registry rows; removes them afterwards so other tests see the baseline."""
+
+    created: list[uuid.UUID] = []
+
+    def register(*, version: str, artifact_uri: str, is_active: bool = True, meta: dict | None = None) -> uuid.UUID:
+        registry_id = uuid.uuid4()
+        with psycopg.connect(_sync_dsn()) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO model_registry (id, model_id, version, artifact_uri, is_active, metadata)
+                    VALUES (%s, 'test-model', %s, %s, %s, %s)
+                    """,
+                    (registry_id, version, artifact_uri, is_active, Jsonb(meta or {})),
+                )
+            conn.commit()
+        created.append(registry_id)
+        return registry_id
+
+    yield register
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM model_registry WHERE id = ANY(%s)", (created,))
+        conn.commit()
+
+
+def _artifact(tmp_path, name: str, dti_coef: float) -> str:
+    coef = np.zeros(len(FEATURE_NAMES))
+    coef[0] = dti_coef
+    directory = save_linear_artifact(tmp_path / name, coef=coef, intercept=-2.0, reference=np.full(len(FEATURE_NAMES), 0.3))
+    return directory.as_uri()
+
+
+def test_artifact_arrays_are_read_only_memory_maps(tmp_path):
+    model = load_artifact(_artifact(tmp_path, "m1", 2.0), model_id="m", version="1", meta={"feature_stats": {"dti_ratio": 0.5}})
+
+    assert isinstance(model.coef, np.memmap)
+    assert not model.coef.flags.writeable
+    assert model.feature_stats.medians["dti_ratio"] == 0.5
+
+    X = FeatureExtractor(model.feature_stats).transform([{"financial_data": {}}])
+    (out,) = model.score_batch(X)
+    assert 0 <= out.score <= 1000
+
+
+def test_loader_hot_swaps_when_active_entry_changes(tmp_path, registry):
+    loader = ModelLoader(os.environ["DATABASE_URL"], refresh_seconds=3600)
+    loader.warm()
+    baseline_version = loader.current().version
+
+    v1 = registry(version="v1", artifact_uri=_artifact(tmp_path, "v1", 1.0))
+    # Within the refresh interval the current model keeps serving.
+    assert loader.current().version == baseline_version
+    assert loader.refresh(force=True)
+    assert (loader.registry_id, loader.current().version) == (v1, "v1")
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE model_registry SET is_active = false WHERE id = %s", (v1,))
+        conn.commit()
+    v2 = registry(version="v2", artifact_uri=_artifact(tmp_path, "v2", 4.0))
+
+    assert loader.refresh(force=True)
+    assert (loader.registry_id, loader.current().version) == (v2, "v2")
+
+    # A broken artifact never replaces a working model.
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE model_registry SET is_active = false WHERE id = %s", (v2,))
+        conn.commit()
+    registry(version="v3", artifact_uri=(tmp_path / "missing").as_uri())
+    assert not loader.refresh(force=True)
+    assert loader.current().version == "v2"
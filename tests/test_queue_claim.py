@@ -0,0 +1,159 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import psycopg
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.crud.queue import claim_next_case
+from src.main import app
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(analysts: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    tenant_id = uuid.uuid4()
+    analyst_ids = [uuid.uuid4() for _ in range(analysts)]
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+            cur.executemany(
+                "INSERT INTO users (id, tenant_id, email) VALUES (%s, %s, %s)",
+                [(a, tenant_id, f"analyst-{a.hex[:8]}@example.com") for a in analyst_ids],
+            )
+        conn.commit()
+    return tenant_id, analyst_ids
+
+
+def _create_queue_entries(tenant_id: uuid.UUID, priorities: list[int]) -> list[uuid.UUID]:
+    """One pending application + pending queue entry per priority; returns queue ids in input order."""
+
+    queue_ids = []
+    created = datetime.now(timezone.utc) - timedelta(minutes=len(priorities))
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            for i, priority in enumerate(priorities):
+                app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+                cur.execute(
+                    """
+                    INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+                    VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, '{}'::jsonb)
+                    """,
+                    (app_id, tenant_id, f"APP-{app_id.hex[:10]}"),
+                )
+                cur.execute(
+                    """
+                    INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline, created_at)
+                    VALUES (%s, %s, %s, 'pending', NOW() + INTERVAL '8 hours', %s)
+                    """,
+                    (queue_id, app_id, priority, created + timedelta(seconds=i)),
+                )
+                queue_ids.append(queue_id)
+        conn.commit()
+    return queue_ids
+
+
+def _claim(client: TestClient, tenant_id: uuid.UUID, analyst_id: uuid.UUID):
+    return client.post(
+        "/api/v1/queue/claim-next",
+        json={"tenant_id": str(tenant_id), "analyst_id": str(analyst_id)},
+    )
+
+
+def test_claim_next_priority_order_workload_limit_and_tenant_scope():
+    client = TestClient(app)
+    tenant_id, (analyst, other) = _create_tenant(2)
+    other_tenant, (foreign_analyst,) = _create_tenant(1)
+    queue_ids = _create_queue_entries(tenant_id, [40, 10, 40, 90, 20, 60, 70])
+    _create_queue_entries(other_tenant, [1])
+
+    # Lowest priority number first, created_at breaks ties.
+    expected = [queue_ids[1], queue_ids[4], queue_ids[0], queue_ids[2], queue_ids[5]]
+    for n, queue_id in enumerate(expected, start=1):
+        r = _claim(client, tenant_id, analyst)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert body["item"]["id"] == str(queue_id)
+        assert body["item"]["status"] == "assigned"
+        assert body["item"]["analyst_id"] == str(analyst)
+        assert body["item"]["assigned_at"] is not None
+        assert body["active_cases"] == n
+
+    r = _claim(client, tenant_id, analyst)
+    assert r.status_code == 409
+
+    # Another analyst continues with the rest; then the tenant's queue is empty.
+    assert _claim(client, tenant_id, other).json()["item"]["id"] == str(queue_ids[6])
+    assert _claim(client, tenant_id, other).json()["item"]["id"] == str(queue_ids[3])
+    r = _claim(client, tenant_id, other)
+    assert r.status_code == 200
+    assert r.json()["item"] is None
+    assert r.json()["active_cases"] == 2
+
+    # Analysts only claim within their own tenant.
+    assert _claim(client, tenant_id, foreign_analyst).status_code == 404
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT count(*) FROM audit_logs WHERE tenant_id = %s AND entity_type = 'analyst_queue' AND action = 'assign'",
+                (tenant_id,),
+            )
+            assert cur.fetchone()[0] == 7
+
+
+def test_claim_next_invalid_ids_422():
+    client = TestClient(app)
+    r = client.post("/api/v1/queue/claim-next", json={"tenant_id": "nope", "analyst_id": str(uuid.uuid4())})
+    assert r.status_code == 422
+
+
+def test_concurrent_claims_never_double_assign():
+    tenant_id, analysts = _create_tenant(10)
+    queue_ids = _create_queue_entries(tenant_id, [50] * 40)
+
+    async def run() -> list[uuid.UUID]:
+        engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def analyst_loop(analyst_id: uuid.UUID) -> list[uuid.UUID]:
+            claimed = []
+            while True:
+                async with sessions() as session:
+                    result = await claim_next_case(session, tenant_id=tenant_id, analyst_id=analyst_id)
+                if result["item"] is None:
+                    return claimed
+                claimed.append(result["item"].id)
+
+        try:
+            per_analyst = await asyncio.gather(*(analyst_loop(a) for a in analysts))
+        finally:
+            await engine.dispose()
+        return [queue_id for claimed in per_analyst for queue_id in claimed]
+
+    claimed = asyncio.run(run())
+    # 10 analysts x 5 slots >= 40 entries: every entry claimed exactly once.
+    assert len(claimed) == len(set(claimed)) == 40
+    assert set(claimed) == set(queue_ids)
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT max(n) FROM (
+                  SELECT count(*) AS n FROM analyst_queues WHERE analyst_id = ANY(%s) GROUP BY analyst_id
+                ) t
+                """,
+                (analysts,),
+            )
+            assert cur.fetchone()[0] <= 5
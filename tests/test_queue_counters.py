@@ -0,0 +1,108 @@
+import os
+import uuid
+
+import psycopg
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.tasks.queue_counters import repair_queue_counters
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(cur) -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+    )
+    return tenant_id
+
+
+def _create_queue_entry(cur, tenant_id: uuid.UUID, *, priority: int) -> tuple[uuid.UUID, uuid.UUID]:
+    app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+        VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, '{}'::jsonb)
+        """,
+        (app_id, tenant_id, f"APP-{app_id.hex[:10]}"),
+    )
+    cur.execute(
+        """
+        INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline)
+        VALUES (%s, %s, %s, 'pending', NOW() + INTERVAL '8 hours')
+        """,
+        (queue_id, app_id, priority),
+    )
+    return app_id, queue_id
+
+
+def _counters(cur, tenant_id: uuid.UUID) -> dict[tuple[str, str], int]:
+    cur.execute(
+        """
+        SELECT status, priority_bucket, sum(n) FROM queue_summary_counters
+        WHERE tenant_id = %s GROUP BY 1, 2 HAVING sum(n) <> 0
+        """,
+        (tenant_id,),
+    )
+    return {(status, bucket): int(n) for status, bucket, n in cur.fetchall()}
+
+
+def test_counters_follow_queue_transitions():
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            tenant_id = _create_tenant(cur)
+            _, a = _create_queue_entry(cur, tenant_id, priority=10)
+            _, b = _create_queue_entry(cur, tenant_id, priority=40)
+            app_c, c = _create_queue_entry(cur, tenant_id, priority=90)
+            assert _counters(cur, tenant_id) == {
+                ("pending", "high"): 1,
+                ("pending", "medium"): 1,
+                ("pending", "low"): 1,
+            }
+
+            cur.execute("UPDATE analyst_queues SET status = 'assigned' WHERE id = %s", (a,))
+            cur.execute("UPDATE analyst_queues SET status = 'in_progress' WHERE id = %s", (a,))
+            cur.execute("UPDATE analyst_queues SET priority = 15 WHERE id = %s", (b,))
+            cur.execute("UPDATE analyst_queues SET status = 'completed' WHERE id = %s", (c,))
+            assert _counters(cur, tenant_id) == {("in_progress", "high"): 1, ("pending", "high"): 1}
+
+            cur.execute("DELETE FROM applications WHERE id = %s", (app_c,))  # completed: no change
+            cur.execute("DELETE FROM analyst_queues WHERE id = %s", (b,))
+            assert _counters(cur, tenant_id) == {("in_progress", "high"): 1}
+        conn.commit()
+
+    client = TestClient(app)
+    summary = client.get("/api/v1/queue/summary", params={"tenant_id": str(tenant_id)}).json()
+    assert summary["total_pending"] == 0
+    assert summary["total_in_progress"] == 1
+    assert summary["by_priority"] == {"high": 1, "medium": 0, "low": 0}
+
+
+def test_repair_job_corrects_drift():
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            tenant_id = _create_tenant(cur)
+            for priority in (10, 30, 30):
+                _create_queue_entry(cur, tenant_id, priority=priority)
+            # Simulate out-of-band drift.
+            cur.execute(
+                "UPDATE queue_summary_counters SET n = n + 5 WHERE tenant_id = %s AND priority_bucket = 'medium'",
+                (tenant_id,),
+            )
+            cur.execute("DELETE FROM queue_summary_counters WHERE tenant_id = %s AND priority_bucket = 'high'", (tenant_id,))
+        conn.commit()
+
+        drift = repair_queue_counters(conn, tenant_id=tenant_id)
+        assert sorted((status, bucket, delta) for _, status, bucket, delta in drift) == [
+            ("pending", "high", 1),
+            ("pending", "medium", -5),
+        ]
+        with conn.cursor() as cur:
+            assert _counters(cur, tenant_id) == {("pending", "high"): 1, ("pending", "medium"): 2}
+        assert repair_queue_counters(conn, tenant_id=tenant_id) == []
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import os
+import uuid
+
+import psycopg
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.crud.queue import current_queue_event_cursor, queue_events_since
+from src.main import app
+from src.realtime.queue_feed import QueueEventHub, queue_event_stream
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        conn.execute(
+            "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+            (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+        )
+    return tenant_id
+
+
+def _create_queue_entry(tenant_id: uuid.UUID, *, priority: int = 50) -> uuid.UUID:
+    app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        conn.execute(
+            """
+            INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+            VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, '{}'::jsonb)
+            """,
+            (app_id, tenant_id, f"APP-{app_id.hex[:10]}"),
+        )
+        conn.execute(
+            """
+            INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline)
+            VALUES (%s, %s, %s, 'pending', NOW() + INTERVAL '8 hours')
+            """,
+            (queue_id, app_id, priority),
+        )
+    return queue_id
+
+
+def _update_queue_entry(queue_id: uuid.UUID, sql_set: str) -> None:
+    with psycopg.connect(_sync_dsn()) as conn:
+        conn.execute(f"UPDATE analyst_queues SET {sql_set} WHERE id = %s", (queue_id,))
+
+
+def _parse(chunk: str) -> tuple[int | None, str, dict]:
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return (int(fields["id"]) if "id" in fields else None), fields["event"], json.loads(fields["data"])
+
+
+async def _next(stream, *, timeout: float = 5.0) -> tuple[int | None, str, dict]:
+    while True:
+        chunk = await asyncio.wait_for(stream.__anext__(), timeout)
+        if not chunk.startswith(":"):
+            return _parse(chunk)
+
+
+def _stream(hub: QueueEventHub, tenant_id: uuid.UUID, cursor: int | None, sessions, **kwargs):
+    async def replay(after: int, limit: int) -> list[dict]:
+        async with sessions() as session:
+            return await queue_events_since(session, tenant_id=tenant_id, cursor=after, limit=limit)
+
+    async def latest() -> int:
+        async with sessions() as session:
+            return await current_queue_event_cursor(session)
+
+    return queue_event_stream(hub, tenant_id, cursor=cursor, replay=replay, latest=latest, **kwargs)
+
+
+def test_queue_feed_replays_from_cursor_then_streams_live_events():
+    tenant_id = _create_tenant()
+    other_tenant = _create_tenant()
+    first = _create_queue_entry(tenant_id, priority=40)
+    _update_queue_entry(first, "updated_at = NOW()")  # not a visible change: no event
+    _update_queue_entry(first, "status = 'assigned'")
+
+    async def run() -> None:
+        engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        hub = QueueEventHub(os.environ["DATABASE_URL"])
+        stream = _stream(hub, tenant_id, 0, sessions)
+        try:
+            _, kind, created = await _next(stream)
+            assert (kind, created["queue_id"], created["status"]) == ("queue.created", str(first), "pending")
+            _, kind, assigned = await _next(stream)
+            assert (kind, assigned["status"]) == ("queue.updated", "assigned")
+            ready_id, kind, ready = await _next(stream)
+            assert kind == "ready" and ready["cursor"] == ready_id
+            assert created["id"] < assigned["id"]
+            assert hub.subscriber_count == 1
+
+            await asyncio.to_thread(_create_queue_entry, other_tenant)  # other tenant: not delivered
+            await asyncio.to_thread(_update_queue_entry, first, "status = 'completed'")
+            event_id, kind, completed = await _next(stream)
+            assert kind == "queue.completed"
+            assert completed["tenant_id"] == str(tenant_id)
+            assert event_id == completed["cursor"] >= ready_id
+
+            # Reconnect with the last SSE id: at most the tail is repeated, never the start.
+            resumed = _stream(hub, tenant_id, event_id, sessions)
+            _, kind, again = await _next(resumed)
+            assert (kind, again["id"]) == ("queue.completed", completed["id"])
+            _, kind, _ = await _next(resumed)
+            assert kind == "ready"
+            await resumed.aclose()
+        finally:
+            await stream.aclose()
+            await hub.close()
+            await engine.dispose()
+        assert hub.subscriber_count == 0
+
+    asyncio.run(run())
+
+
+def test_resume_replays_event_with_lower_id_committed_later():
+    tenant_id = _create_tenant()
+    _create_queue_entry(tenant_id)  # an application to queue again below
+
+    async def run() -> None:
+        engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        hub = QueueEventHub(os.environ["DATABASE_URL"])
+        slow = psycopg.connect(_sync_dsn())
+        try:
+            stream = _stream(hub, tenant_id, None, sessions)
+            _, kind, _ = await _next(stream)
+            assert kind == "ready"
+
+            # The slow transaction takes the lower event id but commits last.
+            slow.execute(
+                "UPDATE analyst_queues SET priority = 5 WHERE application_id IN "
+                "(SELECT id FROM applications WHERE tenant_id = %s)",
+                (tenant_id,),
+            )
+            fast_queue = await asyncio.to_thread(_create_queue_entry, tenant_id)
+            last_id, kind, fast = await _next(stream)
+            assert (kind, fast["queue_id"]) == ("queue.created", str(fast_queue))
+            await stream.aclose()  # client disconnects ...
+            slow.commit()  # ... then the lower id commits
+
+            resumed = _stream(hub, tenant_id, last_id, sessions)
+            seen = {}
+            while True:
+                _, kind, data = await _next(resumed)
+                if kind == "ready":
+                    break
+                seen[kind] = data["id"]
+            await resumed.aclose()
+            assert seen["queue.updated"] < seen["queue.created"] == fast["id"]
+        finally:
+            slow.close()
+            await hub.close()
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_slow_subscriber_is_told_to_reconnect():
+    tenant_id = _create_tenant()
+
+    async def run() -> None:
+        engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        hub = QueueEventHub(os.environ["DATABASE_URL"], max_pending=1)
+        stream = _stream(hub, tenant_id, None, sessions, heartbeat_seconds=0.2)
+        try:
+            _, kind, _ = await _next(stream)
+            assert kind == "ready"
+            queue_id = await asyncio.to_thread(_create_queue_entry, tenant_id)
+            await asyncio.to_thread(_update_queue_entry, queue_id, "priority = 10")
+            await asyncio.sleep(0.3)  # both notifications arrive while nobody reads
+
+            _, kind, _ = await _next(stream)
+            assert kind == "queue.created"
+            _, kind, _ = await _next(stream)
+            assert kind == "lagged"
+        finally:
+            await stream.aclose()
+            await hub.close()
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_queue_events_invalid_tenant_id_422():
+    client = TestClient(app)
+    r = client.get("/api/v1/queue/events", params={"tenant_id": "not-a-uuid"})
+    assert r.status_code == 422
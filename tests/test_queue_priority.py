@@ -0,0 +1,106 @@
+import os
+import uuid
+
+import numpy as np
+import psycopg
+
+from src.ml.priority import queue_priorities, queue_priority
+from src.tasks.queue_priority import recompute_queue_priorities
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(cur) -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+    )
+    return tenant_id
+
+
+def _create_queue_entry(cur, tenant_id: uuid.UUID, *, amount: int, sla_hours: float, priority: int) -> uuid.UUID:
+    app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+        VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, %s::jsonb)
+        """,
+        (app_id, tenant_id, f"APP-{app_id.hex[:10]}", f'{{"loan_amount": {amount}}}'),
+    )
+    cur.execute(
+        """
+        INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline, score_at_routing)
+        VALUES (%s, %s, %s, 'pending', NOW() + %s * INTERVAL '1 hour', 600)
+        """,
+        (queue_id, app_id, priority, sla_hours),
+    )
+    return queue_id
+
+
+def test_queue_priorities_match_sql_function_on_random_and_boundary_inputs():
+    rng = np.random.default_rng(20260101)
+    n = 2000
+    amount_edges = [0, 999_999.99, 1_000_000, 1_000_000.01, 2_000_000, 2_000_001, 5_000_000, 5_000_000.01, 9e9]
+    sla_edges = [-5, 0, 1.999, 2, 3.5, 4, 7.99, 8, 24, 1e6]
+    edge_amounts, edge_sla = np.meshgrid(amount_edges, sla_edges)  # every boundary pair
+    amounts = np.concatenate([rng.uniform(0, 8_000_000, n).round(2), edge_amounts.ravel()])
+    sla = np.concatenate([rng.uniform(-10, 30, n).round(3), edge_sla.ravel()])
+    vip = rng.random(len(amounts)) < 0.1
+    # NULLs (NaN / None) in every argument.
+    amounts[::97] = np.nan
+    sla[::89] = np.nan
+    vip_sql = [None if i % 83 == 0 else bool(v) for i, v in enumerate(vip)]
+    scores = rng.integers(300, 850, len(amounts))
+
+    def sql_values(a: np.ndarray) -> list:
+        return [None if np.isnan(x) else float(x) for x in a]
+
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT calculate_queue_priority(s, a, v, h)
+                FROM unnest(%s::int[], %s::numeric[], %s::boolean[], %s::numeric[]) WITH ORDINALITY AS t(s, a, v, h, i)
+                ORDER BY i
+                """,
+                (scores.tolist(), sql_values(amounts), vip_sql, sql_values(sla)),
+            )
+            expected = np.array([row[0] for row in cur.fetchall()])
+
+    actual = queue_priorities(scores, amounts, np.array(vip_sql, dtype=object), sla)
+    mismatches = np.flatnonzero(actual != expected)
+    assert mismatches.size == 0, [(amounts[i], sla[i], vip_sql[i], actual[i], expected[i]) for i in mismatches[:5]]
+
+    assert queue_priority(700, 5_000_001, False, 24) == 35
+    assert queue_priority(700, 1000, True, 1) == 10
+    assert queue_priority(700, None, None, None) == 50
+
+
+def test_recompute_queue_priorities_updates_only_stale_rows():
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            tenant_id = _create_tenant(cur)
+            stale = _create_queue_entry(cur, tenant_id, amount=3_000_000, sla_hours=1, priority=50)
+            fresh = _create_queue_entry(cur, tenant_id, amount=1000, sla_hours=24, priority=50)
+        conn.commit()
+
+        first = recompute_queue_priorities(conn, tenant_id=tenant_id, batch_size=1)
+        assert first["scanned"] == 2 and first["updated"] == 1
+
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, priority FROM analyst_queues WHERE id = ANY(%s)",
+                ([stale, fresh],),
+            )
+            assert dict(cur.fetchall()) == {stale: 20, fresh: 50}  # 50 - 10 (amount) - 20 (SLA)
+            cur.execute(
+                "SELECT count(*) FROM queue_events WHERE queue_id = %s AND event = 'updated'", (fresh,)
+            )
+            assert cur.fetchone()[0] == 0
+
+        assert recompute_queue_priorities(conn, tenant_id=tenant_id)["updated"] == 0
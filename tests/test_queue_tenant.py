@@ -0,0 +1,84 @@
+import os
+import uuid
+
+import psycopg
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(cur) -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+    )
+    return tenant_id
+
+
+def _create_queue_entry(cur, tenant_id: uuid.UUID, *, status: str, priority: int, sla: str) -> tuple[uuid.UUID, uuid.UUID]:
+    app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+        VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, '{}'::jsonb)
+        """,
+        (app_id, tenant_id, f"APP-{app_id.hex[:10]}"),
+    )
+    # No tenant_id: the trigger copies it from the application.
+    cur.execute(
+        f"""
+        INSERT INTO analyst_queues (id, application_id, priority, status, sla_deadline)
+        VALUES (%s, %s, %s, %s, NOW() + INTERVAL '{sla}')
+        """,
+        (queue_id, app_id, priority, status),
+    )
+    return app_id, queue_id
+
+
+def test_queue_tenant_id_is_maintained_and_scopes_list_and_summary():
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            tenant_a = _create_tenant(cur)
+            tenant_b = _create_tenant(cur)
+            _, high = _create_queue_entry(cur, tenant_a, status="pending", priority=10, sla="8 hours")
+            _, low = _create_queue_entry(cur, tenant_a, status="pending", priority=80, sla="1 hour")
+            _create_queue_entry(cur, tenant_a, status="in_progress", priority=30, sla="-1 hour")
+            _create_queue_entry(cur, tenant_a, status="completed", priority=30, sla="-1 hour")
+            moved_app, moved = _create_queue_entry(cur, tenant_b, status="pending", priority=5, sla="8 hours")
+
+            cur.execute("SELECT tenant_id FROM analyst_queues WHERE id = %s", (high,))
+            assert cur.fetchone()[0] == tenant_a
+            cur.execute("UPDATE analyst_queues SET tenant_id = %s WHERE id = %s", (tenant_b, high))
+            cur.execute("SELECT tenant_id FROM analyst_queues WHERE id = %s", (high,))
+            assert cur.fetchone()[0] == tenant_a  # cannot drift from the application
+
+            cur.execute("UPDATE applications SET tenant_id = %s WHERE id = %s", (tenant_a, moved_app))
+            cur.execute("UPDATE applications SET tenant_id = %s WHERE id = %s", (tenant_b, moved_app))
+            cur.execute("SELECT tenant_id FROM analyst_queues WHERE id = %s", (moved,))
+            assert cur.fetchone()[0] == tenant_b
+        conn.commit()
+
+    client = TestClient(app)
+    r = client.get("/api/v1/queue", params={"tenant_id": str(tenant_a), "status": "pending"})
+    assert r.status_code == 200
+    assert [i["id"] for i in r.json()["items"]] == [str(high), str(low)]
+    assert {i["tenant_id"] for i in r.json()["items"]} == {str(tenant_a)}
+
+    r = client.get("/api/v1/queue", params={"tenant_id": str(tenant_a)})
+    assert len(r.json()["items"]) == 4
+
+    r = client.get("/api/v1/queue/summary", params={"tenant_id": str(tenant_a)})
+    assert r.status_code == 200
+    summary = r.json()
+    assert summary["total_pending"] == 2
+    assert summary["total_in_progress"] == 1
+    assert summary["approaching_sla"] == 1
+    assert summary["breached_sla"] == 1
+    assert summary["by_priority"] == {"high": 1, "medium": 1, "low": 1}
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from src.ml.routing import DecisionRouter, InvalidRules, get_router, route, validate_rules
+
+PURPOSES = ["auto", "business", "crypto", "education", "", None, 7]
+
+
+def _threshold(rules: dict) -> dict:
+    return {"id": "t-1", "auto_approve_min": 700, "auto_decline_max": 500, "rules": rules}
+
+
+def _random_batch(rng: np.random.Generator, n: int):
+    scores = rng.integers(300, 900, n)
+    amounts = rng.choice([np.nan, 1000.0, 1_000_000.0, 1_000_000.01, 2_500_000.0], n)
+    terms = rng.choice([np.nan, 12.0, 60.0, 61.0, 120.0], n)
+    purposes = [PURPOSES[i] for i in rng.integers(0, len(PURPOSES), n)]
+    return scores, amounts, terms, purposes
+
+
+@pytest.mark.parametrize(
+    "threshold",
+    [
+        None,
+        _threshold({}),
+        _threshold({"max_loan_amount_auto": 1_000_000}),
+        _threshold({"max_term_months_auto": "60", "require_review_purposes": ["crypto", ""]}),
+        _threshold(
+            {
+                "max_loan_amount_auto": "1000000",
+                "max_term_months_auto": 60,
+                "require_review_purposes": ["business", "crypto"],
+                "unrelated": True,
+            }
+        ),
+    ],
+)
+def test_route_batch_matches_row_at_a_time_route(threshold):
+    rng = np.random.default_rng(7)
+    scores, amounts, terms, purposes = _random_batch(rng, 5000)
+    scores[:3] = [500, 700, 501]  # cutoffs are inclusive
+
+    decisions, reasons = DecisionRouter(threshold).route_batch(scores, amounts, terms, purposes)
+
+    expected = [
+        route(
+            int(s),
+            None if np.isnan(a) else float(a),
+            None if np.isnan(t) else int(t),
+            p,
+            threshold,
+        )
+        for s, a, t, p in zip(scores, amounts, terms, purposes)
+    ]
+    assert list(zip(decisions, reasons)) == expected
+
+
+def test_rules_are_validated_and_routers_cached_per_threshold_version():
+    assert validate_rules({"max_term_months_auto": "36", "require_review_purposes": ["a", "a"]}) == {
+        "max_loan_amount_auto": None,
+        "max_term_months_auto": 36,
+        "require_review_purposes": ("a",),
+    }
+    with pytest.raises(InvalidRules):
+        validate_rules({"max_loan_amount_auto": "lots"})
+    with pytest.raises(InvalidRules):
+        validate_rules({"require_review_purposes": "crypto"})
+    with pytest.raises(InvalidRules):
+        validate_rules({"max_loan_amoutn_auto": 5}, strict=True)
+    with pytest.raises(InvalidRules):
+        validate_rules({"max_term_months_auto": -1}, strict=True)
+
+    threshold = _threshold({"max_loan_amount_auto": 1000})
+    router = get_router(threshold)
+    assert get_router(dict(threshold)) is router
+    # Same threshold id, edited rules: a new version compiles a new router.
+    edited = get_router(_threshold({"max_loan_amount_auto": 2000}))
+    assert edited is not router
+    assert edited.route_batch(np.array([800]), np.array([1500.0]), np.array([np.nan]))[1][0] == "score_above_threshold"
+
+
+def test_invalid_stored_rules_route_to_human_review_instead_of_raising():
+    router = DecisionRouter(_threshold({"require_review_purposes": "crypto"}))
+    assert router.invalid_rules
+    decisions, reasons = router.route_batch(np.array([900, 300]), np.array([1.0, np.nan]), np.array([12.0, np.nan]))
+    assert list(zip(decisions, reasons)) == [("human_review", "invalid_threshold_rules")] * 2
@@ -0,0 +1,91 @@
+import os
+import uuid
+
+import psycopg
+
+from src.tasks.sla import sweep_sla
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(cur) -> tuple[uuid.UUID, uuid.UUID]:
+    tenant_id, analyst_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+    )
+    cur.execute(
+        "INSERT INTO users (id, tenant_id, email) VALUES (%s, %s, %s)",
+        (analyst_id, tenant_id, f"analyst-{analyst_id.hex[:8]}@example.com"),
+    )
+    return tenant_id, analyst_id
+
+
+def _create_queue_entry(cur, tenant_id: uuid.UUID, *, sla: str, status: str = "pending", analyst_id=None) -> uuid.UUID:
+    app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+        VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, '{}'::jsonb)
+        """,
+        (app_id, tenant_id, f"APP-{app_id.hex[:10]}"),
+    )
+    cur.execute(
+        f"""
+        INSERT INTO analyst_queues (id, application_id, analyst_id, status, sla_deadline)
+        VALUES (%s, %s, %s, %s, NOW() + INTERVAL '{sla}')
+        """,
+        (queue_id, app_id, analyst_id, status),
+    )
+    return queue_id
+
+
+def _notifications(cur, tenant_id: uuid.UUID) -> list[tuple]:
+    cur.execute(
+        "SELECT kind, payload->>'queue_id', user_id FROM notifications WHERE tenant_id = %s ORDER BY kind, payload->>'queue_id'",
+        (tenant_id,),
+    )
+    return cur.fetchall()
+
+
+def test_sla_sweep_warns_and_breaches_each_entry_exactly_once():
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            tenant_id, analyst_id = _create_tenant(cur)
+            overdue = _create_queue_entry(cur, tenant_id, sla="-10 minutes", status="assigned", analyst_id=analyst_id)
+            soon = _create_queue_entry(cur, tenant_id, sla="1 hour")
+            _create_queue_entry(cur, tenant_id, sla="5 hours")  # not due yet
+            _create_queue_entry(cur, tenant_id, sla="-1 hour", status="completed")  # closed: ignored
+        conn.commit()
+
+        sweep_sla(conn, warning_hours=2, batch_size=1)  # batch_size=1 exercises the drain loop
+        with conn.cursor() as cur:
+            assert _notifications(cur, tenant_id) == sorted(
+                [("sla_breach", str(overdue), analyst_id), ("sla_warning", str(soon), None)],
+                key=lambda n: (n[0], n[1]),
+            )
+            cur.execute("SELECT sla_breached, sla_warned_at IS NOT NULL FROM analyst_queues WHERE id = %s", (overdue,))
+            assert cur.fetchone() == (True, True)
+
+        # Re-sweeping changes nothing.
+        sweep_sla(conn, warning_hours=2)
+        with conn.cursor() as cur:
+            assert len(_notifications(cur, tenant_id)) == 2
+
+            # The warned entry now breaches: breach notice only, once.
+            cur.execute("UPDATE analyst_queues SET sla_deadline = NOW() - INTERVAL '1 minute' WHERE id = %s", (soon,))
+        conn.commit()
+        sweep_sla(conn, warning_hours=2)
+        sweep_sla(conn, warning_hours=2)
+        with conn.cursor() as cur:
+            kinds = [kind for kind, queue_id, _ in _notifications(cur, tenant_id) if queue_id == str(soon)]
+            assert sorted(kinds) == ["sla_breach", "sla_warning"]
+            cur.execute(
+                "SELECT payload->>'external_id' LIKE 'APP-%%' FROM notifications WHERE tenant_id = %s LIMIT 1",
+                (tenant_id,),
+            )
+            assert cur.fetchone()[0] is True
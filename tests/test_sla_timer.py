@@ -0,0 +1,113 @@
+import os
+import time
+import uuid
+
+import psycopg
+
+from src.tasks.sla_timer import DeadlineHeap, SlaTimer
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(cur) -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+    )
+    return tenant_id
+
+
+def _create_queue_entry(cur, tenant_id: uuid.UUID, *, sla_seconds: float) -> uuid.UUID:
+    app_id, queue_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+        VALUES (%s, %s, %s, 'review', '{}'::jsonb, '{}'::jsonb, '{}'::jsonb)
+        """,
+        (app_id, tenant_id, f"APP-{app_id.hex[:10]}"),
+    )
+    cur.execute(
+        """
+        INSERT INTO analyst_queues (id, application_id, status, sla_deadline)
+        VALUES (%s, %s, 'pending', NOW() + %s * INTERVAL '1 second')
+        """,
+        (queue_id, app_id, sla_seconds),
+    )
+    return queue_id
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_deadline_heap_orders_replaces_and_discards():
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    heap = DeadlineHeap()
+    heap.set(a, (10.0, 20.0))
+    heap.set(b, (15.0,))
+    heap.set(c, (5.0,))
+    heap.discard(c)
+    heap.set(b, (30.0,))  # deadline moved: the 15.0 item goes stale
+
+    assert heap.next_at() == 10.0
+    assert heap.pop_due(16.0) == [(10.0, a)]
+    assert heap.pop_due(25.0) == [(20.0, a)]
+    assert len(heap) == 1 and heap.next_at() == 30.0
+    assert heap.pop_due(30.0) == [(30.0, b)]
+    assert heap.next_at() is None and len(heap) == 0
+
+
+def test_sla_timer_fires_breach_at_deadline_with_single_leader():
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            tenant_id = _create_tenant(cur)
+        conn.commit()
+
+        leader = SlaTimer(_sync_dsn(), warning_hours=0, horizon_seconds=60, lease_retry_seconds=0.2)
+        standby = SlaTimer(_sync_dsn(), warning_hours=0, horizon_seconds=60, lease_retry_seconds=0.2)
+        leader.start()
+        try:
+            assert _wait_for(lambda: leader.is_leader and leader.sweeps >= 1)
+            standby.start()
+            time.sleep(0.5)
+            assert not standby.is_leader
+
+            # Created after the reconcile: scheduled from the NOTIFY stream.
+            with conn.cursor() as cur:
+                queue_id = _create_queue_entry(cur, tenant_id, sla_seconds=1.5)
+            conn.commit()
+            created = time.monotonic()
+
+            def breach_notices() -> int:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT count(*) FROM notifications WHERE tenant_id = %s AND kind = 'sla_breach'",
+                        (tenant_id,),
+                    )
+                    count = cur.fetchone()[0]
+                conn.commit()
+                return count
+
+            assert _wait_for(lambda: breach_notices() == 1)
+            assert time.monotonic() - created < 3.0  # well under a beat interval
+            with conn.cursor() as cur:
+                cur.execute("SELECT sla_breached FROM analyst_queues WHERE id = %s", (queue_id,))
+                assert cur.fetchone()[0] is True
+
+            # Failover: the standby takes the lease once the leader is gone.
+            leader.stop(timeout=5)
+            assert _wait_for(lambda: standby.is_leader)
+        finally:
+            leader.stop(timeout=5)
+            standby.stop(timeout=5)
+        assert breach_notices() == 1
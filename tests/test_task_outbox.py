@@ -0,0 +1,145 @@
+import os
+import uuid
+
+import psycopg
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.tasks.outbox import outbox_lag, relay_outbox_batch
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant() -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _payload(tenant_id: uuid.UUID, name: str) -> dict:
+    return {
+        "tenant_id": str(tenant_id),
+        "external_id": None,
+        "applicant_data": {"name": name},
+        "financial_data": {
+            "net_monthly_income": 1000,
+            "monthly_obligations": 200,
+            "existing_loans_payment": 100,
+        },
+        "loan_request": {"loan_amount": 12000, "estimated_payment": 300},
+        "credit_bureau_data": None,
+        "source": "web",
+    }
+
+
+def _outbox_rows(application_ids: list[str]) -> list[tuple]:
+    keys = [f"score_application:{i}" for i in application_ids]
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT dedup_key, payload, published_at, attempts FROM task_outbox WHERE dedup_key = ANY(%s) ORDER BY id",
+                (keys,),
+            )
+            return cur.fetchall()
+
+
+@pytest.fixture
+def outbox_mode(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    from src.api.v1.endpoints import applications as applications_endpoint
+
+    monkeypatch.setenv("TASK_OUTBOX_ENABLED", "1")
+    monkeypatch.delenv("CELERY_TASK_SCORE_APPLICATION_NAME", raising=False)
+
+    emitted: list[str] = []
+    monkeypatch.setattr(applications_endpoint, "emit_score_application_task", lambda i: emitted.append(str(i)))
+    monkeypatch.setattr(
+        applications_endpoint, "emit_score_application_tasks", lambda ids: emitted.extend(str(i) for i in ids)
+    )
+    return emitted
+
+
+def _drain(published: list[tuple[str, dict]]) -> None:
+    with psycopg.connect(_sync_dsn()) as conn:
+        while relay_outbox_batch(conn, published.extend, batch_size=2):
+            pass
+
+
+def test_create_writes_outbox_row_instead_of_publishing(outbox_mode: list[str]):
+    tenant_id = _create_tenant()
+    client = TestClient(app)
+
+    r = client.post("/api/v1/applications", json=_payload(tenant_id, "Jane"))
+    assert r.status_code == 201, r.text
+    app_id = r.json()["id"]
+
+    batch = client.post(
+        "/api/v1/applications:batch",
+        json={"items": [_payload(tenant_id, "A"), _payload(tenant_id, "B")]},
+    )
+    assert batch.status_code == 200, batch.text
+    batch_ids = [res["id"] for res in batch.json()["results"]]
+
+    assert outbox_mode == []
+    rows = _outbox_rows([app_id, *batch_ids])
+    assert [row[1] for row in rows] == [{"args": [i]} for i in [app_id, *batch_ids]]
+    assert all(row[2] is None for row in rows)
+
+    metrics = client.get("/api/v1/ops/outbox").json()
+    assert metrics["pending"] >= 3
+    assert metrics["oldest_pending_age_seconds"] >= 0
+
+    published: list[tuple[str, dict]] = []
+    _drain(published)
+
+    for i in [app_id, *batch_ids]:
+        assert ("score_application", {"args": [i]}) in published
+    assert all(row[2] is not None and row[3] == 1 for row in _outbox_rows([app_id, *batch_ids]))
+
+
+def test_relay_dedups_pending_rows_and_backs_off_on_failure():
+    key = f"score_application:{uuid.uuid4()}"
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            for _ in range(2):
+                cur.execute(
+                    """
+                    INSERT INTO task_outbox (task_name, payload, dedup_key)
+                    VALUES ('score_application', '{"args": ["x"]}'::jsonb, %s)
+                    ON CONFLICT (dedup_key) WHERE published_at IS NULL DO NOTHING
+                    """,
+                    (key,),
+                )
+            cur.execute("SELECT count(*) FROM task_outbox WHERE dedup_key = %s", (key,))
+            assert cur.fetchone()[0] == 1
+        conn.commit()
+
+        def broker_down(messages):
+            raise ConnectionError("broker unavailable")
+
+        while relay_outbox_batch(conn, broker_down, batch_size=1000):
+            pass
+
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT published_at, attempts, last_error, available_at > NOW() FROM task_outbox WHERE dedup_key = %s",
+                (key,),
+            )
+            published_at, attempts, last_error, backed_off = cur.fetchone()
+        conn.commit()
+        assert published_at is None
+        assert attempts == 1
+        assert "broker unavailable" in last_error
+        assert backed_off
+
+        assert outbox_lag(conn)["retrying"] >= 1
@@ -1,8 +1,20 @@
+import os
 import sys
+import threading
 import types
 import uuid
 
-from src.tasks.score_application import emit_score_application_task
+import pytest
+
+from src.tasks.score_application import emit_score_application_task, reset_producer
+
+
+@pytest.fixture(autouse=True)
+def _fresh_producer():
+    # The producer app is cached per process; each test installs its own fake Celery.
+    reset_producer()
+    yield
+    reset_producer()
 
 
 def test_emit_score_application_task_is_noop_when_disabled(monkeypatch):
@@ -39,3 +51,104 @@ def test_emit_score_application_task_send_task_when_enabled(monkeypatch):
 
     assert called["task_name"] == "score_application"
     assert called["args"] == [str(app_id)]
+
+
+def test_emit_score_application_tasks_uses_one_producer_for_batch(monkeypatch):
+    from contextlib import contextmanager
+
+    from src.tasks.score_application import emit_score_application_tasks
+
+    sent: list[tuple[str, list[str], object]] = []
+    inits: list[object] = []
+    producer = object()
+
+    class _FakeCelery:
+        def __init__(self, *args, **kwargs):
+            inits.append(kwargs)
+
+        @contextmanager
+        def producer_or_acquire(self):
+            yield producer
+
+        def send_task(self, task_name: str, args: list[str], producer=None):
+            sent.append((task_name, args, producer))
+
+    fake_celery_mod = types.ModuleType("celery")
+    fake_celery_mod.Celery = _FakeCelery
+    monkeypatch.setitem(sys.modules, "celery", fake_celery_mod)
+
+    monkeypatch.setenv("CELERY_ENABLED", "1")
+    monkeypatch.setenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+
+    ids = [uuid.uuid4() for _ in range(3)]
+    emit_score_application_tasks(ids)
+
+    assert len(inits) == 1
+    assert [s[1] for s in sent] == [[str(i)] for i in ids]
+    assert all(s[2] is producer for s in sent)
+
+
+def test_emit_score_application_task_reuses_producer_app(monkeypatch):
+    inits: list[object] = []
+    sent: list[list[str]] = []
+
+    class _FakeCelery:
+        def __init__(self, *args, **kwargs):
+            inits.append(kwargs)
+
+        def send_task(self, task_name: str, args: list[str]):
+            sent.append(args)
+
+    fake_celery_mod = types.ModuleType("celery")
+    fake_celery_mod.Celery = _FakeCelery
+    monkeypatch.setitem(sys.modules, "celery", fake_celery_mod)
+
+    monkeypatch.setenv("CELERY_ENABLED", "1")
+    monkeypatch.setenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+
+    for _ in range(3):
+        emit_score_application_task(uuid.uuid4())
+
+    assert len(sent) == 3
+    assert len(inits) == 1
+    assert inits[0]["broker_transport_options"] == {"confirm_publish": True}
+
+
+def test_emit_score_application_task_background_mode_does_not_block(monkeypatch):
+    release = threading.Event()
+    sent = threading.Event()
+
+    class _SlowCelery:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def send_task(self, task_name: str, args: list[str]):
+            # Simulates a slow broker; the caller must not wait for this.
+            release.wait(timeout=5)
+            sent.set()
+
+    fake_celery_mod = types.ModuleType("celery")
+    fake_celery_mod.Celery = _SlowCelery
+    monkeypatch.setitem(sys.modules, "celery", fake_celery_mod)
+
+    monkeypatch.setenv("CELERY_ENABLED", "1")
+    monkeypatch.setenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+    monkeypatch.setenv("CELERY_EMIT_MODE", "background")
+
+    emit_score_application_task(uuid.uuid4())
+    assert not sent.is_set()
+
+    release.set()
+    assert sent.wait(timeout=5)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_does_not_inherit_a_held_producer_lock():
+    import src.tasks.score_application as producer
+
+    with producer._lock:  # as if another thread were publishing at fork time
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if producer._lock.acquire(timeout=2) else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
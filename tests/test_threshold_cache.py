@@ -0,0 +1,92 @@
+import os
+import time
+import uuid
+
+import psycopg
+
+from src.ml.thresholds import ThresholdCache
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant_and_user(cur) -> tuple[uuid.UUID, uuid.UUID]:
+    tenant_id, user_id = uuid.uuid4(), uuid.uuid4()
+    cur.execute(
+        "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+        (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+    )
+    cur.execute(
+        "INSERT INTO users (id, tenant_id, email) VALUES (%s, %s, %s)",
+        (user_id, tenant_id, f"user-{user_id.hex[:8]}@example.com"),
+    )
+    return tenant_id, user_id
+
+
+def _create_threshold(cur, tenant_id: uuid.UUID, user_id: uuid.UUID, *, approve_min: int, starts_in: float) -> uuid.UUID:
+    threshold_id = uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO decision_thresholds (
+            id, tenant_id, name, auto_approve_min, auto_decline_max, rules, is_active, effective_from, created_by
+        ) VALUES (%s, %s, %s, %s, 400, '{}'::jsonb, true, NOW() + %s * INTERVAL '1 second', %s)
+        """,
+        (threshold_id, tenant_id, f"t-{threshold_id.hex[:6]}", approve_min, starts_in, user_id),
+    )
+    return threshold_id
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_threshold_cache_hits_expires_at_boundary_and_invalidates_on_change():
+    cache = ThresholdCache(_sync_dsn(), ttl_seconds=300)
+    try:
+        with psycopg.connect(_sync_dsn()) as conn:
+            with conn.cursor() as cur:
+                tenant_id, user_id = _create_tenant_and_user(cur)
+                empty_tenant, _ = _create_tenant_and_user(cur)
+                current = _create_threshold(cur, tenant_id, user_id, approve_min=700, starts_in=-3600)
+            conn.commit()
+            cache.start()
+            assert _wait_for(lambda: cache.listening)
+
+            def lookup() -> dict:
+                result = cache.get_many(conn, [tenant_id, empty_tenant])
+                conn.commit()
+                return result
+
+            first = lookup()
+            assert first[tenant_id]["id"] == current and first[empty_tenant] is None
+            loads = cache.stats()["loads"]
+            for _ in range(5):
+                assert lookup()[tenant_id]["auto_approve_min"] == 700
+            assert cache.stats()["loads"] == loads  # steady state: no queries
+
+            # A change to the tenant's thresholds is pushed to the cache.
+            with conn.cursor() as cur:
+                cur.execute("UPDATE decision_thresholds SET auto_approve_min = 720 WHERE id = %s", (current,))
+            conn.commit()
+            assert _wait_for(lambda: lookup()[tenant_id]["auto_approve_min"] == 720)
+
+            # A threshold that takes effect later: the cached entry expires exactly then.
+            with conn.cursor() as cur:
+                upcoming = _create_threshold(cur, tenant_id, user_id, approve_min=650, starts_in=1.0)
+            conn.commit()
+            assert _wait_for(lambda: lookup()[tenant_id]["id"] == current and cache.stats()["loads"] > loads + 1)
+            loads = cache.stats()["loads"]
+            assert lookup()[tenant_id]["id"] == current
+            assert cache.stats()["loads"] == loads
+            assert _wait_for(lambda: lookup()[tenant_id]["id"] == upcoming, timeout=3.0)
+            assert lookup()[empty_tenant] is None
+    finally:
+        cache.close()
@@ -0,0 +1,205 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import psycopg
+import pytest
+from fastapi.testclient import TestClient
+from psycopg.types.json import Jsonb
+
+from src.main import app
+from src.ml.simulation import ScoreHistory, simulate_thresholds
+
+
+def _sync_dsn() -> str:
+    dsn = os.environ.get("DATABASE_URL")
+    assert dsn, "DATABASE_URL must be set in CI"
+    return dsn.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _create_tenant(rules: dict) -> uuid.UUID:
+    tenant_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO tenants (id, name, slug) VALUES (%s, %s, %s)",
+                (tenant_id, "Test Tenant", f"test-{tenant_id.hex[:8]}"),
+            )
+            cur.execute(
+                "INSERT INTO users (id, tenant_id, email) VALUES (%s, %s, %s)",
+                (user_id, tenant_id, f"user-{user_id.hex[:8]}@example.com"),
+            )
+            cur.execute(
+                """
+                INSERT INTO decision_thresholds (
+                    id, tenant_id, name, auto_approve_min, auto_decline_max,
+                    rules, is_active, effective_from, created_by
+                ) VALUES (%s, %s, 'Default', 700, 500, %s, true, %s, %s)
+                """,
+                (uuid.uuid4(), tenant_id, Jsonb(rules), datetime.now(timezone.utc) - timedelta(days=1), user_id),
+            )
+        conn.commit()
+    return tenant_id
+
+
+def _create_scored_application(cur, tenant_id: uuid.UUID, *, score: int, pd: float, amount: float, outcome=None) -> None:
+    """``outcome``: None (not observed yet) or (defaulted, loss_amount)."""
+
+    app_id = uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO applications (id, tenant_id, external_id, status, applicant_data, financial_data, loan_request)
+        VALUES (%s, %s, %s, 'scored', '{}'::jsonb, '{}'::jsonb, %s)
+        """,
+        (app_id, tenant_id, f"APP-{app_id.hex[:10]}", Jsonb({"loan_amount": amount, "estimated_payment": 100})),
+    )
+    cur.execute(
+        """
+        INSERT INTO scoring_results (
+          id, application_id, model_id, model_version,
+          score, probability_default, risk_category, routing_decision,
+          features, shap_values, top_factors, scoring_time_ms
+        ) VALUES (%s, %s, 'demo', 'v1', %s, %s, 'medium', 'human_review',
+                  '{}'::jsonb, '{}'::jsonb, '{}'::jsonb, 1)
+        """,
+        (uuid.uuid4(), app_id, score, pd),
+    )
+    if outcome is not None:
+        defaulted, loss = outcome
+        cur.execute(
+            """
+            INSERT INTO loan_outcomes (id, application_id, outcome, defaulted, loss_amount)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            (uuid.uuid4(), app_id, "defaulted" if defaulted else "repaid", defaulted, loss),
+        )
+
+
+def _brute_force(history: ScoreHistory, forced: np.ndarray, approve_min: int, decline_max: int) -> dict:
+    approved = (history.scores >= approve_min) & ~forced
+    declined = (history.scores <= decline_max) & ~forced
+    labelled = approved & ~np.isnan(history.defaulted)
+    return {
+        "approved": int(approved.sum()),
+        "declined": int(declined.sum()),
+        "queued": int((~approved & ~declined).sum()),
+        "approved_defaults": int(np.nansum(history.defaulted[labelled])),
+        "approved_with_outcome": int(labelled.sum()),
+        "approved_loss": float(history.loss_amount[labelled].sum()),
+        "approved_expected_default_rate": float(history.probability_default[approved].mean()) if approved.any() else None,
+    }
+
+
+def test_simulate_thresholds_matches_brute_force():
+    rng = np.random.default_rng(11)
+    n = 20_000
+    scores = rng.integers(300, 851, n).astype(np.int32)
+    defaulted = (rng.random(n) < 0.1).astype(np.float64)
+    defaulted[rng.random(n) < 0.3] = np.nan
+    history = ScoreHistory(
+        scores=scores,
+        probability_default=rng.random(n),
+        defaulted=defaulted,
+        loss_amount=np.where(defaulted == 1, rng.uniform(100, 5000, n), 0.0),
+        loan_amounts=rng.uniform(1000, 80_000, n),
+        term_months=rng.choice([12.0, 36.0, 84.0, np.nan], n),
+        purposes=np.array(rng.choice(["auto", "home", "business"], n).tolist(), dtype=object),
+    )
+    rules = {"max_loan_amount_auto": 60_000, "max_term_months_auto": 60, "require_review_purposes": ["business"]}
+    forced = (history.loan_amounts > 60_000) | (history.term_months > 60) | (history.purposes == "business")
+    # Include cutoffs outside the observed range and on exact score values.
+    candidates = [(a, d) for a in (300, 640, 700, 851, 900) for d in (200, 300, 500, 639) if d < a]
+
+    result = simulate_thresholds(history, candidates, rules=rules)
+    assert result["rows"] == n
+    assert result["forced_review"] == int(forced.sum())
+    assert len(result["candidates"]) == len(candidates)
+    for (a, d), got in zip(candidates, result["candidates"]):
+        want = _brute_force(history, forced, a, d)
+        assert (got["auto_approve_min"], got["auto_decline_max"]) == (a, d)
+        assert got["approved"] + got["queued"] + got["declined"] == n
+        for key, value in want.items():
+            if value is None or isinstance(value, int):
+                assert got[key] == value, (a, d, key)
+            else:
+                assert got[key] == pytest.approx(value, rel=1e-9), (a, d, key)
+
+    # Curve: one point per distinct non-forced score by default, approve rate non-increasing.
+    rates = [p["approve_rate"] for p in result["curve"]]
+    assert len(rates) == len(np.unique(scores[~forced]))
+    assert all(x >= y for x, y in zip(rates, rates[1:]))
+
+    with pytest.raises(ValueError):
+        simulate_thresholds(history, [(600, 600)])
+
+
+def test_simulate_endpoint_streams_tenant_history():
+    tenant_id = _create_tenant({"max_loan_amount_auto": 50_000})
+    with psycopg.connect(_sync_dsn()) as conn:
+        with conn.cursor() as cur:
+            _create_scored_application(cur, tenant_id, score=780, pd=0.02, amount=5000, outcome=(False, None))
+            _create_scored_application(cur, tenant_id, score=760, pd=0.04, amount=8000, outcome=(True, 1200))
+            _create_scored_application(cur, tenant_id, score=720, pd=0.06, amount=9000)
+            _create_scored_application(cur, tenant_id, score=650, pd=0.10, amount=9000, outcome=(True, 3000))
+            _create_scored_application(cur, tenant_id, score=450, pd=0.30, amount=7000, outcome=(True, 500))
+            # Over max_loan_amount_auto: queued whatever the cutoffs.
+            _create_scored_application(cur, tenant_id, score=800, pd=0.01, amount=90_000, outcome=(False, None))
+        conn.commit()
+
+    client = TestClient(app)
+    r = client.post(
+        "/api/v1/thresholds/simulate",
+        json={
+            "tenant_id": str(tenant_id),
+            "candidates": [
+                {"auto_approve_min": 700, "auto_decline_max": 500},
+                {"auto_approve_min": 640, "auto_decline_max": 600},
+            ],
+            "curve_step": 50,
+        },
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["rows"] == 6
+    assert body["forced_review"] == 1
+    assert body["rules"] == {"max_loan_amount_auto": 50_000}
+
+    first, second = body["candidates"]
+    assert (first["approved"], first["queued"], first["declined"]) == (3, 2, 1)
+    assert first["approved_with_outcome"] == 2
+    assert first["approved_defaults"] == 1
+    assert first["approved_default_rate"] == pytest.approx(0.5)
+    assert first["approved_expected_default_rate"] == pytest.approx(0.04)
+    assert first["approved_loss"] == pytest.approx(1200)
+    assert first["declined_loss"] == pytest.approx(500)
+    assert (second["approved"], second["queued"], second["declined"]) == (4, 1, 1)
+    assert second["approved_loss"] == pytest.approx(4200)
+
+    assert [p["auto_approve_min"] for p in body["curve"]] == [450, 500, 550, 600, 650, 700, 750, 800]
+    assert body["curve"][0]["approve_rate"] == pytest.approx(5 / 6)
+
+    # Explicit rules override the active threshold's.
+    r = client.post(
+        "/api/v1/thresholds/simulate",
+        json={"tenant_id": str(tenant_id), "candidates": [{"auto_approve_min": 700, "auto_decline_max": 500}], "rules": {}},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["forced_review"] == 0
+    assert r.json()["candidates"][0]["approved"] == 4
+
+    r = client.post(
+        "/api/v1/thresholds/simulate",
+        json={"tenant_id": str(tenant_id), "candidates": [{"auto_approve_min": 500, "auto_decline_max": 500}]},
+    )
+    assert r.status_code == 422
+    r = client.post(
+        "/api/v1/thresholds/simulate",
+        json={
+            "tenant_id": str(tenant_id),
+            "candidates": [{"auto_approve_min": 700, "auto_decline_max": 500}],
+            "rules": {"max_loan_amount_auto": "lots"},
+        },
+    )
+    assert r.status_code == 422